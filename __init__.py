@@ -3,3 +3,4 @@
 from .recommender import RecoBasedOn
 from .benchmark import Benchmark
 from .logger import write_log_to
+from .precision import set_precision_to
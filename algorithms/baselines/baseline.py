@@ -2,6 +2,7 @@
 
 import logging as log
 from ...datastructures import Transactions
+from ...precision import float_type
 
 
 class Baseline:
@@ -96,12 +97,15 @@ class Baseline:
 
     def __count_unique_buyers(self):
         if not self.__has('number_of_buyers'):
-            self.__number_of_buyers = self.__data.matrix.bool_by_col.sum(0).A1
+            degrees = self.__data.matrix.pattern_by_col.degrees
+            self.__number_of_buyers = degrees.astype(float_type())
         return self.__number_of_buyers.copy()
 
     def __sum_over_all_buys(self):
         if not self.__has('number_of_buys'):
-            self.__number_of_buys = self.__data.matrix.by_col.sum(0).A1
+            number_of_buys = self.__data.matrix.by_col.sum(0).A1
+            self.__number_of_buys = number_of_buys.astype(float_type(),
+                                                          copy=False)
         return self.__number_of_buys.copy()
 
     def __delete_precomputed(self):
@@ -118,8 +118,6 @@ class CollaborativeFiltering:
         self.__baseline = self.__baseline.operating_on(data)
         self.__baseline = self.__data_attribute_checked(self.__baseline)
         self.__delete_sim_mat()
-        self.__depending_on_whether_we = {True: self.__data.matrix.bool_by_row,
-                                          False: self.__data.matrix.by_row}
         self.for_one = self.__for_one
         return self
 
@@ -152,8 +150,7 @@ class CollaborativeFiltering:
             log.info('Uncomparable user with ID {}. Returning baseline'
                      ' recommendation.'.format(self.__data.user.id_of[target]))
             return self.__baseline.for_one(target)
-        history_vector = self.__depending_on_whether_we[self.binarize][target]
-        return history_vector.dot(self.__similarity_matrix()).A[0]
+        return self.__ratings_of(target)
 
     def __similarity_matrix(self):
         if not self.__has('sim_mat'):
@@ -164,6 +161,13 @@ class CollaborativeFiltering:
         if self.__has('sim_mat'):
             delattr(self, self.__class_prefix + 'sim_mat')
 
+    def __ratings_of(self, target):
+        if self.binarize:
+            return self.__data.matrix.pattern_by_row.row_times(
+                       target, self.__similarity_matrix())
+        history_vector = self.__data.matrix.by_row[target]
+        return history_vector.dot(self.__similarity_matrix()).A[0]
+
     def __no_one_else_bought_items_bought_by(self, target):
         items_bought_by_target = self.__data.matrix.by_row[target].indices
         return self.__data._users_who_bought(items_bought_by_target).size == 1
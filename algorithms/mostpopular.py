@@ -2,6 +2,7 @@
 
 import logging as log
 from ..datastructures import Transactions
+from ..precision import float_type
 from .baselines import Baseline
 
 
@@ -119,8 +120,10 @@ class MostPopular:
         if not self.__has('scaled_baseline'):
             depending_on = {True : self.__data.number_of_userItem_pairs,
                             False: self.__data.number_of_transactions}
-            self.__scaled_baseline = (self.__baseline.for_one() /
-                                      depending_on[self.binarize])
+            scaled_baseline = (self.__baseline.for_one() /
+                               depending_on[self.binarize])
+            self.__scaled_baseline = scaled_baseline.astype(float_type(),
+                                                            copy=False)
         return self.__scaled_baseline.copy()
 
     def __delete_precomputed(self):
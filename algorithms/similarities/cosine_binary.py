@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
-from numpy import reciprocal, sqrt
-from scipy.sparse import diags
+from numpy import reciprocal, sqrt, repeat
+from ...precision import float_type
 
 
 def cosine_binary(data):
@@ -22,7 +22,12 @@ def cosine_binary(data):
         The matrix of pairwise similarities in scipy compressed sparse
         column (CSC) format.
     """
-    norm = diags(reciprocal(sqrt(data.matrix.bool_by_col.power(2).sum(0))).A1)
-    normed_user_item_matrix = data.matrix.bool_by_col.dot(norm)
-    similarity_matrix = normed_user_item_matrix.T.dot(normed_user_item_matrix)
+    degrees = data.matrix.pattern_by_col.degrees.astype(float_type())
+    norm = reciprocal(sqrt(degrees))
+    similarity_matrix = data.matrix.pattern_by_col.cooccurrence(
+                        data.matrix.pattern_by_row
+                        ).astype(float_type(), copy=False)
+    cols = repeat(norm, similarity_matrix.getnnz(axis=0))
+    rows = norm[similarity_matrix.indices]
+    similarity_matrix.data *= cols * rows
     return similarity_matrix
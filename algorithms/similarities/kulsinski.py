@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from numpy import repeat
+from ...precision import float_type
 
 
 def kulsinski(data):
@@ -18,7 +19,9 @@ def kulsinski(data):
         column (CSC) format.
 
     """
-    smat = data.matrix.bool_by_col.T.dot(data.matrix.bool_by_col)
+    smat = data.matrix.pattern_by_col.cooccurrence(
+           data.matrix.pattern_by_row
+           ).astype(float_type(), copy=False)
     diagonal = smat.diagonal()
     cols = repeat(diagonal, smat.getnnz(axis=0))
     rows = diagonal[smat.indices]
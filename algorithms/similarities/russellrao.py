@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from ...precision import float_type
+
 
 def russellrao(data):
     """Russell-Rao similarity among articles.
@@ -16,6 +18,8 @@ def russellrao(data):
         column (CSC) format.
 
     """
-    similarity_matrix = data.matrix.bool_by_col.T.dot(data.matrix.bool_by_col)
+    similarity_matrix = data.matrix.pattern_by_col.cooccurrence(
+                        data.matrix.pattern_by_row
+                        ).astype(float_type(), copy=False)
     similarity_matrix.data /= data.user.count
     return similarity_matrix
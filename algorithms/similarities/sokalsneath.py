@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from numpy import repeat
+from ...precision import float_type
 
 
 def sokalsneath(data):
@@ -18,7 +19,9 @@ def sokalsneath(data):
         column (CSC) format.
 
     """
-    similarity_matrix = data.matrix.bool_by_col.T.dot(data.matrix.bool_by_col)
+    similarity_matrix = data.matrix.pattern_by_col.cooccurrence(
+                        data.matrix.pattern_by_row
+                        ).astype(float_type(), copy=False)
     diagonal = similarity_matrix.diagonal()
     cols = repeat(diagonal, similarity_matrix.getnnz(axis=0))
     rows = diagonal[similarity_matrix.indices]
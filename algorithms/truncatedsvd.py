@@ -4,6 +4,7 @@ import logging as log
 from numpy import diag
 from scipy.sparse.linalg import svds
 from ..datastructures import Transactions
+from ..precision import float_type
 
 
 class TruncatedSVD:
@@ -152,7 +153,8 @@ class TruncatedSVD:
         return self.__U[target].dot(self.__SV)
 
     def __compute_USV_matrices(self):
-        self.__U, s, V = svds(self.__matrix(), k=self.number_of_factors)
+        matrix = self.__matrix().astype(float_type(), copy=False)
+        self.__U, s, V = svds(matrix, k=self.number_of_factors)
         self.__SV = diag(s).dot(V)
 
     def __delete_USV_matrices(self):
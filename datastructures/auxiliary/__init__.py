@@ -5,3 +5,9 @@ from .matrixfrom import MatrixFrom
 from .testdatafrom import TestDataFrom
 from .filefrom import FileFrom
 from .postgreSQLparams import PostgreSQLparams
+from .shardsfrom import ShardsFrom
+from .tablefrom import TableFrom
+from .patternfrom import PatternFrom
+from .streamfrom import StreamFrom
+from .partitionsfrom import PartitionsFrom
+from .historyfrom import HistoryFrom
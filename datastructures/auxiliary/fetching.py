@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+
+def batches_from(cursor, batch_size):
+    """Yield lists of records fetched from a cursor, batch by batch."""
+    records = cursor.fetchmany(batch_size)
+    while records:
+        yield records
+        records = cursor.fetchmany(batch_size)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from numpy import ndarray, flatnonzero, clip, cumsum, arange, repeat, minimum
+from numpy import zeros, empty, array, uint8, uint64
+
+WORD = 8
+NEWLINE = ord('\n')
+MIXER = 0x9E3779B97F4A7C15
+HASH_MASK = 2**64 - 1
+MASK_OF = array([2**(8*n_bytes) - 1 for n_bytes in range(WORD + 1)],
+                dtype=uint64)
+
+
+def words_of(buffer, starts, stops):
+    """Generate the successive 8-byte words of byte strings in a buffer.
+
+    Byte strings are given by their offsets into the buffer. Words are
+    read as little-endian integers through a strided view of the buffer,
+    with bytes beyond the end of each string set to zero. Yields tuples
+    of the positions of all strings long enough to have another word and
+    the values of that word.
+
+    """
+    body = max(buffer.size - WORD + 1, 0)
+    windows = ndarray(shape=(body,), dtype='<u8', buffer=buffer,
+                      strides=(1,))
+    tail = zeros(2 * WORD, dtype=uint8)
+    tail[:buffer.size - body] = buffer[body:]
+    tail_windows = ndarray(shape=(WORD,), dtype='<u8', buffer=tail,
+                           strides=(1,))
+    widths = stops - starts
+    fields = flatnonzero(widths > 0)
+    position = 0
+    while fields.size:
+        positions = starts[fields] + position
+        inside = positions < body
+        values = empty(fields.size, dtype=uint64)
+        values[inside] = windows[positions[inside]]
+        values[~inside] = tail_windows[positions[~inside] - body]
+        values &= MASK_OF[clip(widths[fields] - position, 0, WORD)]
+        yield fields, values
+        position += WORD
+        fields = fields[widths[fields] > position]
+
+
+def hashed(widths, words):
+    """64-bit hashes of byte strings from their lengths and their words."""
+    hashes = widths.astype(uint64)
+    for fields, values in words:
+        hashes[fields] = (hashes[fields] ^ values) * uint64(MIXER)
+    return hashes
+
+
+def hash_of(encoded):
+    """64-bit hash of one byte string, the same as `hashed` gives."""
+    value = len(encoded)
+    for position in range(0, len(encoded), WORD):
+        word = int.from_bytes(encoded[position:position + WORD], 'little')
+        value = ((value ^ word) * MIXER) & HASH_MASK
+    return value
+
+
+def decoded(buffer, starts, stops):
+    """List of strings decoded from the buffer between starts and stops."""
+    if not starts.size:
+        return []
+    if not buffer.size:
+        return [''] * starts.size
+    lengths = stops - starts + 1
+    ends = cumsum(lengths)
+    positions = arange(ends[-1]) + repeat(starts - ends + lengths, lengths)
+    characters = buffer[minimum(positions, buffer.size - 1)]
+    characters[ends - 1] = NEWLINE
+    return characters.tobytes().decode().split('\n')[:-1]
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from numpy import ndarray, lexsort, flatnonzero, cumsum, searchsorted
+from numpy import bincount, empty, full, arange, minimum, maximum, ones
+from numpy import integer, issubdtype
+
+
+class HistoryFrom:
+    """Purchase history held in columns of integers, one row per purchase.
+
+    Times are integer epochs, typically in microseconds since 1970, while
+    customers and articles are given by their integer index. Aggregates
+    over the distinct (user, item) pairs are computed together, in one
+    lexicographic sort, on first use of any of them and kept thereafter.
+    Pairs are ordered by user first and by item second.
+
+    """
+
+    def __init__(self, times, users, items):
+        self.__times = self.__array_type_checked(times, 'times')
+        self.__users = self.__array_type_checked(users, 'users')
+        self.__items = self.__array_type_checked(items, 'items')
+        self.__check_equal_size_of(times, users, items)
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def times(self):
+        return self.__times
+
+    @property
+    def users(self):
+        return self.__users
+
+    @property
+    def items(self):
+        return self.__items
+
+    @property
+    def size(self):
+        """Number of purchases in the history."""
+        return self.__times.size
+
+    @property
+    def pair_of(self):
+        """Index of the (user, item) pair of each purchase."""
+        if not self.__has('pair_of'):
+            self.__group()
+        return self.__pair_of
+
+    @property
+    def pair_users(self):
+        """User index of each distinct (user, item) pair."""
+        if not self.__has('pair_users'):
+            self.__group()
+        return self.__pair_users
+
+    @property
+    def pair_items(self):
+        """Item index of each distinct (user, item) pair."""
+        if not self.__has('pair_items'):
+            self.__group()
+        return self.__pair_items
+
+    @property
+    def last(self):
+        """Time of the last purchase of each distinct (user, item) pair."""
+        if not self.__has('last'):
+            self.__group()
+        return self.__last
+
+    @property
+    def earliest(self):
+        """Time of the first purchase of each distinct (user, item) pair."""
+        if not self.__has('earliest'):
+            self.__group()
+        return self.__earliest
+
+    @property
+    def first(self):
+        """Position in the history of the first purchase of each pair."""
+        if not self.__has('first'):
+            self.__group()
+        return self.__first
+
+    @property
+    def counts(self):
+        """Number of purchases of each distinct (user, item) pair."""
+        if not self.__has('counts'):
+            self.__counts = bincount(self.pair_of, minlength=self.last.size)
+        return self.__counts
+
+    @property
+    def last_counts(self):
+        """Number of purchases of each pair at the time of its last."""
+        if not self.__has('last_counts'):
+            self.__split_at_last()
+        return self.__last_counts
+
+    @property
+    def first_before_last(self):
+        """Position of the first purchase of each pair before its last time.
+
+        Pairs only ever bought at the time of their last purchase are
+        assigned the size of the history instead.
+
+        """
+        if not self.__has('first_before_last'):
+            self.__split_at_last()
+        return self.__first_before_last
+
+    @property
+    def recency(self):
+        """Rank of each pair among those of its user, 0 for the most recent.
+
+        Pairs are ranked by the time of their last purchase. Pairs last
+        bought at the same time are ranked by their first purchase in the
+        history, such that ties are always resolved in the same way.
+
+        """
+        if not self.__has('recency'):
+            order = lexsort((self.first, -self.last, self.pair_users))
+            ranked_users = self.__pair_users[order]
+            self.__recency = empty(order.size, dtype=order.dtype)
+            self.__recency[order] = (arange(order.size) -
+                                     searchsorted(ranked_users, ranked_users))
+        return self.__recency
+
+    @property
+    def unique_counts(self):
+        """Number of distinct items bought by each user, indexed by user."""
+        if not self.__has('unique_counts'):
+            self.__unique_counts = bincount(self.pair_users)
+        return self.__unique_counts
+
+    def __group(self):
+        order = lexsort((self.__times, self.__items, self.__users))
+        users = self.__users[order]
+        items = self.__items[order]
+        new = ones(order.size, dtype=bool)
+        new[1:] = (users[1:] != users[:-1]) | (items[1:] != items[:-1])
+        starts = flatnonzero(new)
+        self.__pair_of = empty(order.size, dtype=order.dtype)
+        self.__pair_of[order] = cumsum(new) - 1
+        self.__pair_users = users[starts]
+        self.__pair_items = items[starts]
+        times = self.__times[order]
+        self.__last = maximum.reduceat(times, starts)
+        self.__earliest = times[starts]
+        self.__first = minimum.reduceat(order, starts)
+
+    def __split_at_last(self):
+        at_last = self.__times == self.last[self.pair_of]
+        self.__last_counts = bincount(self.pair_of[at_last],
+                                      minlength=self.last.size)
+        before = flatnonzero(~at_last)
+        self.__first_before_last = full(self.last.size, self.size,
+                                        dtype=before.dtype)
+        minimum.at(self.__first_before_last, self.pair_of[before], before)
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    @staticmethod
+    def __array_type_checked(array, name):
+        if not (isinstance(array, ndarray) and array.ndim == 1 and
+                issubdtype(array.dtype, integer)):
+            log.error('Attempt to instantiate history object with {0} not'
+                      ' a 1-D array of integers.'.format(name))
+            raise TypeError('Columns of history object must be 1-D arrays'
+                            ' of integers!')
+        return array
+
+    @staticmethod
+    def __check_equal_size_of(times, users, items):
+        if not times.size == users.size == items.size:
+            log.error('Attempt to instantiate history object with columns'
+                      ' of different length.')
+            raise ValueError('Columns of history object must all have the'
+                             ' same length!')
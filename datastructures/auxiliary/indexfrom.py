@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
+from itertools import repeat, count, filterfalse
+from numpy import asarray, empty, fromiter, integer, issubdtype, arange, int64
+from .tablefrom import TableFrom, UNKNOWN
 
 
 class IndexFrom:
     def __init__(self, index_of):
-        self.__index_of = self.__dict_type_and_empty_checked(index_of)
+        index_of = self.__dict_type_and_empty_checked(index_of)
+        if isinstance(index_of, TableFrom):
+            self.__id_of = index_of
+            index_of = index_of.index_of
+        self.__index_of = index_of
         self.__class_prefix = '_' + self.__class__.__name__ + '__'
 
     @property
@@ -28,12 +35,122 @@ class IndexFrom:
             self.__count = len(self.index_of)
         return self.__count
 
+    def ids_of(self, indices):
+        """Translate an array of integer indices into a list of unique IDs.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            Integer indices, each in the range from 0 to `count` - 1.
+
+        Returns
+        -------
+        List of unique IDs in the same order as the `indices`.
+
+        Raises
+        ------
+        TypeError
+            If `indices` are not integers.
+
+        ValueError
+            If any of the `indices` is out of range.
+
+        Examples
+        --------
+        >>> data.item.ids_of(numpy.array([1, 0]))
+        ['second article', 'first article']
+
+        """
+        indices = self.__integer_type_and_range_checked(indices)
+        if isinstance(self.id_of, TableFrom):
+            return self.id_of.ids_of(indices)
+        if not self.__has('ids'):
+            self.__ids = empty(self.count, dtype=object)
+            self.__ids[list(self.index_of.values())] = list(self.index_of)
+        return self.__ids[indices].tolist()
+
+    def indices_of(self, identifiers):
+        """Translate a list of unique IDs into an array of integer indices.
+
+        Parameters
+        ----------
+        identifiers : list
+            Unique IDs to look up.
+
+        Returns
+        -------
+        Array of integer indices in the same order as the `identifiers`,
+        with the sentinel value -1 for IDs that are not in the index.
+
+        Examples
+        --------
+        >>> data.user.indices_of(['first customer', 'new customer'])
+        array([ 0, -1])
+
+        """
+        if isinstance(self.id_of, TableFrom):
+            return self.index_of.indices_of(identifiers)
+        return fromiter(map(self.index_of.get, identifiers, repeat(UNKNOWN)),
+                        dtype=int64, count=len(identifiers))
+
+    def add(self, identifiers):
+        """Translate a list of IDs into indices, adding new IDs to the index.
+
+        IDs not yet in the index are appended in the order of their first
+        appearance, so that existing indices never change. An index backed
+        by an array table is converted into dictionaries on first use.
+
+        Parameters
+        ----------
+        identifiers : list
+            Unique IDs, known or new, to look up.
+
+        Returns
+        -------
+        Array of integer indices in the same order as the `identifiers`.
+
+        Examples
+        --------
+        >>> data.user.add(['first customer', 'new customer'])
+        array([   0, 1234])
+
+        """
+        if isinstance(self.id_of, TableFrom):
+            table = self.__id_of
+            self.__id_of = dict(enumerate(table.ids_of(arange(len(table)))))
+            self.__index_of = {key: value
+                               for value, key
+                               in self.__id_of.items()}
+        new = dict.fromkeys(filterfalse(self.__index_of.__contains__,
+                                        identifiers))
+        if new:
+            new = dict(zip(new, count(len(self.__index_of))))
+            self.__index_of.update(new)
+            self.__id_of.update((value, key) for key, value in new.items())
+            self.__count = len(self.__index_of)
+            if self.__has('ids'):
+                delattr(self, self.__class_prefix + 'ids')
+        return fromiter(map(self.__index_of.__getitem__, identifiers),
+                        dtype=int64, count=len(identifiers))
+
     def __has(self, attribute):
         return hasattr(self, self.__class_prefix + attribute)
 
+    def __integer_type_and_range_checked(self, indices):
+        indices = asarray(indices)
+        if not issubdtype(indices.dtype, integer):
+            log.error('Attempt to translate indices of non-integer type.')
+            raise TypeError('Indices must be integers!')
+        if indices.size and (indices.min() < 0 or
+                             indices.max() >= self.count):
+            log.error('Attempt to translate indices out of range.')
+            raise ValueError('Indices must be >= 0 and < {0}!'
+                             ''.format(self.count))
+        return indices
+
     @staticmethod
     def __dict_type_and_empty_checked(index_of):
-        if not isinstance(index_of, dict):
+        if not isinstance(index_of, (dict, TableFrom)):
             log.error('Attempt to instantiate index object with'
                       ' non-dictionary argument.')
             raise TypeError('Argument of index object must be of type <dict>!')
@@ -1,60 +1,316 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
-from scipy.sparse import csc_matrix
+from collections import OrderedDict
+from numpy import ndarray, fromiter, lexsort, bincount, cumsum, zeros, ones
+from numpy import concatenate, full, flatnonzero, add
+from numpy import issubdtype, integer, iinfo, int32, int64
+from scipy.sparse import csc_matrix, csr_matrix
+from .patternfrom import PatternFrom
+from ...precision import float_type
+
+DEPENDENT_OF = {'by_row': 'bool_by_row'}
+MAX_INT32 = iinfo(int32).max
 
 
 class MatrixFrom:
-    def __init__(self, user_item_counts):
-        self.__counts_users = self.__validated(user_item_counts)
+    def __init__(self, user_item_counts, by_row=None):
+        if isinstance(user_item_counts, csc_matrix):
+            self.__by_col = user_item_counts
+        else:
+            self.__rows_cols_counts = self.__validated(user_item_counts)
+        if by_row is not None:
+            self.__by_row = self.__csr_type_checked(by_row)
+        self.__deltas = []
+        self.__own = set()
+        self.__budget = None
+        self.__cache = OrderedDict()
+        self.__size_of = {}
         self.__class_prefix = '_' + self.__class__.__name__ + '__'
 
     @property
     def by_col(self):
         """Customer-article matrix in scipy compressed sparse column format."""
         if not self.__has('by_col'):
-            counts, indices = tuple(zip(*((count, user_item)
-                                          for user_item, count
-                                          in self.__counts_users.items())))
-            self.__by_col = csc_matrix((counts, zip(*indices)))
-            self.__by_col = self.__by_col.astype(float)
+            rows, cols, counts = self.__rows_cols_counts
+            shape = (int(rows.max()) + 1 if rows.size else 0,
+                     int(cols.max()) + 1 if cols.size else 0)
+            if not self.__column_major(rows, cols):
+                order = lexsort((rows, cols))
+                rows, cols, counts = summed(rows[order], cols[order],
+                                            counts[order])
+            indices_type = index_type(rows.size)
+            indptr = zeros(shape[1] + 1, dtype=indices_type)
+            cumsum(bincount(cols, minlength=shape[1]), out=indptr[1:])
+            self.__by_col = csc_matrix((counts.astype(float_type()),
+                                        rows.astype(indices_type,
+                                                    copy=False),
+                                        indptr), shape=shape, copy=False)
+            self.__by_col.has_sorted_indices = True
+            self.__by_col.has_canonical_format = True
+            self.__own.add('by_col')
+            del self.__rows_cols_counts
+        if self.__deltas:
+            self.__merge_deltas()
         return self.__by_col
 
     @property
     def bool_by_col(self):
         """Customer-article CSC matrix with all non-zero entries set to 1."""
-        if not self.__has('bool_by_col'):
-            self.__bool_by_col = self.by_col.copy()
-            self.__bool_by_col.data[:] = 1.0
-        return self.__bool_by_col
+        if self.__deltas:
+            _ = self.by_col
+        return self.__cached('bool_by_col', lambda: pattern_of(self.by_col))
 
     @property
     def by_row(self):
         """Customer-article matrix in scipy compressed sparse row format."""
-        if not self.__has('by_row'):
-            self.__by_row = self.by_col.tocsr()
-        return self.__by_row
+        if self.__deltas:
+            _ = self.by_col
+        if self.__has('by_row'):
+            return self.__by_row
+        return self.__cached('by_row', lambda: self.by_col.tocsr())
 
     @property
     def bool_by_row(self):
         """Customer-article CSR matrix with all non-zero entries set to 1."""
-        if not self.__has('bool_by_row'):
-            self.__bool_by_row = self.by_row.copy()
-            self.__bool_by_row.data[:] = 1.0
-        return self.__bool_by_row
+        if self.__deltas:
+            _ = self.by_col
+        return self.__cached('bool_by_row', lambda: pattern_of(self.by_row))
+
+    @property
+    def pattern_by_col(self):
+        """Sparsity structure of `by_col`, sharing its index arrays.
+
+        The pattern is kept, together with its `recompressed` counterpart
+        once that is computed, for as long as the index arrays of `by_col`
+        stay the same.
+
+        """
+        by_col = self.by_col
+        if (not self.__has('pattern_by_col') or
+                self.__pattern_by_col.indices is not by_col.indices):
+            self.__pattern_by_col = PatternFrom.from_matrix(by_col)
+        return self.__pattern_by_col
+
+    @property
+    def pattern_by_row(self):
+        """Sparsity structure of `by_row`, without converting `by_col`.
+
+        Shares the index arrays of `by_row` if that is held in memory
+        anyway. Otherwise, the `recompressed` pattern of `pattern_by_col`
+        is returned, which only takes integer indices and no counts.
+
+        """
+        if self.__deltas:
+            _ = self.by_col
+        if self.__has('by_row'):
+            return PatternFrom.from_matrix(self.__by_row)
+        if 'by_row' in self.__cache:
+            return PatternFrom.from_matrix(self.__cache['by_row'])
+        return self.pattern_by_col.recompressed
 
     @property
     def min_shape(self):
         """Number of rows or number of columns, whichever is smaller."""
+        if self.__deltas:
+            _ = self.by_col
         if not self.__has('min_shape'):
             self.__min_shape = min(self.by_col.shape)
         return self.__min_shape
 
+    def add(self, user_item_counts):
+        """Add counts to the matrix, growing its shape as needed.
+
+        Counts are only buffered here, in time proportional to their
+        number, and merged into the matrix when it is next accessed.
+        Counts of (row, column) pairs already in the matrix are added to
+        its entries in place, in time proportional to the number of
+        buffered counts (times the logarithm of the column length), and
+        all cached formats are kept. Pairs not yet in the matrix must be
+        inserted into its compressed arrays, which takes one linear pass
+        over all existing non-zero entries, no matter how few pairs are
+        new. Row format matrices held in memory are then patched the same
+        way, while boolean formats are dropped from the cache, and
+        regenerated when needed. Adding many batches between accesses
+        thus costs no more than adding them all at once. Matrices given
+        on instantiation are copied once, before they are first changed.
+
+        Parameters
+        ----------
+        user_item_counts : tuple
+            Integer arrays of row indices, column indices, and counts, all
+            of equal length. Pairs of indices may repeat.
+
+        Examples
+        --------
+        >>> matrix.add((numpy.array([0, 7]), numpy.array([3, 3]),
+        ...             numpy.array([1, 2])))
+
+        """
+        rows, cols, counts = self.__arrays_checked(user_item_counts)
+        if rows.size:
+            self.__deltas.append((rows, cols, counts))
+
+    @property
+    def budget(self):
+        """Maximum number of bytes held by cached, derived matrix formats.
+
+        The original matrix `by_col`, and `by_row` if it was given on
+        instantiation, are always kept. Derived formats (`bool_by_col`,
+        `by_row`, `bool_by_row`) are cached on first use and evicted,
+        least recently used first, whenever their total size exceeds
+        the budget. Evicted formats are regenerated when needed again.
+        The boolean formats share the index arrays of their source, and
+        are evicted together with it. Set to ``None`` (the default) for
+        no limit, or to an integer >= 0.
+
+        """
+        return self.__budget
+
+    @budget.setter
+    def budget(self, budget):
+        self.__budget = self.__integer_type_and_range_checked(budget)
+        self.__evict_beyond_budget()
+
+    @property
+    def resident(self):
+        """Dictionary with the size in bytes of all formats held in memory.
+
+        Cached formats are listed from least to most recently used.
+        Boolean formats only count their array of ones, because they
+        share all other arrays with the format they are derived from.
+
+        """
+        resident = {}
+        if self.__has('by_col'):
+            resident['by_col'] = nbytes_of(self.__by_col)
+        if self.__has('by_row'):
+            resident['by_row'] = nbytes_of(self.__by_row)
+        resident.update((name, self.__size_of[name]) for name in self.__cache)
+        return resident
+
+    def __merge_deltas(self):
+        rows, cols, counts = (concatenate(arrays)
+                              for arrays in zip(*self.__deltas))
+        self.__deltas = []
+        order = lexsort((rows, cols))
+        rows, cols, counts = summed(rows[order], cols[order], counts[order])
+        self.__by_col = self.__sorted('by_col', self.__by_col)
+        positions = located(self.__by_col, cols, rows)
+        old = positions >= 0
+        if old.any():
+            self.__by_col = self.__owned('by_col', self.__by_col)
+            self.__by_col.data[positions[old]] += counts[old]
+            if self.__has('by_row'):
+                by_row = self.__sorted('by_row', self.__by_row)
+                self.__by_row = self.__owned('by_row', by_row)
+                self.__by_row.data[located(self.__by_row, rows[old],
+                                           cols[old])] += counts[old]
+            if 'by_row' in self.__cache:
+                by_row = self.__cache['by_row']
+                by_row.sort_indices()
+                by_row.data[located(by_row, rows[old],
+                                    cols[old])] += counts[old]
+        if not old.all():
+            self.__insert(rows[~old], cols[~old], counts[~old])
+
+    def __insert(self, rows, cols, counts):
+        old_shape = self.__by_col.shape
+        shape = (max(old_shape[0], int(rows.max()) + 1),
+                 max(old_shape[1], int(cols.max()) + 1))
+        delta = csc_matrix((counts.astype(float_type()), (rows, cols)),
+                           shape=shape)
+        self.__by_col = grown(self.__by_col, shape) + delta
+        self.__own.add('by_col')
+        if self.__has('by_row'):
+            self.__by_row = grown(self.__by_row, shape) + delta.tocsr()
+            self.__own.add('by_row')
+        if 'by_row' in self.__cache:
+            by_row = grown(self.__cache['by_row'], shape) + delta.tocsr()
+            self.__cache['by_row'] = by_row
+            self.__size_of['by_row'] = nbytes_of(by_row)
+        self.__cache.pop('bool_by_col', None)
+        self.__cache.pop('bool_by_row', None)
+        if self.__has('min_shape'):
+            del self.__min_shape
+        self.__evict_beyond_budget()
+
+    def __sorted(self, name, matrix):
+        if matrix.has_sorted_indices:
+            return matrix
+        if name in self.__own:
+            matrix.sort_indices()
+            return matrix
+        self.__own.add(name)
+        return matrix.sorted_indices()
+
+    def __owned(self, name, matrix):
+        if name in self.__own:
+            return matrix
+        self.__own.add(name)
+        return matrix.copy()
+
+    def __cached(self, name, regenerated):
+        if name in self.__cache:
+            self.__cache.move_to_end(name)
+            return self.__cache[name]
+        matrix = regenerated()
+        self.__cache[name] = matrix
+        if name.startswith('bool_'):
+            self.__size_of[name] = matrix.data.nbytes
+        else:
+            self.__size_of[name] = nbytes_of(matrix)
+        self.__evict_beyond_budget()
+        return matrix
+
+    def __evict_beyond_budget(self):
+        if self.__budget is None:
+            return
+        while self.__cached_bytes() > self.__budget:
+            name, _ = self.__cache.popitem(last=False)
+            self.__cache.pop(DEPENDENT_OF.get(name), None)
+
+    def __cached_bytes(self):
+        return sum(self.__size_of[name] for name in self.__cache)
+
     def __has(self, attribute):
         return hasattr(self, self.__class_prefix + attribute)
 
     @staticmethod
-    def __validated(user_item_counts):
+    def __integer_type_and_range_checked(budget):
+        if budget is None:
+            return budget
+        if not isinstance(budget, int):
+            log.error('Attempt to set memory budget of matrix object to'
+                      ' non-integer type.')
+            raise TypeError('Memory budget must be None or integer >= 0!')
+        if budget < 0:
+            log.error('Attempt to set memory budget of matrix object to'
+                      ' negative value.')
+            raise ValueError('Memory budget must be None or integer >= 0!')
+        return budget
+
+    @staticmethod
+    def __csr_type_checked(by_row):
+        if not isinstance(by_row, csr_matrix):
+            log.error('Attempt to instantiate matrix object with row format'
+                      ' not of type <csr_matrix>.')
+            raise TypeError('Matrix in row format must be <csr_matrix>!')
+        return by_row
+
+    @staticmethod
+    def __column_major(rows, cols):
+        same_col = cols[1:] == cols[:-1]
+        return bool((cols[1:] >= cols[:-1]).all() and
+                    (rows[1:][same_col] > rows[:-1][same_col]).all())
+
+    @classmethod
+    def __validated(cls, user_item_counts):
+        if isinstance(user_item_counts, tuple):
+            rows_cols_counts = cls.__arrays_checked(user_item_counts)
+            if rows_cols_counts[0].size < 1:
+                log.warning('Matrix instantiated with empty arrays.')
+            return rows_cols_counts
         if not isinstance(user_item_counts, dict):
             log.error('Attempt to instantiate matrix object with'
                       ' non-dictionary argument.')
@@ -84,4 +340,122 @@ class MatrixFrom:
             if val < 1:
                 log.error(val_log)
                 raise ValueError(val_err)
-        return user_item_counts
+        n_pairs = len(user_item_counts)
+        rows = fromiter((row for row, _ in user_item_counts),
+                        dtype=int32, count=n_pairs)
+        cols = fromiter((col for _, col in user_item_counts),
+                        dtype=int32, count=n_pairs)
+        counts = fromiter(user_item_counts.values(),
+                          dtype=int64, count=n_pairs)
+        return rows, cols, counts
+
+    @staticmethod
+    def __arrays_checked(rows_cols_counts):
+        arr_log = ('Attempt to instantiate matrix object from tuple'
+                   ' not of 3 integer arrays of equal length.')
+        arr_err = ('Tuple must hold integer arrays of rows,'
+                   ' columns, and counts of equal length!')
+        idx_log = ('Attempt to instantiate matrix object with'
+                   ' row or column indices not integer >= 0.')
+        idx_err = 'Row and column indices must be integer >= 0!'
+        val_log = ('Attempt to create matrix object from arrays'
+                   ' with counts not positive integers.')
+        val_err = 'Counts must be positive integers!'
+        if len(rows_cols_counts) != 3:
+            log.error(arr_log)
+            raise TypeError(arr_err)
+        if not all(isinstance(array, ndarray) and
+                   issubdtype(array.dtype, integer) and
+                   array.ndim == 1
+                   for array in rows_cols_counts):
+            log.error(arr_log)
+            raise TypeError(arr_err)
+        rows, cols, counts = rows_cols_counts
+        if not rows.size == cols.size == counts.size:
+            log.error(arr_log)
+            raise ValueError(arr_err)
+        if rows.size < 1:
+            return rows_cols_counts
+        if rows.min() < 0 or cols.min() < 0:
+            log.error(idx_log)
+            raise ValueError(idx_err)
+        if counts.min() < 1:
+            log.error(val_log)
+            raise ValueError(val_err)
+        return rows_cols_counts
+
+
+def index_type(n_entries):
+    """Integer type of indices for a sparse matrix with that many entries.
+
+    Index pointers run up to the number of non-zero entries, so that
+    32-bit integers only suffice as long as that number fits in them.
+    Otherwise, 64-bit integers are used for indices and pointers alike,
+    just like scipy does.
+
+    """
+    return int32 if n_entries <= MAX_INT32 else int64
+
+
+def pattern_of(matrix):
+    """Matrix of ones sharing the sparsity structure of the given matrix."""
+    pattern = matrix.__class__((ones(matrix.nnz, dtype=matrix.dtype),
+                                matrix.indices,
+                                matrix.indptr),
+                               shape=matrix.shape,
+                               copy=False)
+    pattern.has_sorted_indices = matrix.has_sorted_indices
+    return pattern
+
+
+def summed(rows, cols, counts):
+    """Sum counts of repeated pairs of indices, sorted next to each other."""
+    new = ones(rows.size, dtype=bool)
+    new[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+    if new.all():
+        return rows, cols, counts
+    starts = flatnonzero(new)
+    return rows[starts], cols[starts], add.reduceat(counts, starts)
+
+
+def located(matrix, majors, minors):
+    """Positions of entries of a CSC or CSR matrix, -1 for missing ones.
+
+    Entries are given by their column (row) indices as `majors` and their
+    row (column) indices as `minors`, for a matrix in CSC (CSR) format.
+    Indices of the matrix must be sorted. All entries are searched for
+    at once, by bisection within their column (row).
+
+    """
+    inside = flatnonzero(majors < matrix.indptr.size - 1)
+    low = matrix.indptr[majors[inside]].astype(int64)
+    end = matrix.indptr[majors[inside] + 1].astype(int64)
+    high = end.copy()
+    wanted = minors[inside]
+    active = flatnonzero(low < high)
+    while active.size:
+        middle = (low[active] + high[active]) // 2
+        right = matrix.indices[middle] < wanted[active]
+        low[active[right]] = middle[right] + 1
+        high[active[~right]] = middle[~right]
+        active = active[low[active] < high[active]]
+    found = low < end
+    found[found] = matrix.indices[low[found]] == wanted[found]
+    positions = full(majors.size, -1, dtype=int64)
+    positions[inside[found]] = low[found]
+    return positions
+
+
+def grown(matrix, shape):
+    """CSC or CSR matrix padded with empty rows and columns to shape."""
+    n_major = shape[1] if matrix.format == 'csc' else shape[0]
+    n_extra = n_major + 1 - matrix.indptr.size
+    indptr = concatenate((matrix.indptr,
+                          full(n_extra, matrix.indptr[-1],
+                               dtype=matrix.indptr.dtype)))
+    return matrix.__class__((matrix.data, matrix.indices, indptr),
+                            shape=shape, copy=False)
+
+
+def nbytes_of(matrix):
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from glob import glob
+from os import listdir
+from os.path import isdir, isfile, join
+
+GLOB_CHARACTERS = '*?['
+
+
+class PartitionsFrom:
+    """Resolve a directory, glob pattern, or list into names of files.
+
+    Files in a directory are taken in alphabetical order, excluding
+    hidden files and sub-directories, just like files matching a glob
+    pattern. Files given as a list or tuple are taken in the given order.
+
+    """
+
+    def __init__(self, source):
+        self.__source = self.__type_checked(source)
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @staticmethod
+    def apply_to(source):
+        """Whether source refers to several files rather than to just one."""
+        if isinstance(source, (list, tuple)):
+            return True
+        if not isinstance(source, str) or isfile(source):
+            return False
+        return isdir(source) or any(character in source
+                                    for character in GLOB_CHARACTERS)
+
+    @property
+    def source(self):
+        return self.__source
+
+    @property
+    def files(self):
+        """List of file names, in the order they are to be read in."""
+        if not self.__has('files'):
+            if isinstance(self.__source, (list, tuple)):
+                files = list(self.__source)
+            elif isdir(self.__source):
+                files = [join(self.__source, name)
+                         for name in sorted(listdir(self.__source))
+                         if not name.startswith('.')]
+                files = [file for file in files if isfile(file)]
+            else:
+                files = sorted(glob(self.__source))
+            self.__files = self.__non_empty_checked(files)
+        return self.__files
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    @staticmethod
+    def __type_checked(source):
+        if isinstance(source, (list, tuple)):
+            if not all(isinstance(file, str) for file in source):
+                log.error('Attempt to read partitions from list with'
+                          ' file names not of type string.')
+                raise TypeError('File names of partitions must be strings!')
+            return source
+        if not isinstance(source, str):
+            log.error('Attempt to read partitions from source not given'
+                      ' as string, list, or tuple.')
+            raise TypeError('Partitions must be given as a directory, glob'
+                            ' pattern, or list of file names!')
+        return source
+
+    @staticmethod
+    def __non_empty_checked(files):
+        if not files:
+            log.error('Attempt to read partitions from source without'
+                      ' any files.')
+            raise ValueError('No files found to read partitions from!')
+        return files
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from numpy import ndarray, diff, zeros, ones, cumsum, bincount, argsort
+from numpy import arange, repeat, asarray, int32
+from scipy.sparse import csc_matrix, csr_matrix
+
+FORMATS = ('csc', 'csr')
+OTHER = {'csc': 'csr', 'csr': 'csc'}
+
+
+class PatternFrom:
+    """Sparsity structure of a compressed sparse matrix, without its data.
+
+    Only the `indices` and `indptr` arrays are held, typically shared with
+    the matrix the pattern was taken from, so that all non-zero entries
+    are implicitly equal to 1. Kernels for binarized matrices operate on
+    that structure alone, and never need an array of ones.
+
+    """
+
+    def __init__(self, indices, indptr, shape, fmt='csc'):
+        self.__indices = self.__array_type_checked(indices, 'indices')
+        self.__indptr = self.__array_type_checked(indptr, 'indptr')
+        self.__shape = tuple(shape)
+        self.__fmt = self.__format_checked(fmt)
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Pattern sharing the index arrays of a scipy CSC or CSR matrix.
+
+        Parameters
+        ----------
+        matrix : scipy.sparse.csc_matrix or scipy.sparse.csr_matrix
+            Sparse matrix to take the sparsity structure from.
+
+        Returns
+        -------
+        Instance of `PatternFrom` in the same format as `matrix`.
+
+        """
+        if not isinstance(matrix, (csc_matrix, csr_matrix)):
+            log.error('Attempt to take pattern from matrix not of type'
+                      ' <csc_matrix> or <csr_matrix>.')
+            raise TypeError('Pattern can only be taken from <csc_matrix>'
+                            ' or <csr_matrix>!')
+        return cls(matrix.indices, matrix.indptr, matrix.shape, matrix.format)
+
+    @property
+    def indices(self):
+        """Minor-axis index of every non-zero entry."""
+        return self.__indices
+
+    @property
+    def indptr(self):
+        """Start of each column (CSC) or row (CSR) in `indices`, plus end."""
+        return self.__indptr
+
+    @property
+    def shape(self):
+        return self.__shape
+
+    @property
+    def format(self):
+        """Either 'csc' or 'csr', just like for scipy sparse matrices."""
+        return self.__fmt
+
+    @property
+    def nnz(self):
+        return self.__indices.size
+
+    @property
+    def degrees(self):
+        """Number of non-zeros in each column (CSC) or row (CSR)."""
+        return diff(self.__indptr)
+
+    @property
+    def recompressed(self):
+        """The same pattern compressed along the other axis.
+
+        Equivalent to converting a CSC matrix to CSR and vice versa, but
+        computed by a counting sort of `indices` without touching any data.
+
+        """
+        if not self.__has('recompressed'):
+            n_minor = self.__shape[FORMATS.index(self.__fmt)]
+            indptr = zeros(n_minor + 1, dtype=self.__indptr.dtype)
+            cumsum(bincount(self.__indices, minlength=n_minor),
+                   out=indptr[1:])
+            order = argsort(self.__indices, kind='stable')
+            majors = repeat(arange(self.__indptr.size - 1,
+                                   dtype=self.__indices.dtype), self.degrees)
+            self.__recompressed = PatternFrom(majors[order], indptr,
+                                              self.__shape,
+                                              OTHER[self.__fmt])
+        return self.__recompressed
+
+    def cooccurrence(self, recompressed=None):
+        """Counts of non-zeros shared by all pairs of columns (CSC) or rows.
+
+        For a pattern `B` in CSC format, this is the symmetric matrix
+        ``B.T.dot(B)``, for one in CSR format it is ``B.dot(B.T)``. Both
+        operands are put together from the index arrays of the pattern and
+        its `recompressed` counterpart, so that no format conversion is
+        needed. Counts are exact integers. The sparse matrix product of
+        scipy does require values, so a transient array of 32-bit ones
+        stands in for them, which is released before returning.
+
+        Parameters
+        ----------
+        recompressed : `PatternFrom`, optional
+            The same pattern compressed along the other axis, if at hand.
+            Computed (and kept) on demand if not given.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Square, symmetric matrix of 32-bit integer counts. Because of
+            the symmetry, its arrays are equally valid in CSC format.
+
+        """
+        if recompressed is None:
+            recompressed = self.recompressed
+        self.__counterpart_checked(recompressed)
+        n_major = self.__indptr.size - 1
+        n_minor = recompressed.indptr.size - 1
+        units = ones(self.nnz, dtype=int32)
+        left = csr_matrix((units, self.__indices, self.__indptr),
+                          shape=(n_major, n_minor), copy=False)
+        right = csr_matrix((units, recompressed.indices, recompressed.indptr),
+                           shape=(n_minor, n_major), copy=False)
+        return left.dot(right)
+
+    def row_times(self, index, matrix):
+        """Product of one implicitly binary row with a sparse matrix.
+
+        Amounts to summing up the rows of `matrix` at the non-zero positions
+        of row `index` (CSR) or column `index` (CSC) of the pattern.
+
+        Parameters
+        ----------
+        index : int
+            Row (for CSR) or column (for CSC) of the pattern.
+        matrix : scipy sparse matrix
+            With as many rows as the pattern has columns (CSR) or rows (CSC).
+
+        Returns
+        -------
+        numpy.ndarray
+            Dense, 1-D array of length equal to the columns of `matrix`.
+
+        """
+        selected = self.__indices[self.__indptr[index]:
+                                  self.__indptr[index + 1]]
+        if not isinstance(matrix, csr_matrix):
+            return asarray(matrix[selected].sum(axis=0)).ravel()
+        starts = matrix.indptr[selected]
+        lengths = matrix.indptr[selected + 1] - starts
+        positions = (arange(lengths.sum()) +
+                     repeat(starts - cumsum(lengths) + lengths, lengths))
+        return bincount(matrix.indices[positions],
+                        matrix.data[positions],
+                        matrix.shape[1]).astype(matrix.dtype, copy=False)
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    def __counterpart_checked(self, recompressed):
+        if not (isinstance(recompressed, PatternFrom) and
+                recompressed.format == OTHER[self.__fmt] and
+                recompressed.shape == self.__shape and
+                recompressed.nnz == self.nnz):
+            log.error('Attempt to compute co-occurrence with pattern that is'
+                      ' not the same pattern compressed along the other'
+                      ' axis.')
+            raise ValueError('Recompressed pattern must have the same shape'
+                             ' and number of non-zeros, but other format!')
+
+    @staticmethod
+    def __array_type_checked(array, name):
+        if not isinstance(array, ndarray):
+            log.error('Attempt to instantiate pattern object with {0} not of'
+                      ' type <numpy.ndarray>.'.format(name))
+            raise TypeError('Arrays of pattern object must be of type'
+                            ' <numpy.ndarray>!')
+        return array
+
+    @staticmethod
+    def __format_checked(fmt):
+        if fmt not in FORMATS:
+            log.error('Attempt to instantiate pattern object with format'
+                      ' other than "csc" or "csr".')
+            raise ValueError('Format of pattern object must be either "csc"'
+                             ' or "csr"!')
+        return fmt
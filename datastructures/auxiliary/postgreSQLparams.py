@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
+import datetime as dt
+from psycopg2 import connect, OperationalError, InterfaceError
+from psycopg2.pool import ThreadedConnectionPool, PoolError
 from psycopg2.extensions import AsIs
 
+HEALTH_CHECK = 'SELECT 1'
+
 
 class PostgreSQLparams:
     """Holds parameters needed to retrieve transaction data from PostgreSQL.
@@ -40,6 +45,54 @@ class PostgreSQLparams:
         How many records to retrieve from the database.
         Defaults to 100.
 
+    batch_size : int > 0, optional
+        How many records to fetch from the server at a time. Records are
+        streamed through a server-side cursor, so that never more than
+        this many are held in client memory at once. Defaults to 10000.
+
+    bulk : bool, optional
+        Whether to export query results with ``COPY ... TO STDOUT`` in
+        CSV format instead of fetching them record by record. The few
+        records with IDs that CSV would need to quote, or that a cursor
+        would skip, are still fetched, in their place among the others,
+        and IDs keep their types, so that results and the order of
+        customers and articles are the same either way. Many scattered
+        records of that kind cause all records to be fetched. Only used
+        when reading `Transactions`. Defaults to ``False``.
+
+    connections : int > 0, optional
+        Over how many connections, each in a process of its own, to read
+        `Transactions` in parallel. The table is then split into as many
+        disjoint partitions by a hash of the customer ID. Only used with
+        `limit` set to 'all'. Defaults to 1.
+
+    incremental : bool, optional
+        Whether to remember the latest value of the `timestamp` column
+        when reading all `Transactions`, so that only newer ones need to
+        be read later on with `Transactions.append_from_postgreSQL`.
+        Defaults to ``False``.
+
+    watermark : int, datetime.datetime, or None
+        Latest timestamp of transactions read so far. Set by reads with
+        `incremental` switched on and `limit` set to 'all', and advanced
+        by every `Transactions.append_from_postgreSQL`. Can also be set
+        explicitly. Defaults to ``None``.
+
+    pool_size : int >= 0, optional
+        Number of connections to open on the first read and to keep open
+        between reads, which is also the most that can be in use at once.
+        All readers then borrow a connection from that pool instead of
+        logging in anew, and every connection is checked to be alive
+        before it is lent out. Parallel partitions of `connections` > 1
+        still connect on their own. Changing the size, or any of the login
+        parameters, closes the current pool. Defaults to 0, i.e., no
+        pooling.
+
+    Methods
+    -------
+    disconnect()
+        Close all connections held in the pool.
+
     """
 
     def __init__(self):
@@ -52,6 +105,14 @@ class PostgreSQLparams:
         self.__userID = AsIs('<field with userID>')
         self.__itemID = AsIs('<field with itemID>')
         self.__limit = 100
+        self.__batch_size = 10000
+        self.__bulk = False
+        self.__connections = 1
+        self.__incremental = False
+        self.__watermark = None
+        self.__pool_size = 0
+        self.__pool = None
+        self.__pool_login = None
 
     @property
     def login_db_name(self):
@@ -145,6 +206,131 @@ class PostgreSQLparams:
             log.error('Limit must be the string "all" or a positive integer!')
             raise ValueError('Limit must be "all" or a positive integer!')
 
+    @property
+    def batch_size(self):
+        return self.__batch_size
+
+    @batch_size.setter
+    def batch_size(self, batch_size):
+        if not isinstance(batch_size, int):
+            log.error('Attempt to set batch size to non-integer type.')
+            raise TypeError('Batch size must be a positive integer!')
+        if batch_size < 1:
+            log.error('Attempt to set batch size to less than one.')
+            raise ValueError('Batch size must be a positive integer!')
+        self.__batch_size = batch_size
+
+    @property
+    def bulk(self):
+        return self.__bulk
+
+    @bulk.setter
+    def bulk(self, bulk):
+        if not isinstance(bulk, bool):
+            log.error('Attempt to set bulk mode to non-boolean type.')
+            raise TypeError('Bulk mode can only be True or False!')
+        self.__bulk = bulk
+
+    @property
+    def connections(self):
+        return self.__connections
+
+    @connections.setter
+    def connections(self, connections):
+        if not isinstance(connections, int):
+            log.error('Attempt to set number of connections to'
+                      ' non-integer type.')
+            raise TypeError('Number of connections must be a positive'
+                            ' integer!')
+        if connections < 1:
+            log.error('Attempt to set number of connections to less'
+                      ' than one.')
+            raise ValueError('Number of connections must be a positive'
+                             ' integer!')
+        self.__connections = connections
+
+    @property
+    def incremental(self):
+        return self.__incremental
+
+    @incremental.setter
+    def incremental(self, incremental):
+        if not isinstance(incremental, bool):
+            log.error('Attempt to set incremental mode to non-boolean type.')
+            raise TypeError('Incremental mode can only be True or False!')
+        self.__incremental = incremental
+
+    @property
+    def watermark(self):
+        return self.__watermark
+
+    @watermark.setter
+    def watermark(self, watermark):
+        if not isinstance(watermark, (int, dt.datetime, type(None))):
+            log.error('Attempt to set watermark to neither integer, nor'
+                      ' timestamp, nor None.')
+            raise TypeError('Watermark must be an integer, a timestamp,'
+                            ' or None!')
+        self.__watermark = watermark
+
+    @property
+    def pool_size(self):
+        return self.__pool_size
+
+    @pool_size.setter
+    def pool_size(self, pool_size):
+        if not isinstance(pool_size, int):
+            log.error('Attempt to set pool size to non-integer type.')
+            raise TypeError('Pool size must be a non-negative integer!')
+        if pool_size < 0:
+            log.error('Attempt to set pool size to less than zero.')
+            raise ValueError('Pool size must be a non-negative integer!')
+        self.disconnect()
+        self.__pool_size = pool_size
+
+    def disconnect(self):
+        """Close all connections held in the pool, if there is one."""
+        if self.__pool is not None:
+            self.__pool.closeall()
+        self.__pool = None
+        self.__pool_login = None
+
+    def _connect(self):
+        """Borrow a live connection from the pool, or open a new one."""
+        if not self.__pool_size:
+            return connect(self.login)
+        pool = self.__current_pool()
+        # Idle connections may have been dropped by the server in the
+        # meantime. Once all of them are discarded, a fresh one is opened.
+        for _ in range(self.__pool_size + 1):
+            try:
+                connection = pool.getconn()
+            except PoolError:
+                log.error('Attempt to borrow connection from pool with all'
+                          ' {} connections in use.'.format(self.__pool_size))
+                raise PoolError('No connection left in pool. Increase'
+                                ' pool size!')
+            if self.__alive(connection):
+                return connection
+            pool.putconn(connection, close=True)
+        raise OperationalError('Connection to database lost. Check server!')
+
+    def _release(self, connection):
+        """Hand a borrowed connection back to the pool, or close it."""
+        if self.__pool is None:
+            connection.close()
+            return
+        try:
+            # Ends the transaction, dropping named cursors and temporary
+            # tables, such that the next reader starts from a clean slate.
+            connection.rollback()
+        except (OperationalError, InterfaceError):
+            pass
+        try:
+            self.__pool.putconn(connection, close=bool(connection.closed))
+        except PoolError:
+            connection.close()
+
     @property
     def _params(self):
         params = {'timestamp': self.__timestamp,
@@ -158,6 +344,27 @@ class PostgreSQLparams:
     def _requested(self):
         return self.limit if isinstance(self.limit, int) else float('-inf')
 
+    def __current_pool(self):
+        if self.__pool_login != self.login:
+            self.disconnect()
+            self.__pool = ThreadedConnectionPool(self.__pool_size,
+                                                 self.__pool_size,
+                                                 self.login)
+            self.__pool_login = self.login
+        return self.__pool
+
+    @staticmethod
+    def __alive(connection):
+        if connection.closed:
+            return False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(HEALTH_CHECK)
+            connection.rollback()
+        except (OperationalError, InterfaceError):
+            return False
+        return True
+
     @staticmethod
     def __prepend(parameter, prefix):
         if not isinstance(parameter, str):
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from os.path import getsize
+
+
+class ShardsFrom:
+    def __init__(self, file, number):
+        self.__file = self.__string_type_checked(file)
+        self.__number = self.__integer_type_and_range_checked(number)
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @property
+    def file(self):
+        return self.__file
+
+    @property
+    def ranges(self):
+        """List of (start, stop) byte offsets of shards, aligned to lines."""
+        if not self.__has('ranges'):
+            size = getsize(self.__file)
+            bounds = [0]
+            with open(self.__file, 'rb') as stream:
+                for shard in range(1, self.__number):
+                    stream.seek(max(shard * size // self.__number - 1,
+                                    bounds[-1]))
+                    stream.readline()
+                    bounds.append(min(stream.tell(), size))
+            bounds.append(size)
+            self.__ranges = [(start, stop)
+                             for start, stop in zip(bounds[:-1], bounds[1:])
+                             if stop > start]
+        return self.__ranges
+
+    def lines_between(self, start, stop):
+        """Generator of decoded lines in the given range of bytes."""
+        with open(self.__file, 'rb') as stream:
+            stream.seek(start)
+            while stream.tell() < stop:
+                yield stream.readline().decode()
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    @staticmethod
+    def __string_type_checked(file):
+        if not isinstance(file, str):
+            log.error('Attempt to split file given by non-string type.')
+            raise TypeError('Only files given by name can be split!')
+        return file
+
+    @staticmethod
+    def __integer_type_and_range_checked(number):
+        if not isinstance(number, int):
+            log.error('Attempt to split file into non-integer number'
+                      ' of shards.')
+            raise TypeError('Number of shards must be a positive integer!')
+        if number < 1:
+            log.error('Attempt to split file into less than one shard.')
+            raise ValueError('Number of shards must be a positive integer!')
+        return number
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+import gzip
+from io import StringIO
+from queue import Queue, Full
+from threading import Thread, Event
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BLOCK_SIZE = 2**23
+DEPTH = 4
+TIMEOUT = 0.1
+COMPRESSION_OF = {'.gz': 'gzip', '.zst': 'zstandard', '.zstd': 'zstandard'}
+END = None
+
+
+class StreamFrom:
+    """Decompress a file in a background thread while its lines are parsed.
+
+    Decompressed chunks are handed over to the consuming thread through a
+    queue holding at most `depth` of them, so that memory stays bounded no
+    matter how fast either side is. Compression is inferred from the file
+    extension, with '.gz' for gzip and '.zst' or '.zstd' for zstandard.
+    The latter requires the optional `zstandard` package.
+
+    """
+
+    def __init__(self, file, block_size=BLOCK_SIZE, depth=DEPTH):
+        self.__file = self.__string_type_checked(file)
+        self.__block_size = self.__integer_type_and_range_checked(block_size,
+                                                                  'Block size')
+        self.__depth = self.__integer_type_and_range_checked(depth, 'Depth')
+        self.__compression = self.__available(compression_of(file))
+
+    @property
+    def file(self):
+        return self.__file
+
+    @property
+    def compression(self):
+        """Either 'gzip', 'zstandard', or ``None`` for uncompressed files."""
+        return self.__compression
+
+    def blocks(self):
+        """Generator of decompressed blocks of complete lines, as bytes.
+
+        Every block ends with a newline character, which is appended to the
+        last line of the file if it is missing there.
+
+        """
+        queue = Queue(maxsize=self.__depth)
+        stop = Event()
+        producer = Thread(target=self.__decompress, args=(queue, stop),
+                          daemon=True)
+        producer.start()
+        try:
+            pending = b''
+            for chunk in iter(queue.get, END):
+                if isinstance(chunk, Exception):
+                    raise chunk
+                end = chunk.rfind(b'\n') + 1
+                if end:
+                    yield pending + chunk[:end]
+                    pending = chunk[end:]
+                else:
+                    pending += chunk
+            if pending:
+                yield pending + b'\n'
+        finally:
+            stop.set()
+            producer.join()
+
+    def lines(self):
+        """Generator of decoded lines, just like iterating over a text file."""
+        for block in self.blocks():
+            yield from StringIO(block.decode(), newline=None)
+
+    def __decompress(self, queue, stop):
+        try:
+            with self.__opened() as stream:
+                chunk = stream.read(self.__block_size)
+                while chunk and not stop.is_set():
+                    self.__put(chunk, queue, stop)
+                    chunk = stream.read(self.__block_size)
+        except Exception as error:
+            self.__put(error, queue, stop)
+        self.__put(END, queue, stop)
+
+    def __opened(self):
+        if self.__compression == 'gzip':
+            return gzip.open(self.__file, 'rb')
+        if self.__compression == 'zstandard':
+            return zstandard.open(self.__file, 'rb')
+        return open(self.__file, 'rb')
+
+    @staticmethod
+    def __put(item, queue, stop):
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=TIMEOUT)
+            except Full:
+                continue
+            return
+
+    @staticmethod
+    def __available(compression):
+        if compression == 'zstandard' and zstandard is None:
+            log.error('Attempt to read zstandard-compressed file without'
+                      ' the zstandard package installed.')
+            raise ImportError('Reading .zst files requires the zstandard'
+                              ' package!')
+        return compression
+
+    @staticmethod
+    def __string_type_checked(file):
+        if not isinstance(file, str):
+            log.error('Attempt to stream file given by non-string type.')
+            raise TypeError('Only files given by name can be streamed!')
+        return file
+
+    @staticmethod
+    def __integer_type_and_range_checked(number, name):
+        if not isinstance(number, int):
+            log.error('Attempt to set {0} of stream to non-integer'
+                      ' type.'.format(name.lower()))
+            raise TypeError('{0} must be a positive integer!'.format(name))
+        if number < 1:
+            log.error('Attempt to set {0} of stream to less than'
+                      ' one.'.format(name.lower()))
+            raise ValueError('{0} must be a positive integer!'.format(name))
+        return number
+
+
+def compression_of(file):
+    """Compression format inferred from the extension of a file name."""
+    for extension, compression in COMPRESSION_OF.items():
+        if file.lower().endswith(extension):
+            return compression
+    return None
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from collections.abc import Mapping
+from numpy import ndarray, frombuffer, diff, flatnonzero, argsort
+from numpy import cumsum, zeros, fromiter, full
+from numpy import integer, uint8, uint64, int32, int64
+from .hashing import NEWLINE, words_of, hashed, hash_of, decoded
+
+UNKNOWN = -1
+
+
+class TableFrom(Mapping):
+    """Read-only mapping from integer index to string ID, backed by arrays.
+
+    IDs are held UTF-8 encoded in one contiguous byte buffer, with the
+    ID of index `i` stored between `offsets[i]` and `offsets[i + 1]`.
+    The reverse mapping from ID to index is provided by `index_of`.
+
+    """
+
+    def __init__(self, buffer, offsets, hashes=None, order=None):
+        self.__buffer = self.__array_type_checked(buffer, 'buffer')
+        self.__offsets = self.__array_type_checked(offsets, 'offsets')
+        if hashes is not None:
+            self.__hashes = self.__array_type_checked(hashes, 'hashes')
+        if order is not None:
+            self.__order = self.__array_type_checked(order, 'order')
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    @classmethod
+    def from_ids(cls, identifiers):
+        """Encode a sequence of strings into a new table in the given order.
+
+        Parameters
+        ----------
+        identifiers : list
+            Unique IDs as strings, in the order of their integer index.
+
+        Returns
+        -------
+        Instance of `TableFrom` mapping list positions to IDs.
+
+        """
+        encoded = [cls.__string_type_checked(identifier).encode()
+                   for identifier in identifiers]
+        offsets = zeros(len(encoded) + 1, dtype=int64)
+        cumsum(fromiter(map(len, encoded), dtype=int64, count=len(encoded)),
+               out=offsets[1:])
+        return cls(frombuffer(b''.join(encoded), dtype=uint8), offsets)
+
+    @property
+    def buffer(self):
+        """UTF-8 encoded IDs, concatenated into one array of bytes."""
+        return self.__buffer
+
+    @property
+    def offsets(self):
+        """Start of the ID with each index in the buffer, plus its end."""
+        return self.__offsets
+
+    @property
+    def hashes(self):
+        """Sorted 64-bit hashes of all IDs."""
+        if not self.__has('hashes'):
+            hashes = hashes_of(self.__buffer, self.__offsets)
+            self.__order = argsort(hashes, kind='stable')
+            self.__order = self.__order.astype(self.__index_type())
+            self.__hashes = hashes[self.__order]
+        return self.__hashes
+
+    @property
+    def order(self):
+        """Indices of IDs in the order of their sorted hashes."""
+        if not self.__has('order'):
+            _ = self.hashes
+        return self.__order
+
+    @property
+    def index_of(self):
+        """Read-only mapping from string ID to integer index."""
+        if not self.__has('index_of'):
+            self.__index_of = LookupFrom(self)
+        return self.__index_of
+
+    def ids_of(self, indices):
+        """List of IDs with the given array of (valid) integer indices."""
+        if self.__has_newline():
+            return [self[index] for index in indices.tolist()]
+        return decoded(self.__buffer,
+                       self.__offsets[indices],
+                       self.__offsets[indices + 1])
+
+    def __getitem__(self, index):
+        if not isinstance(index, (int, integer)):
+            raise KeyError(index)
+        if not 0 <= index < len(self):
+            raise KeyError(index)
+        start, stop = self.__offsets[index:index + 2].tolist()
+        return self.__buffer[start:stop].tobytes().decode()
+
+    def __len__(self):
+        return self.__offsets.size - 1
+
+    def __iter__(self):
+        return iter(range(len(self)))
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+    def __has_newline(self):
+        if not self.__has('newline'):
+            self.__newline = bool((self.__buffer == NEWLINE).any())
+        return self.__newline
+
+    def __index_type(self):
+        return int32 if len(self) < 2**31 else int64
+
+    @staticmethod
+    def __array_type_checked(array, name):
+        if not isinstance(array, ndarray):
+            log.error('Attempt to instantiate table object with {0} not of'
+                      ' type <numpy.ndarray>.'.format(name))
+            raise TypeError('Arrays of table object must be of type'
+                            ' <numpy.ndarray>!')
+        return array
+
+    @staticmethod
+    def __string_type_checked(identifier):
+        if not isinstance(identifier, str):
+            log.error('Attempt to instantiate table object with'
+                      ' non-string ID.')
+            raise TypeError('IDs in table object must be strings!')
+        return identifier
+
+
+class LookupFrom(Mapping):
+    """Read-only mapping from string ID to its index in a `TableFrom`.
+
+    IDs are found by binary search of their hash among the sorted hashes
+    of the table, followed by a comparison of the bytes of all candidates.
+    Iteration yields IDs in the order of their index, just like a
+    dictionary that was filled in that order.
+
+    """
+
+    def __init__(self, table):
+        self.__table = table
+        self.__class_prefix = '_' + self.__class__.__name__ + '__'
+
+    def __getitem__(self, identifier):
+        if not isinstance(identifier, str):
+            raise KeyError(identifier)
+        if not self.__has('hashes'):
+            self.__hashes = self.__table.hashes
+            self.__order = self.__table.order
+            self.__offsets = self.__table.offsets
+            self.__buffer = self.__table.buffer
+        encoded = identifier.encode()
+        value = hash_of(encoded)
+        position = int(self.__hashes.searchsorted(uint64(value)))
+        while (position < self.__hashes.size and
+               self.__hashes.item(position) == value):
+            index = self.__order.item(position)
+            start = self.__offsets.item(index)
+            stop = self.__offsets.item(index + 1)
+            if self.__buffer[start:stop].tobytes() == encoded:
+                return index
+            position += 1
+        raise KeyError(identifier)
+
+    def indices_of(self, identifiers):
+        """Array of indices of the given IDs, with -1 for unknown ones."""
+        valid = fromiter((isinstance(identifier, str)
+                          for identifier in identifiers),
+                         dtype=bool, count=len(identifiers))
+        query = TableFrom.from_ids([identifier if is_valid else ''
+                                    for identifier, is_valid
+                                    in zip(identifiers, valid.tolist())])
+        hashes = self.__table.hashes
+        order = self.__table.order
+        wanted = hashes_of(query.buffer, query.offsets)
+        positions = hashes.searchsorted(wanted)
+        indices = full(len(query), UNKNOWN, dtype=int64)
+        pending = flatnonzero(valid)
+        while pending.size:
+            pending = pending[positions[pending] < hashes.size]
+            pending = pending[hashes[positions[pending]] == wanted[pending]]
+            candidates = order[positions[pending]].astype(int64)
+            same = matching(query, pending, self.__table, candidates)
+            indices[pending[same]] = candidates[same]
+            pending = pending[~same]
+            positions[pending] += 1
+        return indices
+
+    def __len__(self):
+        return len(self.__table)
+
+    def __iter__(self):
+        return (self.__table[index] for index in range(len(self.__table)))
+
+    def __has(self, attribute):
+        return hasattr(self, self.__class_prefix + attribute)
+
+
+def hashes_of(buffer, offsets):
+    """64-bit hashes of all IDs in buffer, mixed in 8-byte words."""
+    return hashed(diff(offsets),
+                  words_of(buffer, offsets[:-1], offsets[1:]))
+
+
+def matching(table, indices, other, other_indices):
+    """Mask of IDs in table equal to the IDs at the same position in other."""
+    starts = table.offsets[indices]
+    lengths = table.offsets[indices + 1] - starts
+    other_starts = other.offsets[other_indices]
+    same = lengths == other.offsets[other_indices + 1] - other_starts
+    checking = flatnonzero(same)
+    position = 0
+    while checking.size:
+        checking = checking[lengths[checking] > position]
+        differ = (table.buffer[starts[checking] + position] !=
+                  other.buffer[other_starts[checking] + position])
+        same[checking[differ]] = False
+        checking = checking[~differ]
+        position += 1
+    return same
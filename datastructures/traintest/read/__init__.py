@@ -1,4 +1,4 @@
 # -*- coding: utf-8 -*-
 
-from .from_csv import from_csv
+from .from_csv import from_csv, from_csv_partitions
 from .from_postgreSQL import from_postgreSQL
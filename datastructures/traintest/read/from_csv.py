@@ -2,59 +2,178 @@
 
 import logging as log
 import datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat, compress
 from collections import defaultdict
+from operator import itemgetter
+from warnings import catch_warnings, simplefilter
+from numpy import array, empty, zeros, ones, where, concatenate, fromiter
+from numpy import flatnonzero, isnat, datetime_as_string, int64, uint32
+from ...auxiliary import ShardsFrom, StreamFrom
+from ...transactions.read.from_csv import reindexed
 
+EPOCH = dt.datetime(1970, 1, 1)
+MICROSECOND = dt.timedelta(microseconds=1)
+SECOND_IN_MICROSECONDS = 1000000
+FIRST_SECOND = (dt.datetime.min - EPOCH) // dt.timedelta(seconds=1)
+LAST_SECOND = (dt.datetime.max - EPOCH) // dt.timedelta(seconds=1)
+DATE_WIDTH = 10
+ISO_FORMATS = {'%Y-%m-%d': ('D', None),
+               '%Y-%m-%d %H:%M': ('m', ' '),
+               '%Y-%m-%dT%H:%M': ('m', 'T'),
+               '%Y-%m-%d %H:%M:%S': ('s', ' '),
+               '%Y-%m-%dT%H:%M:%S': ('s', 'T'),
+               '%Y-%m-%d %H:%M:%S.%f': ('us', ' '),
+               '%Y-%m-%dT%H:%M:%S.%f': ('us', 'T')}
 
-def from_csv(file, separator=';', fmt=None):
+
+def from_csv(file, separator=';', fmt=None, workers=1):
+    check_string_type_of(separator)
+    check_integer_type_and_range_of(workers)
+    stream = StreamFrom(file)
+    if workers > 1 and not stream.compression:
+        ranges = ShardsFrom(file, workers).ranges
+        shard = partial(parsed_shard, file=file, separator=separator, fmt=fmt)
+        with ProcessPoolExecutor(workers) as pool:
+            shards = list(pool.map(shard, ranges))
+    elif stream.compression:
+        if workers > 1:
+            log.warning('Compressed files cannot be split into shards.'
+                        ' Reading with a single process.')
+        shards = [parsed(stream.lines(), separator, fmt)]
+    else:
+        with open(file) as stream:
+            shards = [parsed(stream, separator, fmt)]
+    return merged(shards)
+
+
+def from_csv_partitions(files, separator=';', fmt=None, workers=1):
+    """Read a list of files as one, counting transactions per file.
+
+    Returns the same as `from_csv`, followed by a dictionary with the
+    numbers of valid transactions and corrupted records in each file.
+
+    """
     check_string_type_of(separator)
-    format_of = fmt
+    check_integer_type_and_range_of(workers)
+    if workers > 1:
+        with ProcessPoolExecutor(min(workers, len(files))) as pool:
+            shards = list(pool.map(parsed_file, files,
+                                   repeat(separator), repeat(fmt)))
+    else:
+        shards = [parsed_file(file, separator, fmt) for file in files]
+    partitions = {file: {'number_of_transactions': n_trans,
+                         'number_of_corrupted_records': n_corr}
+                  for file, (n_trans, n_corr, *_) in zip(files, shards)}
+    return merged(shards, files) + (partitions,)
+
+
+def parsed_file(file, separator, fmt):
+    """Parse all lines of a file, whether compressed or not."""
+    stream = StreamFrom(file)
+    if stream.compression:
+        return parsed(stream.lines(), separator, fmt)
+    with open(file) as lines:
+        return parsed(lines, separator, fmt)
+
+
+def parsed_shard(bounds, file, separator, fmt):
+    """Parse the lines of a file between a (start, stop) tuple of offsets."""
+    return parsed(ShardsFrom(file, 1).lines_between(*bounds), separator, fmt)
+
+
+def parsed(lines, separator, fmt):
+    """Parse lines into columns of times and user and item indices.
+
+    Nothing is logged here, so that shards can be parsed in other processes.
+    Warnings are returned as list of `(line, message)` tuples instead, with
+    `line` set to ``None`` for messages that do not refer to a line number.
+    Users and items are indexed in order of first appearance in the shard.
+    Timestamps are only converted once all lines are split into fields.
+
+    """
+    problems = []
+    timestamps = []
+    users = []
+    items = []
+    line_of = []
+
+    for line, transaction in enumerate(lines):
+        try:
+            timestamp, user, item = transaction.rstrip().split(separator)
+        except ValueError:
+            problems.append((line, (line, 'Could not interpret transaction'
+                                          ' on line {0}. Skipping.')))
+            continue
+        if not all((timestamp, user, item)):
+            problems.append((line, (line, 'Transaction on line {0} contains'
+                                          ' empty fields. Skipping.')))
+            continue
+        timestamps.append(timestamp)
+        users.append(user)
+        items.append(item)
+        line_of.append(line)
+
+    times, valid, failures = microseconds_of(timestamps, fmt)
+    number_of_corrupted_records = len(problems) + len(failures)
+    for position, message in failures:
+        line = line_of[position]
+        problems += [(line, (None, message)),
+                     (line, (line, 'Could not interpret timestamp on'
+                                   ' line {0}. Skipping.'))]
+    problems.sort(key=itemgetter(0))
+    valid = valid.tolist()
+    userIndex_of = defaultdict(lambda: len(userIndex_of))
+    itemIndex_of = defaultdict(lambda: len(itemIndex_of))
+    users = fromiter(map(userIndex_of.__getitem__, compress(users, valid)),
+                     dtype=int64)
+    items = fromiter(map(itemIndex_of.__getitem__, compress(items, valid)),
+                     dtype=int64)
+
+    return (users.size,
+            number_of_corrupted_records,
+            [problem for _, problem in problems],
+            list(userIndex_of),
+            list(itemIndex_of),
+            (times[valid], users, items))
+
+
+def merged(shards, files=None):
+    """Concatenate the columns of shards and reconcile their indices.
+
+    Users and items are indexed in order of first appearance over all
+    shards. If shards are whole files, their names can be given to report
+    line numbers per file.
+
+    """
     number_of_transactions = 0
     number_of_corrupted_records = 0
-    transactions = []
-    last_unique_items_of = defaultdict(lambda:
-                           defaultdict(lambda: dt.datetime(1, 1, 1)))
+    userIndex_of = {}
+    itemIndex_of = {}
+    times = [empty(0, dtype=int64)]
+    users = [empty(0, dtype=int64)]
+    items = [empty(0, dtype=int64)]
 
-    def process_transaction_time():
-        try:
-            time = depending_on(format_of)(timestamp)
-        except (ValueError, OverflowError):
-            line_no = number_of_transactions + number_of_corrupted_records + 1
-            log.warning('Could not interpret timestamp on line {0}. '
-                        'Skipping.'.format(line_no))
-            return 0
-        if time > last_unique_items_of[user][item]:
-            last_unique_items_of[user][item] = time
-        transactions.append((time.isoformat(), user, item))
-        return 1
-
-    def log_corrupted_transaction():
-        line_number = number_of_transactions + number_of_corrupted_records + 1
-        log.warning('Transaction on line {0} contains empty fields. '
-                    'Skipping.'.format(line_number))
-        return 0
-
-    process = {True : process_transaction_time,
-               False: log_corrupted_transaction}
-
-    with open(file) as stream:
-        for transaction in stream:
-            try:
-                timestamp, user, item = transaction.rstrip().split(separator)
-            except ValueError:
-                number_of_corrupted_records += 1
-                line = number_of_transactions + number_of_corrupted_records
-                log.warning('Could not interpret transaction on line {0}. '
-                            'Skipping.'.format(line))
-            else:
-                complete_record = all((timestamp, user, item))
-                success = process[complete_record]()
-                number_of_transactions += success
-                number_of_corrupted_records += 1 - success
+    for file, shard in zip(repeat(None) if files is None else files, shards):
+        n_trans, n_corr, problems, user_ids, item_ids, columns = shard
+        if file is None:
+            log_corrupted(problems, number_of_transactions +
+                                    number_of_corrupted_records)
+        else:
+            log_corrupted(problems, file=file)
+        number_of_transactions += n_trans
+        number_of_corrupted_records += n_corr
+        shard_times, shard_users, shard_items = columns
+        times.append(shard_times)
+        users.append(reindexed(user_ids, userIndex_of)[shard_users])
+        items.append(reindexed(item_ids, itemIndex_of)[shard_items])
 
     return (number_of_transactions,
             number_of_corrupted_records,
-            finalized(last_unique_items_of),
-            transactions)
+            userIndex_of,
+            itemIndex_of,
+            (concatenate(times), concatenate(users), concatenate(items)))
 
 
 def check_string_type_of(separator):
@@ -63,35 +182,138 @@ def check_string_type_of(separator):
         raise TypeError('Separator argument must be a string!')
 
 
-def depending_on(fmt=None):
+def check_integer_type_and_range_of(workers):
+    if not isinstance(workers, int):
+        log.error('Attempt to set number of workers to non-integer type.')
+        raise TypeError('Number of workers must be a positive integer!')
+    if workers < 1:
+        log.error('Attempt to set number of workers to less than one.')
+        raise ValueError('Number of workers must be a positive integer!')
+
+
+def log_corrupted(problems, lines_before=0, file=None):
+    for line, message in problems:
+        if line is not None:
+            message = message.format(lines_before + line + 1)
+        log.warning(message if file is None else file + ': ' + message)
+
+
+def microseconds_of(timestamps, fmt=None):
+    """Convert a list of timestamps into microseconds since 1970.
+
+    Integer epochs and timestamps in one of the `ISO_FORMATS` are converted
+    all at once by numpy. Those that numpy cannot convert, or that do not
+    strictly adhere to the format, are converted one by one as returned by
+    `depending_on`, just like timestamps in any other format. Returns the
+    times, a mask of those converted, and a list of `(position, message)`
+    tuples for those that could not be converted.
+
+    """
+    strings = array(timestamps, dtype=str)
+    if fmt is None:
+        times, valid = epochs_from(strings)
+    elif fmt in ISO_FORMATS:
+        times, valid = isoformats_from(strings, *ISO_FORMATS[fmt])
+    else:
+        times = zeros(strings.size, dtype=int64)
+        valid = zeros(strings.size, dtype=bool)
+    messages = []
+    format_of = depending_on(fmt, messages.append)
+    failures = []
+    for position in flatnonzero(~valid).tolist():
+        try:
+            times[position] = format_of(timestamps[position])
+        except (ValueError, OverflowError):
+            failures.append((position, messages.pop()))
+        else:
+            valid[position] = True
+    return times, valid, failures
+
+
+def epochs_from(strings):
+    """Convert an array of strings with Unix epochs into microseconds."""
+    seconds, valid = converted(strings, int64)
+    valid &= (seconds >= FIRST_SECOND) & (seconds <= LAST_SECOND)
+    return where(valid, seconds, 0) * SECOND_IN_MICROSECONDS, valid
+
+
+def isoformats_from(strings, unit, separator):
+    """Convert an array of strings in ISO format into microseconds.
+
+    As numpy is more lenient than `datetime.strptime`, conversions count
+    only if the converted time, formatted back into a string with the same
+    `unit` and date-time `separator`, is the same as the original string.
+
+    """
+    with catch_warnings():
+        simplefilter('ignore', DeprecationWarning)
+        times, valid = converted(strings, 'datetime64[us]')
+    valid &= ~isnat(times)
+    formatted = datetime_as_string(times, unit=unit)
+    if separator not in (None, 'T'):
+        codes = formatted.view(uint32).reshape(formatted.size,
+                                               formatted.itemsize // 4)
+        codes[:, DATE_WIDTH] = ord(separator)
+    valid &= formatted == strings
+    return times.astype(int64), valid
+
+
+def converted(strings, dtype):
+    """Convert an array of strings to dtype, isolating those that fail.
+
+    If not all strings can be converted at once, the array is split in
+    halves, recursively, such that only the halves containing strings
+    that fail are converted again. Returns the converted values together
+    with a mask of the strings that were successfully converted.
+
+    """
+    try:
+        return strings.astype(dtype), ones(strings.size, dtype=bool)
+    except (ValueError, OverflowError):
+        if strings.size == 1:
+            return zeros(1, dtype=dtype), zeros(1, dtype=bool)
+    middle = strings.size // 2
+    head, head_valid = converted(strings[:middle], dtype)
+    tail, tail_valid = converted(strings[middle:], dtype)
+    return concatenate((head, tail)), concatenate((head_valid, tail_valid))
+
+
+def depending_on(fmt=None, warn=log.warning):
+    """Function converting timestamps into microseconds since 1970.
+
+    Integer timestamps are taken as Unix epochs in seconds. Timestamps
+    parsed according to `fmt` are taken as they are, unless they carry
+    a time zone, in which case they are converted to UTC first.
+
+    """
 
     def fromstring(timestamp):
         try:
             time = dt.datetime.strptime(timestamp, fmt)
         except ValueError:
-            log.warning('Failed to read timestamp. Check that it adheres to '
-                        'the given format "{0}".'.format(fmt))
+            warn('Failed to read timestamp. Check that it adheres to '
+                 'the given format "{0}".'.format(fmt))
             raise ValueError
-        return time
+        return microseconds_from(time)
 
     def fromstamp(timestamp):
         try:
             time = int(timestamp)
         except ValueError:
-            log.warning('Failed to convert UNIX epoch timestamp to integer.')
+            warn('Failed to convert UNIX epoch timestamp to integer.')
             raise ValueError
         try:
-            converted = dt.datetime.fromtimestamp(time)
+            converted = EPOCH + dt.timedelta(seconds=time)
         except OverflowError:
-            log.warning('Integer is not a valid UNIX epoch timestamp.')
+            warn('Integer is not a valid UNIX epoch timestamp.')
             raise OverflowError
-        return converted
+        return microseconds_from(converted)
 
     return fromstring if fmt else fromstamp
 
 
-def finalized(last_unique):
-    last_unique_items = {user: {item: time.isoformat()
-                                for item, time in article.items()}
-                         for user, article in last_unique.items()}
-    return last_unique_items
+def microseconds_from(time):
+    """Microseconds since 1970 of a datetime, in UTC if it has a time zone."""
+    if time.tzinfo is not None:
+        time = time.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return (time - EPOCH) // MICROSECOND
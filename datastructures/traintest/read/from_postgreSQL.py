@@ -1,67 +1,104 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
-import datetime as dt
-from collections import defaultdict
-from psycopg2 import connect, OperationalError, ProgrammingError
+from numpy import array, empty, concatenate, int64
+from psycopg2 import OperationalError, ProgrammingError
 from ...auxiliary import PostgreSQLparams
+from ...auxiliary.fetching import batches_from
+
+CURSOR = 'bestpy_traintest'
+INTEGER_TYPES = (20, 21, 23)
+TIMESTAMP_TYPES = (1114, 1184)
+HEAD = """CREATE TEMPORARY TABLE bestpy_head ON COMMIT DROP AS
+          SELECT row_number() OVER () AS position,
+                 %(timestamp)s AS time,
+                 %(userid)s AS userid,
+                 %(articleid)s AS articleid
+          FROM (SELECT %(timestamp)s, %(userid)s, %(articleid)s
+                FROM %(table)s
+                LIMIT %(limit)s) AS head"""
+TYPE = 'SELECT time FROM bestpy_head LIMIT 0'
+VALID = """time IS NOT NULL
+           AND coalesce(userid::text, '') <> ''
+           AND coalesce(articleid::text, '') <> ''"""
+CODED = """CREATE TEMPORARY TABLE bestpy_coded ON COMMIT DROP AS
+           SELECT position,
+                  {0} AS epoch,
+                  dense_rank() OVER (ORDER BY userid) - 1 AS user_index,
+                  dense_rank() OVER (ORDER BY articleid) - 1 AS item_index
+           FROM bestpy_head
+           WHERE {1}"""
+COUNTS = """SELECT count(*) FILTER (WHERE {0}),
+                   count(*) FILTER (WHERE NOT ({0}))
+            FROM bestpy_head""".format(VALID)
+IDS = """SELECT DISTINCT {0} FROM bestpy_head
+         WHERE {1}
+         ORDER BY {0}"""
+TRANSACTIONS = """SELECT epoch, user_index, item_index
+                  FROM bestpy_coded
+                  ORDER BY position"""
 
 
 def from_postgreSQL(database):
-    check_type_of(database)
-    number_of_transactions = 0
-    number_of_corrupted_records = 0
-    transactions = []
-    last_unique_items_of = defaultdict(lambda:
-                           defaultdict(lambda: dt.datetime(1, 1, 1)))
-
-    query = """SELECT %(timestamp)s, %(userid)s, %(articleid)s
-               FROM %(table)s
-               LIMIT %(limit)s"""
-
-    def process_valid_transaction(record):
-        timestamp, user, item = record
-        time = converted(timestamp)
-        if time > last_unique_items_of[user][item]:
-            last_unique_items_of[user][item] = time
-        transactions.append((time.isoformat(), user, item))
-        return 1
-
-    def log_corrupted_transaction(record):
-        log.warning('Incomplete record returned from database. Skipping.')
-        return 0
+    """Read transactions with their IDs and times encoded on the server.
+
+    The requested rows are copied into a temporary table first, so that
+    all subsequent queries see exactly the same records. User and item
+    IDs are then replaced by their dense rank and timestamps by integer
+    epochs, such that only triples of integers need to be fetched.
 
-    process = {True : process_valid_transaction,
-               False: log_corrupted_transaction}
+    """
+    check_type_of(database)
 
     try:
-        connection = connect(database.login)
+        connection = database._connect()
     except OperationalError:
         log.error('Failed connecting to {} @{}.'.format(database.login_db_name,
                                                         database.login_host))
         raise OperationalError('Connect to database failed. Check settings!')
 
-    with connection.cursor() as cursor:
-        try:
-            cursor.execute(query, database._params)
-        except ProgrammingError:
-            log.error('Failed to execute SQL query. Check your parameters!')
-            raise ProgrammingError('SQL query failed. Check your parameters!')
-        else:
-            for record in cursor:
-                complete = all(record)
-                success = process[complete](record)
-                number_of_transactions += success
-                number_of_corrupted_records += 1 - success
-        finally:
-            connection.close()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(HEAD, database._params)
+            cursor.execute(TYPE)
+            epoch = epoch_for(cursor.description[0].type_code)
+            cursor.execute(CODED.format(epoch, VALID))
+            cursor.execute(COUNTS)
+            number_of_transactions, number_of_corrupted_records = \
+                cursor.fetchone()
+            cursor.execute(IDS.format('userid', VALID))
+            users = [user for user, in cursor.fetchall()]
+            cursor.execute(IDS.format('articleid', VALID))
+            items = [item for item, in cursor.fetchall()]
+        # A named cursor lives on the server, which only ever sends as many
+        # records as are fetched. It is discarded when the transaction ends.
+        cursor = connection.cursor(CURSOR)
+        cursor.execute(TRANSACTIONS)
+        times, user_indices, item_indices = triples_from(
+            batches_from(cursor, database.batch_size))
+    except ProgrammingError:
+        log.error('Failed to execute SQL query. Check your parameters!')
+        raise ProgrammingError('SQL query failed. Check your parameters!')
+    finally:
+        database._release(connection)
+
+    for _ in range(number_of_corrupted_records):
+        log.warning('Incomplete record returned from database. Skipping.')
 
     compare(number_of_transactions, database)
 
     return (number_of_transactions,
             number_of_corrupted_records,
-            finalized(last_unique_items_of),
-            transactions)
+            {user: index for index, user in enumerate(users)},
+            {item: index for index, item in enumerate(items)},
+            (times, user_indices, item_indices))
+
+
+def triples_from(batches):
+    """Stack batches of integer triples into three 64-bit integer arrays."""
+    blocks = [empty((0, 3), dtype=int64)]
+    blocks += [array(records, dtype=int64) for records in batches]
+    return concatenate(blocks).T
 
 
 def check_type_of(database):
@@ -72,14 +109,19 @@ def check_type_of(database):
                         ' type <PostgreSQLparams>!')
 
 
-def converted(timestamp):
-    converted = {dt.datetime: lambda time: time,
-                         int: lambda time: dt.datetime.fromtimestamp(time)}
-    type_of = type(timestamp)
-    if type_of not in converted.keys():
-        log.error('Type of timestamp field is neither integer nor timestamp.')
-        raise TypeError('Timestamp field must be an integer or a timestamp!')
-    return converted[type_of](timestamp)
+def epoch_for(type_code):
+    """SQL expression for the microseconds since 1970 of the timestamp field.
+
+    Integer fields are taken as Unix epochs in seconds. Timestamps without
+    time zone are taken as they are, and those with time zone in UTC.
+
+    """
+    if type_code in INTEGER_TYPES:
+        return 'time::bigint * 1000000'
+    if type_code in TIMESTAMP_TYPES:
+        return '(extract(epoch FROM time) * 1000000)::bigint'
+    log.error('Type of timestamp field is neither integer nor timestamp.')
+    raise TypeError('Timestamp field must be an integer or a timestamp!')
 
 
 def compare(available, database):
@@ -90,10 +132,3 @@ def compare(available, database):
                                                          available))
         log.info('Resetting limit to the maximum of {}.'.format(available))
         database.limit = available
-
-
-def finalized(last_unique):
-    last_unique_items = {user: {item: time.isoformat()
-                                for item, time in article.items()}
-                         for user, article in last_unique.items()}
-    return last_unique_items
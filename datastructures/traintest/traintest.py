@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
-from operator import itemgetter
-from ..auxiliary import TestDataFrom, FileFrom
+import datetime as dt
+from collections import defaultdict
+from numpy import where, flatnonzero, full, minimum, argsort, count_nonzero
+from numpy import empty, arange, unique, lexsort, searchsorted, bincount
+from ..auxiliary import TestDataFrom
 from .traintestbase import TrainTestBase
+from .read.from_csv import microseconds_from
 from ..transactions import Transactions
 
 
@@ -33,6 +37,20 @@ class TrainTest(TrainTestBase):
     max_hold_out : int
         Maximum number of unique articles that can be held out for testing.
 
+    partitions : dict
+        Number of transactions and of corrupted records in each file,
+        if the data were read from several files.
+
+    user : object
+        Translates between customer IDs and integer customer indices.
+
+    item : object
+        Translates between article IDs and integer article indices.
+
+    history : object
+        Holds all transactions as columns of integer times (microseconds
+        since 1970), customer indices, and article indices.
+
     Methods
     -------
     split(hold_out, only_new)
@@ -42,6 +60,18 @@ class TrainTest(TrainTestBase):
         should be recommened or also previously purchased ones. Once called,
         the data attributes `train` and `test` are revealed.
 
+    splits(hold_outs, only_new)
+        Generates splits for each of several `hold_outs` and, for each,
+        both or either setting of `only_new`, sorting all purchase
+        histories only once. Attributes `train` and `test` are set for
+        each split in turn.
+
+    rolling(cutoffs, horizon, hold_out, only_new)
+        Generates splits at each of several points in time, with all
+        transactions before as training data and the first `hold_out`
+        articles each customer bought within the `horizon` after as test
+        data. Training data grow from one split to the next.
+
     Examples
     --------
     >>> data = TrainTest.from_csv(file)
@@ -56,11 +86,10 @@ class TrainTest(TrainTestBase):
 
     """
 
-    def __init__(self, n_trans, n_corr, unique, transactions):
+    def __init__(self, n_trans, n_corr, user_i, item_j, history,
+                 partitions=None):
         super().__setattr__('_TrainTest__is_split', False)
-        super().__init__(n_trans, n_corr, unique, transactions)
-        self.__unique = self._TrainTestBase__unique
-        self.__transactions = self._TrainTestBase__transactions
+        super().__init__(n_trans, n_corr, user_i, item_j, history, partitions)
 
     def __setattr__(self, name, value):
         """Makes attributes 'test' and 'train' read-only once we are split."""
@@ -92,39 +121,268 @@ class TrainTest(TrainTestBase):
         """
         self.__check_boolean_type_of(only_new)
         hold_out = self.__checked_for_integer_type_and_range_of(hold_out)
-        keep = {user: items
-                for user, items in self.__unique.items()
-                if len(items) >= hold_out}
-        last_unique_items_of = {user: self.__last(unique_items)[:hold_out]
-                                for user, unique_items in keep.items()}
-        test = {user: self.__items_from(last_transactions)
-                for user, last_transactions in last_unique_items_of.items()}
+        self.__split(hold_out, only_new)
+
+    def splits(self, hold_outs, only_new=(True, False)):
+        """Generate one split after the other for several settings.
+
+        Each customer's purchase history is sorted only once, on the first
+        split, and training data are assembled from the aggregated counts
+        of (customer, article) pairs, such that any further split is cheap.
+        For each combination of `hold_out` and `only_new`, the attributes
+        `train` and `test` are set just as by calling `split`, before the
+        effective settings are yielded.
+
+        Parameters
+        ----------
+        hold_outs : list or tuple
+            Numbers of unique articles to retain from each customer's
+            purchase history for testing, each just like `hold_out` in
+            the `split` method.
+
+        only_new : bool or tuple, optional
+            Whether only articles that a given customer has not yet bought
+            will be recommended. Defaults to both, first True, then False.
+
+        Yields
+        ------
+        Tuple of `hold_out` and `only_new` of the current split.
+
+        Examples
+        --------
+        >>> for hold_out, only_new in data.splits([2, 4, 6]):
+        ...     recommender = RecoBasedOn(data.train)
+        ...     benchmark = Benchmark(recommender).against(data.test)
+        ...     scores[hold_out, only_new] = benchmark.score
+
+        """
+        modes = self.__booleans_checked(only_new)
+        hold_outs = [self.__checked_for_integer_type_and_range_of(hold_out)
+                     for hold_out in self.__sequence_type_checked(hold_outs)]
+        for hold_out in hold_outs:
+            for mode in modes:
+                self.__split(hold_out, mode)
+                yield hold_out, mode
+
+    def rolling(self, cutoffs, horizon, hold_out=1, only_new=True):
+        """Generate splits at a sequence of points in time for backtesting.
+
+        For each cutoff, all transactions before are training data, and
+        the articles customers went on to buy within the `horizon` after
+        are test data, just like in production. Training data are not
+        rebuilt for every cutoff. Rather, the same `Transactions` instance
+        grows by the transactions in between consecutive cutoffs, with
+        new customers and articles added to its indices. Any algorithm
+        operating on the training data must thus be attached again with
+        `operating_on` for each split. Cutoffs without any training or
+        test data are skipped with a warning.
+
+        Parameters
+        ----------
+        cutoffs : list or tuple
+            Increasing points in time as `datetime.datetime`. Those with a
+            time zone are converted to UTC, those without are taken in the
+            same time zone as the timestamps in the data.
+
+        horizon : `datetime.timedelta`
+            Length of the time window after each cutoff to take test
+            data from.
+
+        hold_out : int, optional
+            Number of unique articles bought within the test window that
+            are retained for testing. These are the first ones each
+            customer bought, and customers who bought fewer are left out.
+            Defaults to 1.
+
+        only_new : bool, optional
+            Whether only articles that a given customer has not yet bought
+            before the cutoff will be recommended and tested. Defaults to
+            True.
+
+        Yields
+        ------
+        The cutoff of the current split.
+
+        Examples
+        --------
+        >>> weeks = [start + week * n for n in range(52)]
+        >>> for cutoff in data.rolling(weeks, week, 3):
+        ...     recommender = RecoBasedOn(data.train)
+        ...     benchmark = Benchmark(recommender).against(data.test)
+        ...     scores[cutoff] = benchmark.score
+
+        """
+        self.__check_boolean_type_of(only_new)
+        hold_out = self.__checked_for_integer_type_and_range_of(hold_out)
+        horizon = self.__horizon_type_and_range_checked(horizon)
+        cutoffs = self.__cutoffs_type_and_order_checked(cutoffs)
+        history = self.history
+        order = argsort(history.times, kind='stable')
+        times = history.times[order]
+        moments = [microseconds_from(cutoff) for cutoff in cutoffs]
+        starts = searchsorted(times, moments).tolist()
+        stops = searchsorted(times, [microseconds_from(cutoff + horizon)
+                                     for cutoff in cutoffs]).tolist()
+        train = None
+        trained = 0
+        for cutoff, moment, start, stop in zip(cutoffs, moments,
+                                               starts, stops):
+            pairs, first, counts = self.__pairs_in(order[trained:start])
+            users = history.pair_users[pairs]
+            items = history.pair_items[pairs]
+            trained = start
+            if train is None and not pairs.size:
+                log.warning('No training data before {0}.'
+                            ' Skipping.'.format(cutoff))
+                continue
+            if train is None:
+                train = self.__train_from(users, items, counts, first)
+            elif pairs.size:
+                train._add(self.user.ids_of(users), self.item.ids_of(items),
+                           counts)
+            test = self.__window_from(order[start:stop], moment, hold_out,
+                                      only_new)
+            if not test:
+                log.warning('No test data between {0} and {1}.'
+                            ' Skipping.'.format(cutoff, cutoff + horizon))
+                continue
+            self.__is_split = False
+            self.test = TestDataFrom(test, hold_out, only_new)
+            self.test.__doc__ = TrainTest.__test_docstring
+            self.train = train
+            self.__is_split = True
+            yield cutoff
+
+    def __pairs_in(self, rows):
+        """Pairs bought in rows with their counts, by their first purchase."""
+        pairs, first, counts = unique(self.history.pair_of[rows],
+                                      return_index=True, return_counts=True)
+        ranked = argsort(first)
+        return pairs[ranked], first[ranked], counts[ranked]
+
+    def __window_from(self, rows, cutoff, hold_out, only_new):
+        """Test data from the first articles each customer bought in rows.
+
+        The `rows` of the history must be ordered by time. With `only_new`,
+        articles a customer already bought before the `cutoff` are ignored.
+
+        """
+        history = self.history
+        pairs, first = unique(history.pair_of[rows], return_index=True)
+        if only_new:
+            new = history.earliest[pairs] >= cutoff
+            pairs, first = pairs[new], first[new]
+        users = history.pair_users[pairs]
+        ranked = lexsort((first, users))
+        users = users[ranked]
+        rank = arange(users.size) - searchsorted(users, users)
+        enough = bincount(users)[users] >= hold_out
+        held = pairs[ranked[(rank < hold_out) & enough]]
+        return self.__test_from(history.pair_users[held],
+                                history.pair_items[held])
+
+    def __split(self, hold_out, only_new):
+        """Set test and training data from the pairs in the history."""
+        history = self.history
+        kept = history.unique_counts >= hold_out
+        held = (history.recency < hold_out) & kept[history.pair_users]
         if only_new:
-            train = (';'.join((timestamp, user, item))
-                     for timestamp, user, item in self.__transactions
-                     if user in keep.keys()
-                     and item not in test[user])
+            counts = where(held, 0, history.counts)
+            first = history.first
         else:
-            train = (';'.join((timestamp, user, item))
-                     for timestamp, user, item in self.__transactions
-                     if user in keep.keys()
-                     and (item, timestamp) not in last_unique_items_of[user])
+            counts = history.counts - where(held, history.last_counts, 0)
+            first = where(held, history.first_before_last, history.first)
+        retained = flatnonzero(kept[history.pair_users] & (counts > 0))
         self.__is_split = False
-        self.test = TestDataFrom(test, hold_out, only_new)
+        self.test = TestDataFrom(self.__test_from(history.pair_users[held],
+                                                  history.pair_items[held]),
+                                 hold_out, only_new)
         self.test.__doc__ = TrainTest.__test_docstring
-        self.train = Transactions.from_csv(FileFrom(train))
+        self.train = self.__train_from(history.pair_users[retained],
+                                       history.pair_items[retained],
+                                       counts[retained],
+                                       first[retained])
         self.train.__doc__ = TrainTest.__train_docstring
         self.__is_split = True
 
+    def __test_from(self, users, items):
+        """Dictionary with the set of held-out item IDs of each user ID."""
+        test = defaultdict(set)
+        for user, item in zip(self.user.ids_of(users),
+                              self.item.ids_of(items)):
+            test[user].add(item)
+        return dict(test)
+
+    def __train_from(self, users, items, counts, first):
+        """Training data from the counts of all retained pairs.
+
+        Users and items are indexed in order of their first retained
+        purchase, just as if the retained transactions had been read from
+        file. The `first` such purchase of each pair is thus required.
+
+        """
+        users, user_i = self.__compacted(users, first, self.user)
+        items, item_j = self.__compacted(items, first, self.item)
+        return Transactions(int(counts.sum()), 0, user_i, item_j,
+                            (users, items, counts))
+
+    def __compacted(self, indices, first, index):
+        """Renumber indices consecutively in order of their first purchase."""
+        earliest = full(index.count, self.history.size, dtype=first.dtype)
+        minimum.at(earliest, indices, first)
+        order = argsort(earliest)[:count_nonzero(earliest < self.history.size)]
+        rank = empty(index.count, dtype=order.dtype)
+        rank[order] = arange(order.size)
+        return rank[indices], dict(zip(index.ids_of(order), range(order.size)))
+
+    @staticmethod
+    def __booleans_checked(only_new):
+        modes = (only_new,) if isinstance(only_new, bool) else only_new
+        if not isinstance(modes, (list, tuple)) or not modes:
+            log.error('Attempt to set "only_new" to neither boolean nor'
+                      ' non-empty list or tuple.')
+            raise TypeError('Flag "only_new" can only be True or False,'
+                            ' or a list or tuple thereof!')
+        for mode in modes:
+            TrainTest.__check_boolean_type_of(mode)
+        return modes
+
+    @staticmethod
+    def __horizon_type_and_range_checked(horizon):
+        if not isinstance(horizon, dt.timedelta):
+            log.error('Attempt to set "horizon" to non-timedelta type.')
+            raise TypeError('Parameter "horizon" must be a positive'
+                            ' <datetime.timedelta>!')
+        if horizon <= dt.timedelta(0):
+            log.error('Attempt to set "horizon" to zero or less.')
+            raise ValueError('Parameter "horizon" must be a positive'
+                             ' <datetime.timedelta>!')
+        return horizon
+
     @staticmethod
-    def __last(unique):
-        """Sort dict by value time and return list of (item, time) tuples."""
-        return sorted(unique.items(), key=itemgetter(1), reverse=True)
+    def __cutoffs_type_and_order_checked(cutoffs):
+        err_msg = ('Parameter "cutoffs" must be a non-empty list or tuple'
+                   ' of increasing <datetime.datetime>!')
+        if not (isinstance(cutoffs, (list, tuple)) and cutoffs and
+                all(isinstance(cutoff, dt.datetime) for cutoff in cutoffs)):
+            log.error('Attempt to set "cutoffs" to other than a non-empty'
+                      ' list or tuple of datetimes.')
+            raise TypeError(err_msg)
+        moments = [microseconds_from(cutoff) for cutoff in cutoffs]
+        if any(later <= earlier
+               for earlier, later in zip(moments, moments[1:])):
+            log.error('Attempt to set "cutoffs" to datetimes not in'
+                      ' increasing order.')
+            raise ValueError(err_msg)
+        return cutoffs
 
     @staticmethod
-    def __items_from(last_transactions):
-        """Get set of items from list of (item, timestamp) tuples."""
-        return set(tuple(zip(*last_transactions))[0])
+    def __sequence_type_checked(hold_outs):
+        if not isinstance(hold_outs, (list, tuple)):
+            log.error('Attempt to set "hold_outs" to neither list nor tuple.')
+            raise TypeError('Parameter "hold_outs" must be a list or tuple'
+                            ' of integers!')
+        return hold_outs
 
     @staticmethod
     def __check_boolean_type_of(only_new):
@@ -2,25 +2,35 @@
 
 import logging as log
 from . import read
+from ..auxiliary import IndexFrom, HistoryFrom, PartitionsFrom
 
 
 class TrainTestBase:
-    def __init__(self, n_trans, n_corr, last_unique, transactions):
+    def __init__(self, n_trans, n_corr, user_i, item_j, history,
+                 partitions=None):
         self.__number_of_transactions = self.__int_type_value_checked(n_trans)
         self.__number_of_corrupted_records = self.__type_range_checked(n_corr)
-        self.__unique = self.__dict_type_and_empty_checked(last_unique)
-        self.__transactions = self.__list_type_and_entry_checked(transactions)
+        self.__user = IndexFrom(user_i)
+        self.__item = IndexFrom(item_j)
+        self.__history = HistoryFrom(*self.__tuple_type_checked(history))
+        self.__partitions = {} if partitions is None else partitions
         self.__class_prefix = '_' + self.__class__.__name__ + '__'
+        self.__check_data_for_consistency()
 
     @classmethod
-    def from_csv(cls, file, separator=';', fmt=None):
+    def from_csv(cls, file, separator=';', fmt=None, workers=1):
         """Read transaction data from a CSV file.
 
         Parameters
         ----------
-        file : str
+        file : str or list
             Path to and name of CSV file holding transaction data
             in three columns: timestamp, customer ID, article ID.
+            Files ending in '.gz' (gzip) or '.zst' (zstandard, requires
+            the `zstandard` package) are decompressed on the fly, in a
+            background thread. Alternatively, a directory, a glob pattern,
+            or a list of such files, which are all read into one dataset.
+            Their respective counters are then kept in `partitions`.
 
         separator : str, optional
             Delimiter character between entries on each line in the file.
@@ -29,6 +39,15 @@ class TrainTestBase:
         fmt : str, optional
             Datetime format string of the timestamp entries. Defaults to
             `None`, meaning that the format is an (integer) Unix timestamp.
+            ISO formats like '%Y-%m-%d %H:%M:%S' or '%Y-%m-%dT%H:%M:%S.%f'
+            are converted considerably faster than any other format.
+
+        workers : int, optional
+            Number of processes to read the file with. If larger than 1,
+            the file is split into as many shards at line breaks, which
+            are parsed in parallel and merged afterwards. Compressed files
+            are always read with a single process. Several files are
+            distributed over the processes as a whole. Defaults to 1.
 
         Returns
         -------
@@ -42,6 +61,8 @@ class TrainTestBase:
         >>> file = '/path/to/my/otherfile.csv'
         >>> data = TrainTest.from_csv(file, '|')
 
+        >>> data = TrainTest.from_csv(file, workers=8)
+
         See Also
         --------
         Consult the documentation of the python datetime module
@@ -49,7 +70,15 @@ class TrainTestBase:
 
 
         """
-        return cls(*read.from_csv(file, separator=separator, fmt=fmt))
+        if PartitionsFrom.apply_to(file):
+            *data, partitions = read.from_csv_partitions(
+                                PartitionsFrom(file).files,
+                                separator=separator,
+                                fmt=fmt,
+                                workers=workers)
+            return cls(*data, partitions=partitions)
+        return cls(*read.from_csv(file, separator=separator,
+                                  fmt=fmt, workers=workers))
 
     @classmethod
     def from_postgreSQL(cls, database):
@@ -79,11 +108,40 @@ class TrainTestBase:
     def number_of_corrupted_records(self):
         return self.__number_of_corrupted_records
 
+    @property
+    def user(self):
+        return self.__user
+
+    @property
+    def item(self):
+        return self.__item
+
+    @property
+    def history(self):
+        """Columns of times, user indices, and item indices of all purchases.
+
+        Times are integer microseconds since 1970, as read from the data.
+
+        """
+        return self.__history
+
+    @property
+    def partitions(self):
+        """Counters of each file, if data were read from several files.
+
+        Dictionary with file names as keys and, as values, dictionaries
+        holding the `number_of_transactions` and the
+        `number_of_corrupted_records` in the respective file.
+
+        """
+        return self.__partitions
+
     @property
     def max_hold_out(self):
         """Maximum number of articles that can be retained as test set."""
         if not self.__has('max_hold_out'):
-            self.__max_hold_out = max(len(u) for u in self.__unique.values())
+            counts = self.__history.unique_counts
+            self.__max_hold_out = int(counts.max())
         return self.__max_hold_out
 
     def __has(self, attribute):
@@ -116,47 +174,23 @@ class TrainTestBase:
         return n_corr
 
     @staticmethod
-    def __dict_type_and_empty_checked(unique):
-        if not isinstance(unique, dict):
-            log.error('Attempt to instantiate data object with last unique'
-                      ' buys not of required type <dict>.')
-            raise TypeError('Last unique items bought must be of type <dict>!')
-        if len(unique) < 1:
-            log.error('Attempt to instantiate data object with empty <dict>'
-                      ' of last unique items bought.')
-            raise ValueError('Last unique items dictionary must not be empty!')
-        items = next(iter(unique.values()))
-        if not isinstance(items, dict):
-            log.error('Attempt to instantiate data object with values in last'
-                      ' unique item dictionary not of type <dict>.')
-            raise TypeError('Last unique item values must be of type <dict>!')
-        if len(items) < 1:
-            log.error('Attempt to instantiate data object with empty <dict>'
-                      ' as entry of last unique items dictionary.')
-            raise ValueError('Entries of last unique items must not be empty!')
-        return unique
-
-    @staticmethod
-    def __list_type_and_entry_checked(transactions):
-        if not isinstance(transactions, list):
-            log.error('Attempt to instantiate data object with transactions'
-                      ' not of required type <list>.')
-            raise TypeError('Transactions must be of type <list>!')
-        if len(transactions) < 1:
-            log.error('Attempt to instantiate data object with empty'
-                      ' transaction list.')
-            raise ValueError('Transaction list must not be empty!')
-        log_msg = ('Attempt to instantiate data object with transactions'
-                   ' not 3-tuples of strings.')
-        err_msg = 'Transactions must be 3-tuples of strings!'
-        first = transactions[0]
-        if not isinstance(first, tuple):
-            log.error(log_msg)
-            raise TypeError(err_msg)
-        if len(first) != 3:
-            log.error(log_msg)
-            raise TypeError(err_msg)
-        if not all(isinstance(entry, str) for entry in first):
-            log.error(log_msg)
-            raise TypeError(err_msg)
-        return transactions
+    def __tuple_type_checked(history):
+        if not (isinstance(history, tuple) and len(history) == 3):
+            log.error('Attempt to instantiate data object with history not'
+                      ' a 3-tuple of arrays.')
+            raise TypeError('History must be a 3-tuple of arrays!')
+        return history
+
+    def __check_data_for_consistency(self):
+        if self.number_of_transactions != self.__history.size:
+            log.error('Attempt to instantiate data object with number of'
+                      ' transactions incompatible with history.')
+            raise ValueError('Number of transactions incompatible with'
+                             ' history!')
+        users, items = self.__history.users, self.__history.items
+        if (users.min() < 0 or users.max() >= self.__user.count or
+                items.min() < 0 or items.max() >= self.__item.count):
+            log.error('Attempt to instantiate data object with number of'
+                      ' customers/articles incompatible with history.')
+            raise ValueError('Number of users/items incompatible with'
+                             ' history!')
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from .from_csv import from_csv
+from .from_csv import from_csv, from_csv_partitions
+from .from_counts import from_counts
 from .from_postgreSQL import from_postgreSQL
+from .from_snapshot import from_snapshot
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from numpy import frombuffer, flatnonzero, concatenate
+from numpy import empty, zeros, uint8, uint64, int64
+from ...auxiliary import ShardsFrom
+from .from_csv import ITEM_BITS, WORD, check_string_type_of
+from .from_csv import check_integer_type_and_range_of, blocks_of, compressed
+from .from_csv import single_byte_delimited, three_fields_of, indexed
+from .from_csv import aggregated, merged
+
+MAX_DIGITS = 19
+MAX_COUNT = 2**63 - 1
+ZERO = ord('0')
+
+
+def from_counts(file, separator=';', workers=1):
+    check_string_type_of(separator)
+    check_integer_type_and_range_of(workers)
+    if workers > 1 and isinstance(file, str) and not compressed(file):
+        ranges = ShardsFrom(file, workers).ranges
+        shard = partial(parsed_shard, file=file, separator=separator)
+        with ProcessPoolExecutor(workers) as pool:
+            shards, lines = zip(*pool.map(shard, ranges))
+    else:
+        shards, lines = zip(parsed(blocks_of(file), separator))
+    return merged(shards, lines=lines)
+
+
+def parsed_shard(bounds, file, separator):
+    """Parse the lines of a file between a (start, stop) tuple of offsets."""
+    return parsed(blocks_of(file, *bounds), separator)
+
+
+def parsed(blocks, separator):
+    """Parse blocks of aggregated lines into partial indices and counts.
+
+    Returns the same as `parsed` in `from_csv`, so that shards can be
+    merged in the same way, together with the number of lines parsed.
+    The number of transactions is the sum of all valid counts, whereas
+    every corrupted line counts as one record.
+
+    """
+    number_of_transactions = 0
+    number_of_corrupted_records = 0
+    number_of_lines = 0
+    problems = []
+    userIndex_of = {}
+    itemIndex_of = {}
+    block_keys = [empty(0, dtype=int64)]
+    block_counts = [empty(0, dtype=int64)]
+
+    for block in blocks:
+        block, delimiter = single_byte_delimited(block, separator)
+        buffer = frombuffer(block + bytes(WORD), dtype=uint8)
+        users, items, counts, lines, block_problems = tokenized(buffer,
+                                                                delimiter)
+        problems += [(number_of_lines + line, complete)
+                     for line, complete in block_problems]
+        number_of_lines += lines
+        number_of_transactions += int(counts.sum())
+        number_of_corrupted_records += len(block_problems)
+        keys = ((indexed(buffer, *users, index_of=userIndex_of) << ITEM_BITS)
+                | indexed(buffer, *items, index_of=itemIndex_of))
+        keys, counts = aggregated(keys, counts)
+        block_keys.append(keys)
+        block_counts.append(counts)
+
+    keys, counts = aggregated(concatenate(block_keys),
+                              concatenate(block_counts))
+
+    return ((number_of_transactions,
+             number_of_corrupted_records,
+             problems,
+             list(userIndex_of),
+             list(itemIndex_of),
+             keys,
+             counts),
+            number_of_lines)
+
+
+def tokenized(buffer, delimiter):
+    """Locate user and item fields and parse counts of aggregated lines.
+
+    Returns `(starts, stops)` byte offsets of both user and item fields of
+    all valid records, their counts, the number of lines in the buffer,
+    and a list of `(line, complete)` tuples, ordered by line, of all
+    records that did not make it. Counts must be positive integers.
+
+    """
+    well_formed, starts, first, second, stops = three_fields_of(buffer,
+                                                                delimiter)
+    complete = ((first > starts) & (second - first > 1) &
+                (stops - second > 1))
+    counts, numeric = integers(buffer, second + 1, stops)
+    valid = complete & numeric
+    lines = flatnonzero(well_formed)
+    problems = sorted([(line, False)
+                       for line in flatnonzero(~well_formed).tolist()] +
+                      [(line, True)
+                       for line in lines[~complete].tolist()] +
+                      [(line, False)
+                       for line in lines[complete & ~numeric].tolist()])
+    users = starts[valid], first[valid]
+    items = first[valid] + 1, second[valid]
+    return users, items, counts[valid], well_formed.size, problems
+
+
+def integers(buffer, starts, stops):
+    """Parse decimal digits between starts and stops into positive integers.
+
+    Returns the parsed values together with a mask of the fields that do
+    hold a positive integer that fits into 64 bits, just like the counts
+    of a PostgreSQL query do. Up to 19 digits are accumulated without
+    overflow as unsigned 64-bit integers, before larger values are masked.
+
+    """
+    widths = stops - starts
+    values = zeros(widths.size, dtype=uint64)
+    numeric = (widths > 0) & (widths <= MAX_DIGITS)
+    for position in range(MAX_DIGITS):
+        active = flatnonzero(numeric & (widths > position))
+        if not active.size:
+            break
+        digits = buffer[starts[active] + position].astype(int64) - ZERO
+        other = (digits < 0) | (digits > 9)
+        numeric[active[other]] = False
+        digits[other] = 0
+        values[active] = values[active] * uint64(10) + digits.astype(uint64)
+    numeric &= (values > 0) & (values <= uint64(MAX_COUNT))
+    values[~numeric] = 0
+    return values.astype(int64), numeric
@@ -1,54 +1,410 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import filterfalse, islice, repeat as repeated
+from operator import methodcaller
+from numpy import frombuffer, flatnonzero, concatenate, searchsorted
+from numpy import minimum, argsort, cumsum, not_equal, ones, diff, append
+from numpy import add
+from numpy import fromiter, empty, zeros, array, isin
+from numpy import uint8, uint64, int32, int64
+from ...auxiliary import ShardsFrom, StreamFrom
+from ...auxiliary.hashing import WORD, words_of, hashed, decoded
 
+BLOCK_SIZE = 2**23
+LINES_PER_BLOCK = 2**17
+ITEM_BITS = 32
+ITEM_MASK = 2**ITEM_BITS - 1
+NEWLINE = ord('\n')
+# Whitespace as in `str.isspace`, all of which lies below U+3001, by the
+# length of its UTF-8 encoding. Single bytes are looked up in a table and
+# longer ones are compared as big-endian integers.
+BLANKS = [chr(code).encode() for code in range(0x3001)
+          if chr(code).isspace()]
+IS_BLANK = zeros(256, dtype=bool)
+IS_BLANK[[blank[0] for blank in BLANKS if len(blank) == 1]] = True
+WIDE_BLANKS = {width: array([int.from_bytes(blank, 'big')
+                             for blank in BLANKS if len(blank) == width],
+                            dtype=int64)
+               for width in (2, 3)}
+PROBLEM_WITH = {False: 'Could not interpret transaction on line {0}.'
+                       ' Skipping.',
+                True : 'Transaction on line {0} contains empty fields.'
+                       ' Skipping.'}
 
-def from_csv(file, separator=';'):
+
+def from_csv(file, separator=';', workers=1):
+    check_string_type_of(separator)
+    check_integer_type_and_range_of(workers)
+    if workers > 1 and isinstance(file, str) and not compressed(file):
+        ranges = ShardsFrom(file, workers).ranges
+        shard = partial(parsed_shard, file=file, separator=separator)
+        with ProcessPoolExecutor(workers) as pool:
+            shards = list(pool.map(shard, ranges))
+    else:
+        if workers > 1 and isinstance(file, str):
+            log.warning('Compressed files cannot be split into shards.'
+                        ' Reading with a single process.')
+        elif workers > 1:
+            log.warning('Only files given by name can be split into shards.'
+                        ' Reading with a single process.')
+        shards = [parsed(blocks_of(file), separator)]
+    return merged(shards)
+
+
+def from_csv_partitions(files, separator=';', workers=1):
+    """Read a list of files into one index space, counting per file.
+
+    Returns the same as `from_csv`, followed by a dictionary with the
+    numbers of valid transactions and corrupted records in each file.
+
+    """
     check_string_type_of(separator)
+    check_integer_type_and_range_of(workers)
+    if workers > 1:
+        with ProcessPoolExecutor(min(workers, len(files))) as pool:
+            shards = list(pool.map(parsed_file, files, repeated(separator)))
+    else:
+        shards = [parsed_file(file, separator) for file in files]
+    partitions = {file: {'number_of_transactions': n_trans,
+                         'number_of_corrupted_records': n_corr}
+                  for file, (n_trans, n_corr, *_) in zip(files, shards)}
+    return merged(shards, files) + (partitions,)
+
+
+def parsed_file(file, separator):
+    """Parse all lines of a file, whether compressed or not."""
+    return parsed(blocks_of(file), separator)
+
+
+def parsed_shard(bounds, file, separator):
+    """Parse the lines of a file between a (start, stop) tuple of offsets."""
+    return parsed(blocks_of(file, *bounds), separator)
+
+
+def parsed(blocks, separator):
+    """Parse blocks of lines into partial indices and user-item counts.
+
+    Nothing is logged here, so that shards can be parsed in other processes.
+    Corrupted records are returned as `(line, complete)` tuples instead.
+
+    """
+    number_of_transactions = 0
+    number_of_corrupted_records = 0
+    problems = []
+    userIndex_of = {}
+    itemIndex_of = {}
+    block_keys = [empty(0, dtype=int64)]
+    block_counts = [empty(0, dtype=int64)]
+
+    for block in blocks:
+        block, delimiter = single_byte_delimited(block, separator)
+        buffer = frombuffer(block + bytes(WORD), dtype=uint8)
+        users, items, block_problems = tokenized(buffer, delimiter)
+        lines_before = number_of_transactions + number_of_corrupted_records
+        problems += [(lines_before + line, complete)
+                     for line, complete in block_problems]
+        number_of_transactions += users[0].size
+        number_of_corrupted_records += len(block_problems)
+        keys = ((indexed(buffer, *users, index_of=userIndex_of) << ITEM_BITS)
+                | indexed(buffer, *items, index_of=itemIndex_of))
+        keys, counts = aggregated(keys)
+        block_keys.append(keys)
+        block_counts.append(counts)
+
+    keys, counts = aggregated(concatenate(block_keys),
+                              concatenate(block_counts))
+
+    return (number_of_transactions,
+            number_of_corrupted_records,
+            problems,
+            list(userIndex_of),
+            list(itemIndex_of),
+            keys,
+            counts)
+
+
+def merged(shards, files=None, lines=None):
+    """Reconcile indices of shards and sum their user-item counts.
+
+    User-item counts are returned as a tuple of `(rows, columns, counts)`
+    integer arrays, ordered by column first and row second. If shards are
+    whole files, their names can be given to report line numbers per file.
+    Line numbers of consecutive shards are otherwise offset by the number
+    of records in all shards before, unless their numbers of `lines` are
+    given explicitly.
+
+    """
     number_of_transactions = 0
     number_of_corrupted_records = 0
-    userIndex_of = defaultdict(lambda: len(userIndex_of))
-    itemIndex_of = defaultdict(lambda: len(itemIndex_of))
-    count_buys_of = defaultdict(int)
-
-    def process_valid_transaction():
-        count_buys_of[(userIndex_of[user], itemIndex_of[item])] += 1
-        return 1
-
-    def log_corrupted_transaction():
-        line_number = number_of_transactions + number_of_corrupted_records + 1
-        log.warning('Transaction on line {0} contains empty fields. '
-                    'Skipping.'.format(line_number))
-        return 0
-
-    process = {True : process_valid_transaction,
-               False: log_corrupted_transaction}
-
-    stream = open(file) if isinstance(file, str) else file
-    with stream:
-        for transaction in stream:
-            try:
-                _, user, item = transaction.rstrip().split(separator)
-            except ValueError:
-                number_of_corrupted_records += 1
-                line = number_of_transactions + number_of_corrupted_records
-                log.warning('Could not interpret transaction on line {0}. '
-                            'Skipping.'.format(line))
-            else:
-                complete_record = all((user, item))
-                success = process[complete_record]()
-                number_of_transactions += success
-                number_of_corrupted_records += 1 - success
+    lines_before = 0
+    userIndex_of = {}
+    itemIndex_of = {}
+    shard_keys = [empty(0, dtype=int64)]
+    shard_counts = [empty(0, dtype=int64)]
+
+    files = repeated(None) if files is None else files
+    lines = repeated(None) if lines is None else lines
+    for file, shard, n_lines in zip(files, shards, lines):
+        n_trans, n_corr, problems, users, items, keys, counts = shard
+        if file is None:
+            log_corrupted(problems, lines_before)
+        else:
+            log_corrupted(problems, file=file)
+        lines_before += n_trans + n_corr if n_lines is None else n_lines
+        number_of_transactions += n_trans
+        number_of_corrupted_records += n_corr
+        user_codes = reindexed(users, userIndex_of)
+        item_codes = reindexed(items, itemIndex_of)
+        # Items go to the high bits here, so that aggregated keys come
+        # out sorted by column first, as needed for the CSC format.
+        shard_keys.append((item_codes[keys & ITEM_MASK] << ITEM_BITS) |
+                          user_codes[keys >> ITEM_BITS])
+        shard_counts.append(counts)
+
+    keys, counts = aggregated(concatenate(shard_keys),
+                              concatenate(shard_counts))
 
     return (number_of_transactions,
             number_of_corrupted_records,
-            dict(userIndex_of),
-            dict(itemIndex_of),
-            dict(count_buys_of))
+            userIndex_of,
+            itemIndex_of,
+            ((keys & ITEM_MASK).astype(int32),
+             (keys >> ITEM_BITS).astype(int32),
+             counts))
 
 
 def check_string_type_of(separator):
     if not isinstance(separator, str):
         log.error('Attempt to set separator argument to non-string type.')
         raise TypeError('Separator argument must be a string!')
+
+
+def check_integer_type_and_range_of(workers):
+    if not isinstance(workers, int):
+        log.error('Attempt to set number of workers to non-integer type.')
+        raise TypeError('Number of workers must be a positive integer!')
+    if workers < 1:
+        log.error('Attempt to set number of workers to less than one.')
+        raise ValueError('Number of workers must be a positive integer!')
+
+
+def blocks_of(file, start=0, stop=None):
+    """Yield UTF-8 encoded blocks of complete, newline-terminated lines.
+
+    Lines end with a newline, a carriage return, or both, just like in a
+    file opened in text mode. They are all turned into a newline here.
+
+    """
+    if isinstance(file, str) and compressed(file):
+        yield from map(universal, StreamFrom(file, BLOCK_SIZE).blocks())
+    elif isinstance(file, str):
+        with open(file, 'rb') as stream:
+            stream.seek(start)
+            block = next_block_from(stream, stop)
+            while block:
+                block = block if block.endswith(b'\n') else block + b'\n'
+                yield universal(block)
+                block = next_block_from(stream, stop)
+    else:
+        with file as stream:
+            lines = list(islice(stream, LINES_PER_BLOCK))
+            while lines:
+                yield joined(lines).encode() + b'\n'
+                lines = list(islice(stream, LINES_PER_BLOCK))
+
+
+def universal(block):
+    """Turn carriage returns, alone or before a newline, into newlines."""
+    if b'\r' not in block:
+        return block
+    return block.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+
+def compressed(file):
+    """Whether a file given by name is to be decompressed while reading."""
+    return StreamFrom(file).compression is not None
+
+
+def next_block_from(stream, stop=None):
+    """Read block of bytes and complete its last line, but not beyond stop."""
+    if stop is None:
+        return stream.read(BLOCK_SIZE) + stream.readline()
+    block = stream.read(max(min(BLOCK_SIZE, stop - stream.tell()), 0))
+    return block + stream.readline() if stream.tell() < stop else block
+
+
+def joined(lines):
+    """Join lines from a text stream, whether newline-terminated or not."""
+    return '\n'.join(map(methodcaller('rstrip', '\n'), lines))
+
+
+def single_byte_delimited(block, separator):
+    """Replace multi-byte separators by a single byte not found in block."""
+    delimiter = separator.encode()
+    if len(delimiter) == 1:
+        return block, delimiter[0]
+    for substitute in (bytes((byte,)) for byte in range(1, 9)):
+        if substitute not in block:
+            return block.replace(delimiter, substitute), substitute[0]
+    return block.replace(delimiter, b'\x00'), 0
+
+
+def tokenized(buffer, delimiter):
+    """Locate user and item fields in a buffer of newline-terminated lines.
+
+    Returns `(starts, stops)` byte offsets of both user and item fields of
+    all valid records, together with a list of `(line, complete)` tuples,
+    ordered by line, of all records that did not make it.
+
+    """
+    well_formed, _, first, second, stops = three_fields_of(buffer, delimiter)
+    complete = (second - first > 1) & (stops - second > 1)
+    lines = flatnonzero(well_formed)
+    problems = sorted([(line, False)
+                       for line in flatnonzero(~well_formed).tolist()] +
+                      [(line, True)
+                       for line in lines[~complete].tolist()])
+    users = first[complete] + 1, second[complete]
+    items = second[complete] + 1, stops[complete]
+    return users, items, problems
+
+
+def three_fields_of(buffer, delimiter):
+    """Locate the fields of all lines with exactly two separators.
+
+    Returns a mask of these well-formed lines among all lines in the
+    buffer, followed by the byte offsets of their start, of both of their
+    separators, and of their end with trailing whitespace stripped.
+
+    """
+    ends = flatnonzero(buffer == NEWLINE)
+    starts = concatenate((zeros(1, dtype=ends.dtype), ends[:-1] + 1))
+    stops = stripped(buffer, starts, ends)
+    separators = flatnonzero(buffer == delimiter)
+    preceding = searchsorted(separators, starts)
+    well_formed = (searchsorted(separators, stops) - preceding) == 2
+    first = separators[preceding[well_formed]]
+    second = separators[preceding[well_formed] + 1]
+    return (well_formed, starts[well_formed], first, second,
+            stops[well_formed])
+
+
+def stripped(buffer, starts, stops):
+    """Move line stops back past trailing whitespace, like `str.rstrip`."""
+    stops = stops.copy()
+    trailing = flatnonzero(stops > starts)
+    while trailing.size:
+        widths = blank_widths(buffer, starts[trailing], stops[trailing])
+        trailing = trailing[widths > 0]
+        stops[trailing] -= widths[widths > 0]
+        trailing = trailing[stops[trailing] > starts[trailing]]
+    return stops
+
+
+def blank_widths(buffer, starts, stops):
+    """Number of bytes of the whitespace character before stops, if any."""
+    last = buffer[stops - 1]
+    widths = IS_BLANK[last].astype(int64)
+    wide = flatnonzero(last >= 0x80)
+    for width, blanks in WIDE_BLANKS.items():
+        candidates = wide[stops[wide] - starts[wide] >= width]
+        codes = zeros(candidates.size, dtype=int64)
+        for offset in range(width, 0, -1):
+            codes = (codes << 8) | buffer[stops[candidates] - offset]
+        widths[candidates[isin(codes, blanks)]] = width
+    return widths
+
+
+def log_corrupted(problems, lines_before=0, file=None):
+    for line, complete in problems:
+        message = PROBLEM_WITH[complete].format(lines_before + line + 1)
+        log.warning(message if file is None else file + ': ' + message)
+
+
+def indexed(buffer, starts, stops, index_of):
+    """Integer indices of IDs, extending index in order of first appearance.
+
+    IDs are given by their byte offsets into the buffer. Only the unique
+    ones among them are decoded and looked up in the `index_of` dict.
+
+    """
+    inverse, first = factorized_fields(buffer, starts, stops)
+    order = argsort(first)
+    identifiers = decoded(buffer, starts[first[order]], stops[first[order]])
+    codes = empty(first.size, dtype=int64)
+    codes[order] = reindexed(identifiers, index_of)
+    return codes[inverse]
+
+
+def reindexed(identifiers, index_of):
+    """Array of indices of IDs, adding new ones to the end of the index."""
+    new = list(filterfalse(index_of.__contains__, identifiers))
+    index_of.update(zip(new, range(len(index_of), len(index_of) + len(new))))
+    return fromiter(map(index_of.__getitem__, identifiers),
+                    dtype=int64, count=len(identifiers))
+
+
+def factorized_fields(buffer, starts, stops):
+    """Group identical byte strings in buffer without copying them out.
+
+    Fields are grouped by a hash over their 8-byte words and lengths.
+    Groups are then verified word by word, and re-grouped exactly on a
+    hash collision.
+
+    """
+    widths = stops - starts
+    words = list(words_of(buffer, starts, stops))
+    inverse, first = factorized(hashed(widths, words))
+    representative = first[inverse]
+    identical = (widths[representative] == widths).all()
+    for fields, values in words:
+        if not identical:
+            break
+        column = zeros(widths.size, dtype=uint64)
+        column[fields] = values
+        identical = (column[representative] == column).all()
+    if identical:
+        return inverse, first
+    inverse, _ = factorized(widths)
+    for fields, values in words:
+        column = zeros(widths.size, dtype=uint64)
+        column[fields] = values
+        inverse, _ = factorized(inverse * widths.size + factorized(column)[0])
+    return factorized(inverse)
+
+
+def grouped(keys):
+    """Order that sorts keys, and mask of the first of equal sorted keys."""
+    order = argsort(keys)
+    ordered = keys[order]
+    boundaries = ones(keys.size, dtype=bool)
+    not_equal(ordered[1:], ordered[:-1], out=boundaries[1:])
+    return order, boundaries
+
+
+def factorized(keys):
+    """Group codes of all keys and position of the first key in each group."""
+    order, boundaries = grouped(keys)
+    inverse = empty(keys.size, dtype=int64)
+    inverse[order] = cumsum(boundaries) - 1
+    if not keys.size:
+        return inverse, empty(0, dtype=int64)
+    return inverse, minimum.reduceat(order, flatnonzero(boundaries))
+
+
+def aggregated(keys, counts=None):
+    """Unique keys and the number of times (or summed counts) they occur.
+
+    Keys come out sorted. Counts are summed exactly as 64-bit integers.
+
+    """
+    if not keys.size:
+        return keys, empty(0, dtype=int64)
+    order, boundaries = grouped(keys)
+    starts = flatnonzero(boundaries)
+    if counts is None:
+        return keys[order[starts]], diff(append(starts, keys.size))
+    return keys[order[starts]], add.reduceat(counts[order], starts)
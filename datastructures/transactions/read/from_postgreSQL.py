@@ -2,64 +2,323 @@
 
 import logging as log
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from os import pipe
+from threading import Thread
+from numpy import array, empty, zeros, fromiter, concatenate, cumsum
+from numpy import int64
 from psycopg2 import connect, OperationalError, ProgrammingError
+from psycopg2.extensions import AsIs
 from ...auxiliary import PostgreSQLparams
+from ...auxiliary.fetching import batches_from
+from .from_csv import ITEM_BITS, ITEM_MASK, next_block_from, merged
+from .from_counts import parsed
 
-
-def from_postgreSQL(database):
-    check_type_of(database)
-    number_of_transactions = 0
-    number_of_corrupted_records = 0
-    userIndex_of = defaultdict(lambda: len(userIndex_of))
-    itemIndex_of = defaultdict(lambda: len(itemIndex_of))
-    count_buys_of = defaultdict(int)
-
-    query = """SELECT %(userid)s, %(articleid)s, COUNT(*) as count
-               FROM (SELECT %(userid)s, %(articleid)s
-                     FROM %(table)s
-                     LIMIT %(limit)s) AS head
+CURSOR = 'bestpy_transactions'
+SEPARATOR = '\x1f'
+STRING_TYPES = (25, 1043)
+EXPORT = """CREATE TEMPORARY TABLE bestpy_export
+            (position, userid, articleid, count) ON COMMIT DROP AS
+            SELECT row_number() OVER (), * FROM ({0}) AS results"""
+# Records that a COPY export would not give back as a cursor does. IDs that
+# are empty or contain the delimiter, the quote character, or line breaks
+# would be quoted. IDs that might be a numeric zero or false are skipped by
+# a cursor, and counts other than positive integers are parsed differently.
+ODD_ID = r"E'^$|[\x1e\x1f\n\r]|^[-+]?[0.]+$|^false$'"
+SPECIAL = """coalesce(userid::text ~ {0}, FALSE)
+             OR coalesce(articleid::text ~ {0}, FALSE)
+             OR NOT coalesce(count::text ~ '^[1-9][0-9]*$', TRUE)""".format(
+                 ODD_ID)
+SPECIALS = """SELECT position, userid, articleid, count FROM bestpy_export
+              WHERE {0} ORDER BY position""".format(SPECIAL)
+SEGMENT = """SELECT userid, articleid, count FROM bestpy_export
+             WHERE position > {0} AND position < {1} ORDER BY position"""
+EXPORTED = """SELECT userid, articleid, count FROM bestpy_export
+              ORDER BY position"""
+LAST = 2**63 - 1
+MAX_SEGMENTS = 16
+COPY = ("COPY ({0}) TO STDOUT"
+        " WITH (FORMAT csv, DELIMITER E'\\x1f', QUOTE E'\\x1e')")
+QUERY = """SELECT %(userid)s, %(articleid)s, COUNT(*) as count
+           FROM (SELECT %(userid)s, %(articleid)s
+                 FROM %(table)s
+                 WHERE {0}
+                 LIMIT %(limit)s) AS head
+           GROUP BY %(userid)s, %(articleid)s"""
+PARTITION = """SELECT %(userid)s, %(articleid)s, COUNT(*) as count
+               FROM %(table)s
+               WHERE {0}
+               AND coalesce(hashtext(%(userid)s::text) & 2147483647, 0)
+                   %% %(connections)s = %(partition)s
                GROUP BY %(userid)s, %(articleid)s"""
+WATERMARK = "SELECT MAX(%(timestamp)s) FROM %(table)s"
+BETWEEN = ("(%(since)s IS NULL OR %(timestamp)s > %(since)s)"
+           " AND %(timestamp)s <= %(until)s")
+EVERYTHING = 'TRUE'
 
-    def process_valid_transaction(record):
-        user, item, count = record
-        count_buys_of[(userIndex_of[user], itemIndex_of[item])] = count
-        return 0
-
-    def log_corrupted_transaction(record):
-        log.warning('Incomplete record returned from database. Skipping.')
-        return 1
 
-    problems_with = {True : process_valid_transaction,
-                     False: log_corrupted_transaction}
+def from_postgreSQL(database, delta=False):
+    """Read all transactions, or only those after the watermark."""
+    check_type_of(database)
+    since = watermark_checked(database) if delta else None
+    connections = checked_against_limit(database, since)
 
     try:
-        connection = connect(database.login)
+        connection = database._connect()
     except OperationalError:
         log.error('Failed connecting to {} @{}.'.format(database.login_db_name,
                                                         database.login_host))
         raise OperationalError('Connect to database failed. Check settings!')
 
-    with connection.cursor() as cursor:
+    params = dict(database._params, since=since)
+    if since is not None:
+        params['limit'] = AsIs('ALL')
+    watermarked = database.incremental or since is not None
+    try:
         try:
-            cursor.execute(query, database._params)
-        except ProgrammingError:
-            log.error('Failed to execute SQL query. Check your parameters!')
-            raise ProgrammingError('SQL query failed. Check your parameters!')
-        else:
-            for record in cursor:
-                complete = all(record)
-                number_of_corrupted_records += problems_with[complete](record)
+            with connection.cursor() as cursor:
+                if watermarked:
+                    # Only what is there now is read, so that the next delta
+                    # starts exactly where this read ends.
+                    cursor.execute(WATERMARK, params)
+                    params['until'], = cursor.fetchone()
+                where = BETWEEN if watermarked else EVERYTHING
+                if connections > 1:
+                    statements = [cursor.mogrify(PARTITION.format(where),
+                                                 dict(params,
+                                                      connections=connections,
+                                                      partition=partition))
+                                  .decode()
+                                  for partition in range(connections)]
+                else:
+                    statements = [cursor.mogrify(QUERY.format(where), params)
+                                  .decode()]
+            if connections == 1:
+                shards = read(connection, statements[0], database.bulk,
+                              database.batch_size)
         finally:
-            connection.close()
+            database._release(connection)
+        if connections > 1:
+            shard = partial(shard_from, login=database.login,
+                            bulk=database.bulk,
+                            batch_size=database.batch_size)
+            with ProcessPoolExecutor(connections) as pool:
+                shards = [part for parts in pool.map(shard, statements)
+                          for part in parts]
+    except ProgrammingError:
+        log.error('Failed to execute SQL query. Check your parameters!')
+        raise ProgrammingError('SQL query failed. Check your parameters!')
 
-    number_of_transactions = sum(count_buys_of.values())
-    compare(number_of_transactions, database)
+    # Nothing is logged while reading, so that partitions can be read in
+    # other processes. Problems are only counted and reported here.
+    for n_trans, n_corr, *_ in shards:
+        for _ in range(n_corr):
+            log.warning('Incomplete record returned from database.'
+                        ' Skipping.')
+    data = merged(shards)
+    if since is None:
+        compare(data[0], database)
+    complete = since is not None or database._requested < 0
+    if watermarked and complete and params['until'] is not None:
+        database.watermark = params['until']
+
+    return data
+
+
+def shard_from(statement, login, bulk, batch_size):
+    """Read the records of one partition over a connection of its own."""
+    connection = connect(login)
+    try:
+        return read(connection, statement, bulk, batch_size)
+    finally:
+        connection.close()
 
-    return (number_of_transactions,
+
+def read(connection, statement, bulk, batch_size):
+    """List of shards with the records of the statement, as in `merged`."""
+    if bulk:
+        return copied(connection, statement, batch_size)
+    return [fetched(connection, statement, batch_size)]
+
+
+def fetched(connection, statement, batch_size):
+    """Fetch query results in batches and encode them into index arrays."""
+    # A named cursor lives on the server, which only ever sends as many
+    # records as are fetched. It is discarded when the transaction ends.
+    cursor = connection.cursor(CURSOR)
+    cursor.execute(statement)
+    return encoded(batches_from(cursor, batch_size))
+
+
+def encoded(batches):
+    """Encode batches of records into index arrays, skipping incomplete ones.
+
+    Returns the same as `parsed` in `from_csv`, without any problems.
+
+    """
+    number_of_corrupted_records = 0
+    userIndex_of = defaultdict(lambda: len(userIndex_of))
+    itemIndex_of = defaultdict(lambda: len(itemIndex_of))
+    rows = [empty(0, dtype=int64)]
+    cols = [empty(0, dtype=int64)]
+    counts = [empty(0, dtype=int64)]
+
+    for records in batches:
+        valid = [record for record in records if all(record)]
+        number_of_corrupted_records += len(records) - len(valid)
+        users, items, batch_counts = zip(*valid) if valid else ((),) * 3
+        rows.append(fromiter(map(userIndex_of.__getitem__, users),
+                             dtype=int64, count=len(valid)))
+        cols.append(fromiter(map(itemIndex_of.__getitem__, items),
+                             dtype=int64, count=len(valid)))
+        counts.append(array(batch_counts, dtype=int64))
+
+    counts = concatenate(counts)
+
+    return (int(counts.sum()),
             number_of_corrupted_records,
-            dict(userIndex_of),
-            dict(itemIndex_of),
-            dict(count_buys_of))
+            [],
+            list(userIndex_of),
+            list(itemIndex_of),
+            (concatenate(rows) << ITEM_BITS) | concatenate(cols),
+            counts)
+
+
+def copied(connection, statement, batch_size):
+    """Export query results with COPY and parse them like a counts file.
+
+    Results are first stored in a temporary table, numbered in the order
+    the query returns them. Records that COPY would not export as a cursor
+    returns them (see `SPECIAL`) are fetched from there through a cursor.
+    All others are exported in bulk, segment by segment in between runs of
+    these special records, and parsed by the vectorized parser. IDs are
+    then converted back into the Python types a cursor would return. The
+    returned list of shards, as in `merged`, thus holds all records in
+    their original order, and customers and articles are indexed exactly
+    as with `fetched`. Each segment takes a scan of the temporary table,
+    so that with more than `MAX_SEGMENTS` of them, all records are fetched
+    through a cursor instead.
+
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(EXPORT.format(statement))
+        cursor.execute(SPECIALS)
+        specials = cursor.fetchall()
+        types = [column.type_code for column in cursor.description[1:3]]
+        runs = runs_of(specials)
+        if len(runs) >= MAX_SEGMENTS:
+            return [fetched(connection, EXPORTED, batch_size)]
+        shards = []
+        lower = 0
+        for run in runs:
+            shards += segment_from(connection, cursor, types,
+                                   lower, run[0][0])
+            shards.append(encoded([[record[1:] for record in run]]))
+            lower = run[-1][0]
+        shards += segment_from(connection, cursor, types, lower, LAST)
+    return shards
+
+
+def segment_from(connection, cursor, types, lower, upper):
+    """List with the shard of all records between two positions, if any."""
+    if upper - lower < 2:
+        return []
+    shard = streamed(connection, COPY.format(SEGMENT.format(lower, upper)))
+    return [typed(shard, cursor, *types)]
+
+
+def runs_of(specials):
+    """Split records ordered by position into runs of consecutive ones."""
+    runs = []
+    for record in specials:
+        if runs and record[0] == runs[-1][-1][0] + 1:
+            runs[-1].append(record)
+        else:
+            runs.append([record])
+    return runs
+
+
+def streamed(connection, statement):
+    """Parse the output of a COPY statement while the server is sending.
+
+    The export runs in a background thread that writes into a pipe, from
+    which blocks of lines are parsed. NULL values come out as empty
+    fields, which count as corrupted.
+
+    """
+    errors = []
+    read_end, write_end = pipe()
+    sink = open(write_end, 'wb')
+
+    def export():
+        try:
+            with sink, connection.cursor() as cursor:
+                cursor.copy_expert(statement, sink)
+        except Exception as error:
+            errors.append(error)
+
+    exporter = Thread(target=export, daemon=True)
+    exporter.start()
+    try:
+        with open(read_end, 'rb') as source:
+            blocks = iter(partial(next_block_from, source), b'')
+            shard, _ = parsed(blocks, SEPARATOR)
+    finally:
+        exporter.join()
+
+    if errors:
+        raise errors[0]
+
+    n_trans, n_corr, problems, *indices_and_counts = shard
+    return (n_trans, n_corr, [], *indices_and_counts)
+
+
+def typed(shard, cursor, user_type, item_type):
+    """Shard with IDs cast from text into the types of their columns.
+
+    IDs that turn out false, such as a numeric zero, make their records
+    incomplete, just like when they are fetched through a cursor.
+
+    """
+    n_trans, n_corr, problems, users, items, keys, counts = shard
+    users = cast(users, cursor, user_type)
+    items = cast(items, cursor, item_type)
+    user_codes = keys >> ITEM_BITS
+    item_codes = keys & ITEM_MASK
+    valid = (fromiter(map(bool, users), dtype=bool, count=len(users))
+             [user_codes] &
+             fromiter(map(bool, items), dtype=bool, count=len(items))
+             [item_codes])
+    if valid.all():
+        return n_trans, n_corr, problems, users, items, keys, counts
+    users, user_codes = compacted(users, user_codes[valid])
+    items, item_codes = compacted(items, item_codes[valid])
+    return (n_trans - int(counts[~valid].sum()),
+            n_corr + int((~valid).sum()),
+            problems,
+            users,
+            items,
+            (user_codes << ITEM_BITS) | item_codes,
+            counts[valid])
+
+
+def cast(identifiers, cursor, type_code):
+    """List of IDs converted from text just like a cursor would convert."""
+    if type_code in STRING_TYPES:
+        return identifiers
+    return [cursor.cast(type_code, identifier)
+            for identifier in identifiers]
+
+
+def compacted(identifiers, codes):
+    """IDs still referred to by codes, and codes renumbered accordingly."""
+    used = zeros(len(identifiers), dtype=bool)
+    used[codes] = True
+    renumbered = cumsum(used) - 1
+    return ([identifier for identifier, is_used
+             in zip(identifiers, used.tolist()) if is_used],
+            renumbered[codes])
 
 
 def check_type_of(database):
@@ -70,6 +329,23 @@ def check_type_of(database):
                         ' type <PostgreSQLparams>!')
 
 
+def watermark_checked(database):
+    if database.watermark is None:
+        log.error('Attempt to read new transactions from database'
+                  ' without watermark from a previous read.')
+        raise ValueError('No watermark set. Read all transactions in'
+                         ' incremental mode first!')
+    return database.watermark
+
+
+def checked_against_limit(database, since=None):
+    if since is None and database.connections > 1 and database._requested > 0:
+        log.warning('Only tables read without limit can be split into'
+                    ' partitions. Reading with a single connection.')
+        return 1
+    return database.connections
+
+
 def compare(available, database):
     if available < database._requested:
         log.warning('Requested {0} transactions from table {1} but only {2} '
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from json import loads
+from struct import Struct
+from os.path import getsize
+from numpy import memmap, frombuffer, dtype, uint8
+from scipy.sparse import csc_matrix, csr_matrix
+from ...auxiliary import TableFrom
+from ....precision import float_type
+
+MAGIC = b'bestPyTx'
+VERSION = 1
+PREAMBLE = Struct('<8sII')
+ALIGNMENT = 64
+
+
+def from_snapshot(file, mmap=False):
+    check_string_type_of(file)
+    check_boolean_type_of(mmap)
+    size = getsize(file)
+    if mmap and size:
+        content = memmap(file, dtype=uint8, mode='r')
+    else:
+        content = bytearray(size)
+        with open(file, 'rb') as stream:
+            stream.readinto(content)
+    header = header_from(content)
+    array_of = {name: frombuffer(content,
+                                 dtype=spec['dtype'],
+                                 count=spec['length'],
+                                 offset=spec['offset'])
+                for name, spec in header['arrays'].items()}
+    shape = tuple(header['shape'])
+    if mmap:
+        check_precision_of(array_of['counts'])
+    by_col = csc_matrix((array_of['counts'].astype(float_type(), copy=False),
+                         array_of['indices'],
+                         array_of['indptr']),
+                        shape=shape,
+                        copy=False)
+    by_row = None
+    if 'row_indptr' in array_of:
+        by_row = csr_matrix((array_of['row_counts'].astype(float_type(),
+                                                           copy=False),
+                             array_of['row_indices'],
+                             array_of['row_indptr']),
+                            shape=shape,
+                            copy=False)
+    return (header['number_of_transactions'],
+            header['number_of_corrupted_records'],
+            index_from(array_of, 'user', header['id_types']['user']),
+            index_from(array_of, 'item', header['id_types']['item']),
+            by_col,
+            by_row)
+
+
+def check_string_type_of(file):
+    if not isinstance(file, str):
+        log.error('Attempt to set snapshot file name to non-string type.')
+        raise TypeError('Snapshot file must be given by name as a string!')
+
+
+def check_boolean_type_of(mmap):
+    if not isinstance(mmap, bool):
+        log.error('Attempt to set memory-mapping flag to non-boolean type.')
+        raise TypeError('Memory-mapping flag must be either True or False!')
+
+
+def check_precision_of(counts):
+    """Warn if counts must be copied to match the current precision."""
+    precision = dtype(float_type())
+    if counts.dtype != precision:
+        log.warning('Counts in snapshot are of type {0} but precision is'
+                    ' set to {1}. They are therefore copied into memory'
+                    ' rather than memory-mapped.'.format(counts.dtype,
+                                                         precision))
+
+
+def header_from(content):
+    """Check magic bytes and format version, and parse the JSON header."""
+    if len(content) < PREAMBLE.size:
+        log.error('Attempt to load snapshot from file too short to be one.')
+        raise ValueError('File is not a bestPy transactions snapshot!')
+    magic, version, header_size = PREAMBLE.unpack_from(content)
+    if magic != MAGIC:
+        log.error('Attempt to load snapshot from file with unknown format.')
+        raise ValueError('File is not a bestPy transactions snapshot!')
+    if version != VERSION:
+        log.error('Attempt to load snapshot of unsupported version'
+                  ' {0}.'.format(version))
+        raise ValueError('Snapshot version must be {0}!'.format(VERSION))
+    start = PREAMBLE.size
+    return loads(bytes(content[start:start + header_size]).decode())
+
+
+def index_from(array_of, name, id_type):
+    """Dictionary of integer IDs or table of string IDs with their index.
+
+    Only string IDs are kept in arrays, which are memory-mapped if the
+    snapshot is. Integer IDs are read into a dictionary in every process.
+
+    """
+    if id_type == 'int':
+        identifiers = array_of[name + '_ids'].tolist()
+        return dict(zip(identifiers, range(len(identifiers))))
+    return TableFrom(array_of[name + '_ids'],
+                     array_of[name + '_offsets'],
+                     array_of.get(name + '_hashes'),
+                     array_of.get(name + '_order'))
@@ -1,17 +1,18 @@
 # -*- coding: utf-8 -*-
 
 import logging as log
-from numpy import unique
+from numpy import unique, ones, int64, float64
 from . import read
-from ..auxiliary import IndexFrom, MatrixFrom
+from . import write
+from ..auxiliary import IndexFrom, MatrixFrom, TableFrom, PartitionsFrom
 
 
 class Transactions:
     """Read and hold transaction data from a number of sources.
 
     Direct instantiation of this class is discouraged and, therefore,
-    not documented. Use the classmethods `from_csv`, `from_postgreSQL`, ...
-    instead and refer to the docstrings there!
+    not documented. Use the classmethods `from_csv`, `from_counts`,
+    `from_postgreSQL`, ... instead and refer to the docstrings there!
 
     Attributes
     ----------
@@ -24,6 +25,10 @@ class Transactions:
     number_of_userItem_pairs : int
         Number of times any article has been bought by a unique user.
 
+    partitions : dict
+        Number of transactions and of corrupted records in each file,
+        if the data were read from several files.
+
     user : object
         Provides dictionary attributes to translate between
         the unqiue customer ID in the data and the internally
@@ -54,29 +59,42 @@ class Transactions:
 
     """
 
-    def __init__(self, n_trans, n_corr, user_i, item_j, counts):
+    def __init__(self, n_trans, n_corr, user_i, item_j, counts, by_row=None,
+                 partitions=None):
         self.__number_of_transactions = self.__int_type_value_checked(n_trans)
         self.__number_of_corrupted_records = self.__type_range_checked(n_corr)
         self.__user = IndexFrom(user_i)
         self.__item = IndexFrom(item_j)
-        self.__matrix = MatrixFrom(counts)
-        self.__number_of_userItem_pairs = len(counts)
+        self.__matrix = MatrixFrom(counts, by_row)
+        self.__partitions = {} if partitions is None else partitions
         self.__check_data_for_consistency()
 
     @classmethod
-    def from_csv(cls, file, separator=';'):
+    def from_csv(cls, file, separator=';', workers=1):
         """Read transaction data from a CSV file.
 
         Parameters
         ----------
-        file : str
+        file : str or list
             Path to and name of CSV file holding transaction data
             in three columns: timestamp, customer ID, article ID.
+            Files ending in '.gz' (gzip) or '.zst' (zstandard, requires
+            the `zstandard` package) are decompressed on the fly, in a
+            background thread. Alternatively, a directory, a glob pattern,
+            or a list of such files, which are all read into one dataset.
+            Their respective counters are then kept in `partitions`.
 
         separator : str, optional
             Delimiter character between entries on each line in the file.
             Defaults to ';'.
 
+        workers : int, optional
+            Number of processes to read the file with. If larger than 1,
+            the file is split into as many shards at line breaks, which
+            are parsed in parallel and merged afterwards. Compressed files
+            are always read with a single process. Several files are
+            distributed over the processes as a whole. Defaults to 1.
+
         Returns
         -------
         Instance of `Transactions` holding the data.
@@ -86,8 +104,56 @@ class Transactions:
         >>> file = '/path/to/my/file.csv'
         >>> data = Transactions.from_csv(file, '|')
 
+        >>> data = Transactions.from_csv(file, workers=8)
+
+        >>> data = Transactions.from_csv('/path/to/daily/exports/*.csv')
+
         """
-        return cls(*read.from_csv(file, separator=separator))
+        if PartitionsFrom.apply_to(file):
+            *data, partitions = read.from_csv_partitions(
+                                PartitionsFrom(file).files,
+                                separator=separator,
+                                workers=workers)
+            return cls(*data, partitions=partitions)
+        return cls(*read.from_csv(file, separator=separator, workers=workers))
+
+    @classmethod
+    def from_counts(cls, file, separator=';', workers=1):
+        """Read pre-aggregated transaction data from a CSV file.
+
+        Parameters
+        ----------
+        file : str
+            Path to and name of CSV file holding aggregated transaction
+            data in three columns: customer ID, article ID, and the number
+            of times the customer bought the article. Customer-article
+            pairs may occur more than once, in which case their counts are
+            summed. Files ending in '.gz' or '.zst' are decompressed on
+            the fly, just like in `from_csv`.
+
+        separator : str, optional
+            Delimiter character between entries on each line in the file.
+            Defaults to ';'.
+
+        workers : int, optional
+            Number of processes to read the file with, exactly as for
+            `from_csv`. Defaults to 1.
+
+        Returns
+        -------
+        Instance of `Transactions` holding the data. Its
+        `number_of_transactions` is the sum of all valid counts, while
+        every line that could not be interpreted, had empty fields, or
+        did not have a positive integer as count is a corrupted record.
+
+        Examples
+        --------
+        >>> file = '/path/to/my/counts.csv'
+        >>> data = Transactions.from_counts(file)
+
+        """
+        return cls(*read.from_counts(file, separator=separator,
+                                     workers=workers))
 
     @classmethod
     def from_postgreSQL(cls, database):
@@ -109,6 +175,158 @@ class Transactions:
         """
         return cls(*read.from_postgreSQL(database))
 
+    @classmethod
+    def load(cls, file, mmap=False):
+        """Load transaction data from a binary snapshot written by `save`.
+
+        By default, the whole file is read in one go. Neither parsing nor
+        re-indexing is needed, and the stored customer-article matrix is
+        used as is. Alternatively, the snapshot can be memory-mapped
+        read-only, so that all processes loading the same file share a
+        single copy of the matrix arrays in the page cache of the host.
+
+        Parameters
+        ----------
+        file : str
+            Path to and name of a snapshot file written by `save`.
+
+        mmap : bool, optional
+            Whether to memory-map the snapshot instead of reading it.
+            Matrix arrays are then read-only views into the file, which
+            must not be modified or deleted while the data are in use.
+            Counts are only mapped if they were saved in the precision
+            currently set, and are copied into memory with a warning
+            otherwise. String IDs are mapped as well, whereas integer
+            IDs are always read into dictionaries. Defaults to ``False``.
+
+        Returns
+        -------
+        Instance of `Transactions` holding the data.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a snapshot or has an unsupported version.
+
+        Examples
+        --------
+        >>> data = Transactions.load('transactions.snapshot')
+
+        >>> data = Transactions.load('transactions.snapshot', mmap=True)
+
+        """
+        return cls(*read.from_snapshot(file, mmap=mmap))
+
+    def save(self, file):
+        """Save transaction data to a compact, versioned binary snapshot.
+
+        Counters, customer and article ID tables, and the arrays of the
+        customer-article matrix in both compressed sparse column and row
+        format are written as raw, 64-byte aligned arrays behind a short
+        JSON header.
+
+        Parameters
+        ----------
+        file : str
+            Path to and name of the snapshot file to write.
+
+        Examples
+        --------
+        >>> data = Transactions.from_csv(file)
+        >>> data.save('transactions.snapshot')
+
+        """
+        write.to_snapshot(file,
+                          self.number_of_transactions,
+                          self.number_of_corrupted_records,
+                          self.__ids_of(self.user),
+                          self.__ids_of(self.item),
+                          self.matrix.by_col,
+                          self.matrix.by_row)
+
+    def append(self, records):
+        """Add a batch of new transactions to the data already held.
+
+        New customer and article IDs are appended to the respective
+        index, and the customer-article matrix grows accordingly. Counts
+        are buffered and merged into the matrix only when it is next
+        accessed, so that appending many small batches stays cheap.
+        Algorithms already operating on the data must be attached again
+        with `operating_on` to pick up the new transactions.
+
+        Parameters
+        ----------
+        records : iterable
+            Records of new transactions as (timestamp, customer ID,
+            article ID) tuples. Records that do not have three fields,
+            or that have empty fields, are skipped with a warning and
+            counted as corrupted.
+
+        Examples
+        --------
+        >>> data.append([('2012-03-06T12:15:39', '13', 'foo'),
+        ...              ('2012-03-06T12:21:06', 'new', 'bar')])
+
+        """
+        users = []
+        items = []
+        n_corr = 0
+        for number, record in enumerate(records, 1):
+            try:
+                timestamp, user, item = record
+            except (TypeError, ValueError):
+                log.warning('Could not interpret record {0} of batch.'
+                            ' Skipping.'.format(number))
+                n_corr += 1
+                continue
+            if not all((timestamp, user, item)):
+                log.warning('Record {0} of batch contains empty fields.'
+                            ' Skipping.'.format(number))
+                n_corr += 1
+                continue
+            users.append(user)
+            items.append(item)
+        self._add(users, items, ones(len(users), dtype=int64))
+        self.__number_of_corrupted_records += n_corr
+
+    def append_from_postgreSQL(self, database):
+        """Add transactions newer than the watermark of a previous read.
+
+        Only records with a timestamp later than `database.watermark` are
+        read and merged into the data already held, just like a batch of
+        new transactions given to `append`. The watermark is then moved
+        forward to the latest timestamp in the table, so that repeated
+        calls each read only what was added in between. With an index on
+        the timestamp column, these are small queries, no matter the size
+        of the table.
+
+        Parameters
+        ----------
+        database : `PostgreSQLparams`
+            The same instance that the data were read with, either with
+            its `incremental` mode switched on or with its `watermark`
+            set explicitly. Its `limit` is ignored.
+
+        Raises
+        ------
+        ValueError
+            If no watermark was recorded or set before.
+
+        Examples
+        --------
+        >>> database.incremental = True
+        >>> data = Transactions.from_postgreSQL(database)
+        >>> data.append_from_postgreSQL(database)
+
+        """
+        n_trans, n_corr, user_i, item_j, (rows, cols, counts) = (
+            read.from_postgreSQL(database, delta=True))
+        self.__matrix.add((self.__user.add(list(user_i))[rows],
+                           self.__item.add(list(item_j))[cols],
+                           counts))
+        self.__number_of_transactions += n_trans
+        self.__number_of_corrupted_records += n_corr
+
     @property
     def number_of_transactions(self):
         return self.__number_of_transactions
@@ -119,7 +337,18 @@ class Transactions:
 
     @property
     def number_of_userItem_pairs(self):
-        return self.__number_of_userItem_pairs
+        return self.matrix.by_col.nnz
+
+    @property
+    def partitions(self):
+        """Counters of each file, if data were read from several files.
+
+        Dictionary with file names as keys and, as values, dictionaries
+        holding the `number_of_transactions` and the
+        `number_of_corrupted_records` in the respective file.
+
+        """
+        return self.__partitions
 
     @property
     def user(self):
@@ -136,10 +365,23 @@ class Transactions:
         """Customer-article matrix in various `scipy.sparse` formats."""
         return self.__matrix
 
+    def _add(self, users, items, counts):
+        """Add counts of (customer ID, article ID) pairs, growing indices."""
+        self.__matrix.add((self.__user.add(users),
+                           self.__item.add(items),
+                           counts))
+        self.__number_of_transactions += int(counts.sum())
+
     def _users_who_bought(self, items):
         """Array of customer indices who bought array of article indices"""
         return unique(self.matrix.by_col[:, items].indices)
 
+    @staticmethod
+    def __ids_of(index):
+        if isinstance(index.id_of, TableFrom):
+            return index.id_of
+        return [index.id_of[position] for position in range(index.count)]
+
     @staticmethod
     def __int_type_value_checked(n_trans):
         log_msg = ('Attempt to instantiate data object with number of'
@@ -172,13 +414,9 @@ class Transactions:
                       ' customers/articles incompatible with matrix shape.')
             raise ValueError('Number of users/items incompatible with'
                              ' matrix shape!')
-        if self.number_of_transactions != self.matrix.by_col.sum().sum():
+        total = self.matrix.by_col.data.sum(dtype=float64)
+        if self.number_of_transactions != total:
             log.error('Attempt to instantiate data object with number of'
                       ' transactions incompatible with matrix values.')
             raise ValueError('Number of transactions incompatible with values'
                              ' in matrix!')
-        if self.number_of_userItem_pairs != self.matrix.by_col.getnnz():
-            log.error('Attempt to instantiate data object with number of'
-                      ' user/item pairs incompatible with matrix values.')
-            raise ValueError('Number of user/item pairs incompatible with'
-                             'number of non-zero entries in matrix!')
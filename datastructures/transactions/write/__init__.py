@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+from .to_snapshot import to_snapshot
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from json import dumps
+from numpy import fromiter
+from ...auxiliary import TableFrom
+from ..read.from_snapshot import MAGIC, VERSION, PREAMBLE, ALIGNMENT
+
+
+def to_snapshot(file, n_trans, n_corr, user_ids, item_ids, by_col, by_row):
+    """Write counters, ID tables and CSC/CSR matrix to a binary snapshot.
+
+    The file starts with 8 magic bytes, the format version and the size
+    of a JSON header, all little-endian. The header holds the counters,
+    the matrix shape, and dtype, offset and length of every array. Arrays
+    follow the header as raw little-endian bytes, each aligned to 64 bytes.
+    String IDs are stored as the arrays of a `TableFrom`, including its
+    sorted-hash index, so that it need not be rebuilt on loading.
+
+    """
+    check_string_type_of(file)
+    array_of = {'indptr'     : little_endian(by_col.indptr),
+                'indices'    : little_endian(by_col.indices),
+                'counts'     : little_endian(by_col.data),
+                'row_indptr' : little_endian(by_row.indptr),
+                'row_indices': little_endian(by_row.indices),
+                'row_counts' : little_endian(by_row.data)}
+    id_types = {}
+    for name, identifiers in (('user', user_ids), ('item', item_ids)):
+        id_types[name], tables = id_tables_from(identifiers)
+        array_of.update({name + '_' + key: table
+                         for key, table in tables.items()})
+
+    header = {'number_of_transactions': n_trans,
+              'number_of_corrupted_records': n_corr,
+              'shape': list(by_col.shape),
+              'id_types': id_types}
+    header = laid_out(header, array_of)
+    content = encoded(header)
+
+    with open(file, 'wb') as stream:
+        stream.write(PREAMBLE.pack(MAGIC, VERSION, len(content)))
+        stream.write(content)
+        for name, array in array_of.items():
+            stream.write(bytes(header['arrays'][name]['offset'] -
+                               stream.tell()))
+            stream.write(array.data)
+
+
+def check_string_type_of(file):
+    if not isinstance(file, str):
+        log.error('Attempt to set snapshot file name to non-string type.')
+        raise TypeError('Snapshot file must be given by name as a string!')
+
+
+def id_tables_from(identifiers):
+    """Integer IDs as one array, strings as table with sorted-hash index."""
+    if isinstance(identifiers, TableFrom):
+        table = identifiers
+    elif all(isinstance(identifier, int) for identifier in identifiers):
+        return 'int', {'ids': fromiter(identifiers, dtype='<i8',
+                                       count=len(identifiers))}
+    elif all(isinstance(identifier, str) for identifier in identifiers):
+        table = TableFrom.from_ids(identifiers)
+    else:
+        log.error('Attempt to save snapshot with IDs neither all strings'
+                  ' nor all integers.')
+        raise TypeError('IDs must be either all strings or all integers!')
+    return 'str', {'ids'    : little_endian(table.buffer),
+                   'offsets': little_endian(table.offsets),
+                   'hashes' : little_endian(table.hashes),
+                   'order'  : little_endian(table.order)}
+
+
+def laid_out(header, array_of):
+    """Add array offsets to header, leaving enough room for the header."""
+    start = aligned(PREAMBLE.size)
+    while True:
+        offset = start
+        header['arrays'] = {}
+        for name, array in array_of.items():
+            header['arrays'][name] = {'dtype': array.dtype.str,
+                                      'offset': offset,
+                                      'length': array.size}
+            offset = aligned(offset + array.nbytes)
+        if PREAMBLE.size + len(encoded(header)) <= start:
+            return header
+        start = aligned(PREAMBLE.size + len(encoded(header)))
+
+
+def little_endian(array):
+    return array.astype(array.dtype.newbyteorder('<'), copy=False)
+
+
+def aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def encoded(header):
+    return dumps(header, sort_keys=True).encode()
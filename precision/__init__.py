@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+from .precision import set_precision_to, float_type
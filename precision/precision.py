@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import logging as log
+from numpy import float32, float64
+
+FLOAT_TYPE_OF = {'single': float32, 'double': float64}
+current = {'precision': 'double'}
+
+
+def set_precision_to(precision='double'):
+    """Set the floating-point precision of all matrices and models of bestPy.
+
+    Single precision halves the memory taken up by matrices, similarities,
+    and latent factors, as well as the memory bandwidth needed to compute
+    recommendations from them. Only matrices and models that are computed
+    after the call are affected. Indices are 32-bit integers either way.
+
+    Parameters
+    ----------
+    precision : str, optional
+        Either 'single' (float32) or 'double' (float64). Defaults to
+        'double'.
+
+    Examples
+    --------
+    >>> set_precision_to('single')
+
+    """
+    check_string_type_of(precision)
+    check_value_of(precision)
+    current['precision'] = precision
+
+
+def float_type():
+    """Numpy floating-point type of the current precision."""
+    return FLOAT_TYPE_OF[current['precision']]
+
+
+def check_string_type_of(precision):
+    if not isinstance(precision, str):
+        log.error('Attempt to set precision to non-string type.')
+        raise TypeError('Precision must be either "single" or "double"!')
+
+
+def check_value_of(precision):
+    if precision not in FLOAT_TYPE_OF:
+        log.error('Attempt to set precision to unknown value.')
+        raise ValueError('Precision must be either "single" or "double"!')
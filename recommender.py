@@ -155,7 +155,8 @@ class RecoBasedOn:
         type_of = target in self.__data.user.index_of.keys()
         item_scores = self.__recommendation_for[type_of](target)
         sorted_item_indices = argpartition(item_scores, -head)[-head:]
-        return (self.__data.item.id_of[index] for index in sorted_item_indices)
+        return (article for article
+                in self.__data.item.ids_of(sorted_item_indices))
 
     def __cold_start(self, target=None):
         log.info('Unknown target user. Defaulting to baseline recommendation.')
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from scipy.sparse import csc_matrix
+from ....datastructures.auxiliary import PatternFrom
 
 
 class Matrix():
@@ -16,4 +17,8 @@ class Data():
         self.matrix.by_col = csc_matrix(data).astype(float)
         self.matrix.bool_by_col = self.matrix.by_col.copy()
         self.matrix.bool_by_col.data[:] = 1.0
+        self.matrix.pattern_by_col = PatternFrom.from_matrix(
+                                     self.matrix.by_col)
+        self.matrix.pattern_by_row = PatternFrom.from_matrix(
+                                     self.matrix.by_col.tocsr())
         self.user.count = data.shape[0]
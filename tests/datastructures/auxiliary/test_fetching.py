@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+from ....datastructures.auxiliary.fetching import batches_from
+
+
+class StandInCursor:
+
+    def __init__(self, records):
+        self.records = records
+        self.sizes = []
+
+    def fetchmany(self, size):
+        self.sizes.append(size)
+        batch, self.records = self.records[:size], self.records[size:]
+        return batch
+
+
+class TestBatchesFrom(ut.TestCase):
+
+    def test_batches_of_given_size(self):
+        cursor = StandInCursor([(1,), (2,), (3,), (4,), (5,)])
+        batches = list(batches_from(cursor, 2))
+        self.assertListEqual(batches, [[(1,), (2,)], [(3,), (4,)], [(5,)]])
+        self.assertListEqual(cursor.sizes, [2, 2, 2, 2])
+
+    def test_no_batches_from_empty_cursor(self):
+        cursor = StandInCursor([])
+        self.assertListEqual(list(batches_from(cursor, 3)), [])
+
+    def test_nothing_fetched_before_first_batch_is_needed(self):
+        cursor = StandInCursor([(1,)])
+        batches = batches_from(cursor, 3)
+        self.assertListEqual(cursor.sizes, [])
+        self.assertListEqual(next(batches), [(1,)])
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import numpy as np
+from ....datastructures.auxiliary.hashing import words_of, hashed, hash_of
+from ....datastructures.auxiliary.hashing import decoded
+
+
+class TestHashing(ut.TestCase):
+
+    def setUp(self):
+        self.ids = ['', 'a', 'abcdefgh', 'abcdefghi', 'ünïcödé', 'a']
+        encoded = [identifier.encode() for identifier in self.ids]
+        self.buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(code) for code in encoded], out=self.offsets[1:])
+        self.starts = self.offsets[:-1]
+        self.stops = self.offsets[1:]
+
+    def test_words_of_masks_bytes_beyond_each_string(self):
+        words = list(words_of(self.buffer, self.starts, self.stops))
+        fields, values = words[1]
+        self.assertListEqual(fields.tolist(), [3, 4])
+        self.assertEqual(values[0], ord('i'))
+
+    def test_words_of_strings_at_end_of_buffer(self):
+        words = list(words_of(self.buffer, self.starts[-1:],
+                              self.stops[-1:]))
+        self.assertEqual(len(words), 1)
+        self.assertEqual(words[0][1][0], ord('a'))
+
+    def test_hashed_same_as_hash_of(self):
+        hashes = hashed(self.stops - self.starts,
+                        words_of(self.buffer, self.starts, self.stops))
+        should_be = [hash_of(identifier.encode())
+                     for identifier in self.ids]
+        self.assertListEqual(hashes.tolist(), should_be)
+
+    def test_equal_strings_have_equal_hashes(self):
+        hashes = hashed(self.stops - self.starts,
+                        words_of(self.buffer, self.starts, self.stops))
+        self.assertEqual(hashes[1], hashes[5])
+        self.assertEqual(len(set(hashes.tolist())), 5)
+
+    def test_hashes_of_short_buffer(self):
+        buffer = np.frombuffer(b'ab', dtype=np.uint8)
+        hashes = hashed(np.array([2]), words_of(buffer, np.array([0]),
+                                                np.array([2])))
+        self.assertEqual(hashes[0], hash_of(b'ab'))
+
+    def test_decoded(self):
+        self.assertListEqual(decoded(self.buffer, self.starts, self.stops),
+                             self.ids)
+
+    def test_decoded_nothing(self):
+        self.assertListEqual(decoded(self.buffer, self.starts[:0],
+                                     self.stops[:0]), [])
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+import numpy as np
+from ....datastructures.auxiliary import HistoryFrom
+
+
+class TestInstantiateHistory(ut.TestCase):
+
+    def test_error_on_times_not_array(self):
+        log_msg = ['ERROR:root:Attempt to instantiate history object with'
+                   ' times not a 1-D array of integers.']
+        err_msg = 'Columns of history object must be 1-D arrays of integers!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = HistoryFrom([1, 2], np.array([0, 1]), np.array([0, 1]))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_users_not_integers(self):
+        log_msg = ['ERROR:root:Attempt to instantiate history object with'
+                   ' users not a 1-D array of integers.']
+        err_msg = 'Columns of history object must be 1-D arrays of integers!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = HistoryFrom(np.array([1, 2]), np.array([0.0, 1.0]),
+                                np.array([0, 1]))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_items_not_one_dimensional(self):
+        log_msg = ['ERROR:root:Attempt to instantiate history object with'
+                   ' items not a 1-D array of integers.']
+        err_msg = 'Columns of history object must be 1-D arrays of integers!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = HistoryFrom(np.array([1, 2]), np.array([0, 1]),
+                                np.array([[0, 1]]))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_columns_of_different_length(self):
+        log_msg = ['ERROR:root:Attempt to instantiate history object with'
+                   ' columns of different length.']
+        err_msg = 'Columns of history object must all have the same length!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = HistoryFrom(np.array([1, 2]), np.array([0, 1]),
+                                np.array([0, 1, 2]))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestHistoryFrom(ut.TestCase):
+
+    def setUp(self):
+        self.times = np.array([5, 3, 5, 9, 1, 7, 7, 2])
+        self.users = np.array([0, 0, 1, 0, 1, 1, 1, 2])
+        self.items = np.array([1, 2, 1, 1, 0, 2, 0, 3])
+        self.history = HistoryFrom(self.times, self.users, self.items)
+
+    def test_columns(self):
+        np.testing.assert_array_equal(self.history.times, self.times)
+        np.testing.assert_array_equal(self.history.users, self.users)
+        np.testing.assert_array_equal(self.history.items, self.items)
+
+    def test_cannot_set_columns(self):
+        with self.assertRaises(AttributeError):
+            self.history.times = np.array([1, 2])
+
+    def test_size(self):
+        self.assertEqual(self.history.size, 8)
+
+    def test_pair_users(self):
+        should_be = [0, 0, 1, 1, 1, 2]
+        self.assertListEqual(self.history.pair_users.tolist(), should_be)
+
+    def test_pair_items(self):
+        should_be = [1, 2, 0, 1, 2, 3]
+        self.assertListEqual(self.history.pair_items.tolist(), should_be)
+
+    def test_pair_of_each_purchase(self):
+        should_be = [0, 1, 3, 0, 2, 4, 2, 5]
+        self.assertListEqual(self.history.pair_of.tolist(), should_be)
+
+    def test_last_purchase_of_each_pair(self):
+        should_be = [9, 3, 7, 5, 7, 2]
+        self.assertListEqual(self.history.last.tolist(), should_be)
+
+    def test_earliest_purchase_time_of_each_pair(self):
+        should_be = [5, 3, 1, 5, 7, 2]
+        self.assertListEqual(self.history.earliest.tolist(), should_be)
+
+    def test_first_purchase_of_each_pair(self):
+        should_be = [0, 1, 4, 2, 5, 7]
+        self.assertListEqual(self.history.first.tolist(), should_be)
+
+    def test_counts_of_each_pair(self):
+        should_be = [2, 1, 2, 1, 1, 1]
+        self.assertListEqual(self.history.counts.tolist(), should_be)
+
+    def test_counts_of_each_pair_at_last_purchase(self):
+        should_be = [1, 1, 1, 1, 1, 1]
+        self.assertListEqual(self.history.last_counts.tolist(), should_be)
+
+    def test_first_purchase_of_each_pair_before_last(self):
+        should_be = [0, 8, 4, 8, 8, 8]
+        self.assertListEqual(self.history.first_before_last.tolist(),
+                             should_be)
+
+    def test_recency_breaks_ties_by_first_purchase(self):
+        should_be = [0, 1, 0, 2, 1, 0]
+        self.assertListEqual(self.history.recency.tolist(), should_be)
+
+    def test_unique_counts(self):
+        should_be = [2, 3, 1]
+        self.assertListEqual(self.history.unique_counts.tolist(), should_be)
+
+    def test_empty_history(self):
+        empty = np.array([], dtype=np.int64)
+        history = HistoryFrom(empty, empty, empty)
+        self.assertEqual(history.size, 0)
+        self.assertEqual(history.pair_users.size, 0)
+        self.assertEqual(history.last.size, 0)
+        self.assertEqual(history.recency.size, 0)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -3,7 +3,8 @@
 
 import unittest as ut
 import logging
-from ....datastructures.auxiliary import IndexFrom
+import numpy as np
+from ....datastructures.auxiliary import IndexFrom, TableFrom
 
 
 class TestInstatiateIndex(ut.TestCase):
@@ -84,6 +85,100 @@ class TestIndexFrom(ut.TestCase):
     def test_correct_values_in_count(self):
         self.assertEqual(self.index.count, 6)
 
+    def test_ids_of_indices(self):
+        indices = np.array([5, 0, 3, 3])
+        should_be = ['AC016EL56BKHALID-943',
+                     'AC016EL50CPHALID-1749',
+                     'OL756EL65HDYALID-4834',
+                     'OL756EL65HDYALID-4834']
+        self.assertListEqual(self.index.ids_of(indices), should_be)
+
+    def test_ids_of_no_indices(self):
+        self.assertListEqual(self.index.ids_of(np.array([], dtype=int)), [])
+
+    def test_error_on_ids_of_non_integer_indices(self):
+        log_msg = ['ERROR:root:Attempt to translate indices of'
+                   ' non-integer type.']
+        err_msg = 'Indices must be integers!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = self.index.ids_of(np.array([1.0, 2.0]))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_ids_of_indices_out_of_range(self):
+        log_msg = ['ERROR:root:Attempt to translate indices out of range.']
+        err_msg = 'Indices must be >= 0 and < 6!'
+        for indices in ([0, 6], [-1, 2]):
+            with self.assertLogs(level=logging.ERROR) as log:
+                with self.assertRaises(ValueError, msg=err_msg) as err:
+                    _ = self.index.ids_of(np.array(indices))
+            self.assertEqual(log.output, log_msg)
+            self.assertEqual(err.msg, err_msg)
+
+    def test_indices_of_ids(self):
+        identifiers = ['LE629EL54ANHALID-345', 'AC016EL56BKHALID-943']
+        actually_is = self.index.indices_of(identifiers)
+        self.assertIsInstance(actually_is, np.ndarray)
+        self.assertListEqual(actually_is.tolist(), [2, 5])
+
+    def test_indices_of_unknown_ids_are_minus_one(self):
+        identifiers = ['foo', 'LE629EL54ANHALID-345', 12, '']
+        actually_is = self.index.indices_of(identifiers)
+        self.assertListEqual(actually_is.tolist(), [-1, 2, -1, -1])
+
+    def test_add_known_and_new_ids(self):
+        identifiers = ['LE629EL54ANHALID-345', 'new', 'AC016EL56BKHALID-943',
+                       'newer', 'new']
+        actually_is = self.index.add(identifiers)
+        self.assertIsInstance(actually_is, np.ndarray)
+        self.assertListEqual(actually_is.tolist(), [2, 6, 5, 7, 6])
+        self.assertEqual(self.index.count, 8)
+        self.assertEqual(self.index.index_of['newer'], 7)
+        self.assertEqual(self.index.id_of[6], 'new')
+        self.assertEqual(self.index.index_of['OL756EL65HDYALID-4834'], 3)
+
+    def test_translate_after_add(self):
+        _ = self.index.ids_of(np.array([0]))
+        self.index.add(['new'])
+        self.assertListEqual(self.index.ids_of(np.array([6, 0])),
+                             ['new', 'AC016EL50CPHALID-1749'])
+        self.assertListEqual(self.index.indices_of(['new', 'foo']).tolist(),
+                             [6, -1])
+
+    def test_add_no_ids(self):
+        self.assertListEqual(self.index.add([]).tolist(), [])
+        self.assertEqual(self.index.count, 6)
+
+
+class TestIndexFromTable(TestIndexFrom):
+
+    def setUp(self):
+        super().setUp()
+        self.index = IndexFrom(TableFrom.from_ids(list(self.dictionary)))
+
+    def test_cannot_set_attribute_index_of(self):
+        with self.assertRaises(AttributeError):
+            self.index.index_of = 12.3
+        self.assertDictEqual(dict(self.index.index_of), self.dictionary)
+
+    def test_type_of_attribute_index_of(self):
+        self.assertNotIsInstance(self.index.index_of, dict)
+
+    def test_correct_values_in_index_of(self):
+        self.assertDictEqual(dict(self.index.index_of), self.dictionary)
+
+    def test_cannot_set_attribute_id_of(self):
+        with self.assertRaises(AttributeError):
+            self.index.id_of = 'foo'
+        self.assertDictEqual(dict(self.index.id_of), self.invertdict)
+
+    def test_type_of_attribute_id_of(self):
+        self.assertIsInstance(self.index.id_of, TableFrom)
+
+    def test_correct_values_in_id_of(self):
+        self.assertDictEqual(dict(self.index.id_of), self.invertdict)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -3,8 +3,11 @@
 
 import unittest as ut
 import logging
+import numpy as np
 import scipy.sparse as scpsp
-from ....datastructures.auxiliary import MatrixFrom
+from unittest.mock import patch
+from ....datastructures.auxiliary import MatrixFrom, PatternFrom
+from ....datastructures.auxiliary import matrixfrom
 
 
 class TestInstatiateMatrix(ut.TestCase):
@@ -198,6 +201,56 @@ class TestMatrixFrom(ut.TestCase):
         actually_is = self.matrix.bool_by_row.toarray().tolist()
         self.assertListEqual(should_be, actually_is)
 
+    def test_has_attribute_pattern_by_col(self):
+        self.assertTrue(hasattr(self.matrix, 'pattern_by_col'))
+
+    def test_cannot_set_attribute_pattern_by_col(self):
+        with self.assertRaises(AttributeError):
+            self.matrix.pattern_by_col = 'baz'
+
+    def test_type_of_attribute_pattern_by_col(self):
+        self.assertIsInstance(self.matrix.pattern_by_col, PatternFrom)
+
+    def test_pattern_by_col_shares_index_arrays_of_by_col(self):
+        pattern = self.matrix.pattern_by_col
+        self.assertEqual(pattern.format, 'csc')
+        self.assertIs(pattern.indices, self.matrix.by_col.indices)
+        self.assertIs(pattern.indptr, self.matrix.by_col.indptr)
+
+    def test_has_attribute_pattern_by_row(self):
+        self.assertTrue(hasattr(self.matrix, 'pattern_by_row'))
+
+    def test_cannot_set_attribute_pattern_by_row(self):
+        with self.assertRaises(AttributeError):
+            self.matrix.pattern_by_row = 'qux'
+
+    def test_type_of_attribute_pattern_by_row(self):
+        self.assertIsInstance(self.matrix.pattern_by_row, PatternFrom)
+
+    def test_pattern_by_row_shares_index_arrays_of_by_row(self):
+        by_row = self.matrix.by_row
+        pattern = self.matrix.pattern_by_row
+        self.assertEqual(pattern.format, 'csr')
+        self.assertIs(pattern.indices, by_row.indices)
+        self.assertIs(pattern.indptr, by_row.indptr)
+
+    def test_pattern_by_row_does_not_convert_by_col(self):
+        _ = self.matrix.pattern_by_row
+        self.assertNotIn('by_row', self.matrix.resident)
+
+    def test_pattern_by_col_is_kept(self):
+        self.assertIs(self.matrix.pattern_by_col, self.matrix.pattern_by_col)
+
+    def test_pattern_by_row_same_as_by_row(self):
+        pattern = self.matrix.pattern_by_row
+        should_be = self.matrix.by_col.tocsr()
+        should_be.sort_indices()
+        self.assertEqual(pattern.format, 'csr')
+        self.assertListEqual(pattern.indptr.tolist(),
+                             should_be.indptr.tolist())
+        self.assertListEqual(pattern.indices.tolist(),
+                             should_be.indices.tolist())
+
     def test_has_attribute_min_shape(self):
         self.assertTrue(hasattr(self.matrix, 'min_shape'))
 
@@ -212,5 +265,374 @@ class TestMatrixFrom(ut.TestCase):
         self.assertEqual(self.matrix.min_shape, 4)
 
 
+class TestInstantiateMatrixFromArrays(ut.TestCase):
+
+    def setUp(self):
+        self.rows = np.array([0, 1, 1], dtype=np.int32)
+        self.cols = np.array([0, 1, 2], dtype=np.int32)
+        self.counts = np.array([1, 2, 3], dtype=np.int32)
+
+    def test_error_on_wrong_number_of_arrays(self):
+        log_msg = ['ERROR:root:Attempt to instantiate matrix object from'
+                   ' tuple not of 3 integer arrays of equal length.']
+        err_msg = ('Tuple must hold integer arrays of rows,'
+                   ' columns, and counts of equal length!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = MatrixFrom((self.rows, self.cols))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_arrays_not_integer(self):
+        log_msg = ['ERROR:root:Attempt to instantiate matrix object from'
+                   ' tuple not of 3 integer arrays of equal length.']
+        err_msg = ('Tuple must hold integer arrays of rows,'
+                   ' columns, and counts of equal length!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = MatrixFrom((self.rows, self.cols, self.counts * 1.0))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_arrays_of_unequal_length(self):
+        log_msg = ['ERROR:root:Attempt to instantiate matrix object from'
+                   ' tuple not of 3 integer arrays of equal length.']
+        err_msg = ('Tuple must hold integer arrays of rows,'
+                   ' columns, and counts of equal length!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = MatrixFrom((self.rows, self.cols, self.counts[:2]))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_warning_on_empty_arrays(self):
+        log_msg = ['WARNING:root:Matrix instantiated with empty arrays.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            _ = MatrixFrom((self.rows[:0], self.cols[:0], self.counts[:0]))
+        self.assertEqual(log.output, log_msg)
+
+    def test_error_on_negative_indices(self):
+        log_msg = ['ERROR:root:Attempt to instantiate matrix object with'
+                   ' row or column indices not integer >= 0.']
+        err_msg = 'Row and column indices must be integer >= 0!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = MatrixFrom((self.rows, -self.cols, self.counts))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_non_positive_counts(self):
+        log_msg = ['ERROR:root:Attempt to create matrix object from arrays'
+                   ' with counts not positive integers.']
+        err_msg = 'Counts must be positive integers!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = MatrixFrom((self.rows, self.cols, self.counts - 1))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestMatrixFromArrays(TestMatrixFrom):
+
+    def setUp(self):
+        rows = np.array([3, 1, 0, 2, 3, 1], dtype=np.int32)
+        cols = np.array([5, 2, 0, 3, 4, 1], dtype=np.int32)
+        counts = np.array([8, 1, 1, 1, 9, 1], dtype=np.int32)
+        self.matrix = MatrixFrom((rows, cols, counts))
+
+
+class TestMatrixFromRepeatedArrays(TestMatrixFrom):
+
+    def setUp(self):
+        rows = np.array([3, 1, 0, 3, 2, 3, 1, 3], dtype=np.int32)
+        cols = np.array([5, 2, 0, 4, 3, 5, 1, 4], dtype=np.int32)
+        counts = np.array([5, 1, 1, 4, 1, 3, 1, 5], dtype=np.int32)
+        self.matrix = MatrixFrom((rows, cols, counts))
+
+    def test_repeated_pairs_are_summed(self):
+        self.assertEqual(self.matrix.by_col[3, 4], 9)
+        self.assertEqual(self.matrix.by_col[3, 5], 8)
+
+    def test_one_entry_per_pair(self):
+        self.assertEqual(self.matrix.by_col.nnz, 6)
+        self.assertTrue(self.matrix.by_col.has_canonical_format)
+
+    def test_boolean_matrix_has_one_entry_per_pair(self):
+        self.assertEqual(self.matrix.bool_by_col.sum(), 6)
+        self.assertEqual(self.matrix.bool_by_row.sum(), 6)
+
+
+class TestMatrixFromIndexType(ut.TestCase):
+
+    def setUp(self):
+        self.rows = np.array([3, 1, 0, 3, 2, 3], dtype=np.int32)
+        self.cols = np.array([5, 2, 0, 4, 3, 1], dtype=np.int32)
+        self.counts = np.array([5, 1, 1, 4, 1, 3], dtype=np.int32)
+
+    def test_index_type_of_few_entries(self):
+        self.assertIs(matrixfrom.index_type(2**31 - 1), np.int32)
+
+    def test_index_type_of_too_many_entries_for_int32(self):
+        self.assertIs(matrixfrom.index_type(2**31), np.int64)
+
+    def test_small_matrix_has_32_bit_indices(self):
+        by_col = MatrixFrom((self.rows, self.cols, self.counts)).by_col
+        self.assertEqual(by_col.indptr.dtype, np.int32)
+        self.assertEqual(by_col.indices.dtype, np.int32)
+
+    def test_64_bit_indices_give_same_matrix(self):
+        with patch.object(matrixfrom, 'MAX_INT32', 5):
+            by_col = MatrixFrom((self.rows, self.cols, self.counts)).by_col
+        should_be = scpsp.csc_matrix((self.counts, (self.rows, self.cols)))
+        self.assertEqual((by_col != should_be).nnz, 0)
+
+
+class TestMatrixFromColumnMajorArrays(TestMatrixFrom):
+
+    def setUp(self):
+        rows = np.array([0, 1, 1, 2, 3, 3], dtype=np.int32)
+        cols = np.array([0, 1, 2, 3, 4, 5], dtype=np.int32)
+        counts = np.array([1, 1, 1, 1, 9, 8], dtype=np.int32)
+        self.rows = rows
+        self.matrix = MatrixFrom((rows, cols, counts))
+
+    def test_row_indices_are_not_copied(self):
+        self.assertTrue(np.shares_memory(self.matrix.by_col.indices,
+                                         self.rows))
+
+
+class TestMatrixFromBudget(ut.TestCase):
+
+    def setUp(self):
+        self.counts = {(0, 0): 1,
+                       (1, 1): 1,
+                       (1, 2): 1,
+                       (2, 3): 1,
+                       (3, 4): 9,
+                       (3, 5): 8}
+        self.matrix = MatrixFrom(self.counts)
+        self.row_bytes = (6*8 + 6*4 + 5*4)
+        self.bool_bytes = 6*8
+
+    def test_budget_defaults_to_none(self):
+        self.assertIsNone(self.matrix.budget)
+
+    def test_error_on_budget_of_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set memory budget of matrix'
+                   ' object to non-integer type.']
+        err_msg = 'Memory budget must be None or integer >= 0!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.matrix.budget = 1.0
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_negative_budget(self):
+        log_msg = ['ERROR:root:Attempt to set memory budget of matrix'
+                   ' object to negative value.']
+        err_msg = 'Memory budget must be None or integer >= 0!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.matrix.budget = -1
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_resident_is_empty_before_first_use(self):
+        self.assertDictEqual(self.matrix.resident, {})
+
+    def test_resident_reports_sizes_of_formats(self):
+        _ = self.matrix.bool_by_row
+        should_be = {'by_col'     : 6*8 + 6*4 + 7*4,
+                     'by_row'     : self.row_bytes,
+                     'bool_by_row': self.bool_bytes}
+        self.assertDictEqual(self.matrix.resident, should_be)
+
+    def test_resident_lists_least_recently_used_first(self):
+        _ = self.matrix.by_row
+        _ = self.matrix.bool_by_col
+        _ = self.matrix.by_row
+        should_be = ['by_col', 'bool_by_col', 'by_row']
+        self.assertListEqual(list(self.matrix.resident), should_be)
+
+    def test_boolean_formats_share_index_arrays(self):
+        self.assertTrue(np.shares_memory(self.matrix.bool_by_col.indices,
+                                         self.matrix.by_col.indices))
+        self.assertTrue(np.shares_memory(self.matrix.bool_by_row.indptr,
+                                         self.matrix.by_row.indptr))
+
+    def test_cached_format_is_reused(self):
+        self.assertIs(self.matrix.by_row, self.matrix.by_row)
+
+    def test_least_recently_used_is_evicted(self):
+        self.matrix.budget = self.row_bytes + self.bool_bytes
+        by_row = self.matrix.by_row
+        _ = self.matrix.bool_by_col
+        _ = self.matrix.by_row
+        _ = self.matrix.bool_by_row
+        self.assertListEqual(list(self.matrix.resident),
+                             ['by_col', 'by_row', 'bool_by_row'])
+        self.assertIs(self.matrix.by_row, by_row)
+
+    def test_evicting_source_evicts_boolean_format(self):
+        self.matrix.budget = self.row_bytes + self.bool_bytes
+        _ = self.matrix.bool_by_row
+        _ = self.matrix.bool_by_col
+        self.assertListEqual(list(self.matrix.resident),
+                             ['by_col', 'bool_by_col'])
+
+    def test_lowering_budget_evicts(self):
+        _ = self.matrix.bool_by_row
+        _ = self.matrix.bool_by_col
+        self.matrix.budget = 0
+        self.assertListEqual(list(self.matrix.resident), ['by_col'])
+
+    def test_evicted_formats_are_regenerated(self):
+        self.matrix.budget = 0
+        should_be = [[1.0, 0.0, 0.0, 0.0],
+                     [0.0, 1.0, 0.0, 0.0],
+                     [0.0, 1.0, 0.0, 0.0],
+                     [0.0, 0.0, 1.0, 0.0],
+                     [0.0, 0.0, 0.0, 1.0],
+                     [0.0, 0.0, 0.0, 1.0]]
+        for _ in range(2):
+            actually_is = self.matrix.bool_by_row.T.toarray().tolist()
+            self.assertListEqual(actually_is, should_be)
+            self.assertListEqual(list(self.matrix.resident), ['by_col'])
+
+    def test_given_row_format_is_never_evicted(self):
+        by_row = self.matrix.by_col.tocsr()
+        matrix = MatrixFrom(self.matrix.by_col, by_row)
+        matrix.budget = 0
+        _ = matrix.bool_by_row
+        self.assertIs(matrix.by_row, by_row)
+        self.assertListEqual(list(matrix.resident), ['by_col', 'by_row'])
+
+
+class TestMatrixFromAdd(ut.TestCase):
+
+    def setUp(self):
+        self.counts = {(0, 0): 1,
+                       (1, 1): 1,
+                       (1, 2): 1}
+        self.matrix = MatrixFrom(self.counts)
+        self.rows = np.array([1, 2, 2, 0], dtype=np.int64)
+        self.cols = np.array([1, 3, 3, 0], dtype=np.int64)
+        self.added = np.array([2, 1, 4, 1], dtype=np.int64)
+        self.should_be = [[2.0, 0.0, 0.0, 0.0],
+                          [0.0, 3.0, 1.0, 0.0],
+                          [0.0, 0.0, 0.0, 5.0]]
+
+    def test_add_grows_shape_and_sums_counts(self):
+        self.matrix.add((self.rows, self.cols, self.added))
+        actually_is = self.matrix.by_col.toarray().tolist()
+        self.assertListEqual(self.should_be, actually_is)
+
+    def test_add_before_first_use(self):
+        self.matrix.add((self.rows[:2], self.cols[:2], self.added[:2]))
+        self.matrix.add((self.rows[2:], self.cols[2:], self.added[2:]))
+        actually_is = self.matrix.by_row.toarray().tolist()
+        self.assertListEqual(self.should_be, actually_is)
+
+    def test_add_patches_row_format_in_memory(self):
+        _ = self.matrix.by_row
+        self.matrix.add((self.rows, self.cols, self.added))
+        self.assertIn('by_row', self.matrix.resident)
+        actually_is = self.matrix.by_row.toarray().tolist()
+        self.assertListEqual(self.should_be, actually_is)
+
+    def test_add_patches_row_format_given(self):
+        by_col = self.matrix.by_col
+        matrix = MatrixFrom(by_col, by_col.tocsr())
+        matrix.add((self.rows, self.cols, self.added))
+        self.assertListEqual(self.should_be, matrix.by_row.toarray().tolist())
+        self.assertListEqual(self.should_be, matrix.by_col.toarray().tolist())
+
+    def test_add_keeps_pattern_of_known_pairs(self):
+        pattern = self.matrix.pattern_by_col
+        self.matrix.add((self.rows[:1], self.cols[:1], self.added[:1]))
+        self.assertIs(self.matrix.pattern_by_col, pattern)
+
+    def test_add_renews_pattern_of_new_pairs(self):
+        _ = self.matrix.pattern_by_col.recompressed
+        self.matrix.add((self.rows, self.cols, self.added))
+        by_col = self.matrix.pattern_by_col
+        by_row = self.matrix.pattern_by_row
+        self.assertEqual(by_col.nnz, 4)
+        self.assertListEqual(by_row.indptr.tolist(), [0, 1, 3, 4])
+        self.assertListEqual(by_row.indices.tolist(), [0, 1, 2, 3])
+
+    def test_add_drops_boolean_formats(self):
+        _ = self.matrix.bool_by_col
+        _ = self.matrix.bool_by_row
+        self.matrix.add((self.rows, self.cols, self.added))
+        _ = self.matrix.by_col
+        self.assertListEqual(list(self.matrix.resident), ['by_col', 'by_row'])
+        should_be = [[1.0, 0.0, 0.0, 0.0],
+                     [0.0, 1.0, 1.0, 0.0],
+                     [0.0, 0.0, 0.0, 1.0]]
+        actually_is = self.matrix.bool_by_col.toarray().tolist()
+        self.assertListEqual(should_be, actually_is)
+
+    def test_boolean_formats_read_right_after_add(self):
+        _ = self.matrix.bool_by_col
+        _ = self.matrix.bool_by_row
+        self.matrix.add((self.rows, self.cols, self.added))
+        should_be = [[1.0, 0.0, 0.0, 0.0],
+                     [0.0, 1.0, 1.0, 0.0],
+                     [0.0, 0.0, 0.0, 1.0]]
+        self.assertListEqual(should_be,
+                             self.matrix.bool_by_col.toarray().tolist())
+        self.assertListEqual(should_be,
+                             self.matrix.bool_by_row.toarray().tolist())
+
+    def test_add_to_existing_pairs_keeps_boolean_formats(self):
+        bool_by_col = self.matrix.bool_by_col
+        _ = self.matrix.bool_by_row
+        self.matrix.add((self.rows[:1], self.cols[:1], self.added[:1]))
+        self.assertEqual(self.matrix.by_col[1, 1], 3.0)
+        self.assertEqual(self.matrix.by_row[1, 1], 3.0)
+        self.assertIn('bool_by_row', self.matrix.resident)
+        self.assertIs(self.matrix.bool_by_col, bool_by_col)
+
+    def test_add_to_existing_pairs_in_place(self):
+        by_col = self.matrix.by_col
+        self.matrix.add((self.rows[:1], self.cols[:1], self.added[:1]))
+        self.assertIs(self.matrix.by_col, by_col)
+
+    def test_add_does_not_change_matrices_given(self):
+        by_col = self.matrix.by_col
+        by_row = by_col.tocsr()
+        matrix = MatrixFrom(by_col, by_row)
+        matrix.add((self.rows[:1], self.cols[:1], self.added[:1]))
+        self.assertEqual(matrix.by_col[1, 1], 3.0)
+        self.assertEqual(matrix.by_row[1, 1], 3.0)
+        self.assertEqual(by_col[1, 1], 1.0)
+        self.assertEqual(by_row[1, 1], 1.0)
+
+    def test_add_to_matrix_with_unsorted_indices(self):
+        by_col = scpsp.csc_matrix((np.array([1.0, 2.0]), np.array([1, 0]),
+                                   np.array([0, 2])), shape=(2, 1))
+        matrix = MatrixFrom(by_col)
+        matrix.add((np.array([0, 1]), np.array([0, 0]), np.array([1, 1])))
+        self.assertListEqual(matrix.by_col.toarray().tolist(),
+                             [[3.0], [2.0]])
+
+    def test_add_updates_min_shape(self):
+        self.assertEqual(self.matrix.min_shape, 2)
+        self.matrix.add((self.rows, self.cols, self.added))
+        self.assertEqual(self.matrix.min_shape, 3)
+
+    def test_error_on_adding_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to instantiate matrix object from'
+                   ' tuple not of 3 integer arrays of equal length.']
+        err_msg = ('Tuple must hold integer arrays of rows,'
+                   ' columns, and counts of equal length!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.matrix.add((self.rows, self.cols))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
 if __name__ == '__main__':
     ut.main()
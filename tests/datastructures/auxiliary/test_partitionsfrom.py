@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+from os import path, mkdir
+from tempfile import TemporaryDirectory
+from ....datastructures.auxiliary import PartitionsFrom
+
+
+class TestInstantiatePartitions(ut.TestCase):
+
+    def test_error_on_wrong_type_of_source(self):
+        log_msg = ['ERROR:root:Attempt to read partitions from source not'
+                   ' given as string, list, or tuple.']
+        err_msg = ('Partitions must be given as a directory, glob'
+                   ' pattern, or list of file names!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = PartitionsFrom(1)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_list_with_non_string_entries(self):
+        log_msg = ['ERROR:root:Attempt to read partitions from list with'
+                   ' file names not of type string.']
+        err_msg = 'File names of partitions must be strings!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = PartitionsFrom(['foo.csv', 2])
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestPartitionsFrom(ut.TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.names = ['2017-01-02.csv', '2017-01-01.csv', '2017-01-03.csv.gz']
+        for name in self.names + ['.hidden.csv']:
+            open(path.join(self.directory.name, name), 'w').close()
+        mkdir(path.join(self.directory.name, 'subdirectory'))
+        self.should_be = [path.join(self.directory.name, name)
+                          for name in sorted(self.names)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_apply_to(self):
+        self.assertTrue(PartitionsFrom.apply_to(self.directory.name))
+        self.assertTrue(PartitionsFrom.apply_to(['foo.csv']))
+        self.assertTrue(PartitionsFrom.apply_to('/path/to/*.csv'))
+        self.assertFalse(PartitionsFrom.apply_to(self.should_be[0]))
+        self.assertFalse(PartitionsFrom.apply_to('/path/to/file.csv'))
+
+    def test_files_in_directory(self):
+        files = PartitionsFrom(self.directory.name).files
+        self.assertListEqual(files, self.should_be)
+
+    def test_files_matching_glob_pattern(self):
+        pattern = path.join(self.directory.name, '2017-01-0[12].csv')
+        files = PartitionsFrom(pattern).files
+        self.assertListEqual(files, self.should_be[:2])
+
+    def test_files_in_list_keep_their_order(self):
+        files = PartitionsFrom(self.should_be[::-1]).files
+        self.assertListEqual(files, self.should_be[::-1])
+
+    def test_error_on_no_files_found(self):
+        log_msg = ['ERROR:root:Attempt to read partitions from source'
+                   ' without any files.']
+        err_msg = 'No files found to read partitions from!'
+        pattern = path.join(self.directory.name, '*.txt')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = PartitionsFrom(pattern).files
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+if __name__ == '__main__':
+    ut.main()
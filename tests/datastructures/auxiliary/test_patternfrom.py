@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+import numpy as np
+import scipy.sparse as scpsp
+from ....datastructures.auxiliary import PatternFrom
+
+
+class TestInstantiatePattern(ut.TestCase):
+
+    def test_error_on_indices_not_array(self):
+        log_msg = ['ERROR:root:Attempt to instantiate pattern object with'
+                   ' indices not of type <numpy.ndarray>.']
+        err_msg = 'Arrays of pattern object must be of type <numpy.ndarray>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = PatternFrom([0, 1], np.array([0, 1, 2]), (2, 2))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_indptr_not_array(self):
+        log_msg = ['ERROR:root:Attempt to instantiate pattern object with'
+                   ' indptr not of type <numpy.ndarray>.']
+        err_msg = 'Arrays of pattern object must be of type <numpy.ndarray>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = PatternFrom(np.array([0, 1]), (0, 1, 2), (2, 2))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_unknown_format(self):
+        log_msg = ['ERROR:root:Attempt to instantiate pattern object with'
+                   ' format other than "csc" or "csr".']
+        err_msg = 'Format of pattern object must be either "csc" or "csr"!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = PatternFrom(np.array([0, 1]), np.array([0, 1, 2]),
+                                (2, 2), 'coo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_matrix_not_compressed(self):
+        log_msg = ['ERROR:root:Attempt to take pattern from matrix not of'
+                   ' type <csc_matrix> or <csr_matrix>.']
+        err_msg = ('Pattern can only be taken from <csc_matrix>'
+                   ' or <csr_matrix>!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = PatternFrom.from_matrix(scpsp.coo_matrix(np.eye(2)))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestPatternFrom(ut.TestCase):
+
+    def setUp(self):
+        self.dense = np.array([[3, 0, 1, 0],
+                               [0, 2, 5, 0],
+                               [1, 1, 0, 0],
+                               [0, 0, 7, 1],
+                               [4, 0, 2, 0]])
+        self.binary = (self.dense > 0).astype(float)
+        self.by_col = scpsp.csc_matrix(self.dense)
+        self.by_row = scpsp.csr_matrix(self.dense)
+        self.pattern = PatternFrom.from_matrix(self.by_col)
+
+    def test_shares_index_arrays_with_matrix(self):
+        self.assertIs(self.pattern.indices, self.by_col.indices)
+        self.assertIs(self.pattern.indptr, self.by_col.indptr)
+
+    def test_has_no_data(self):
+        self.assertFalse(hasattr(self.pattern, 'data'))
+
+    def test_shape_format_and_nnz(self):
+        self.assertTupleEqual(self.pattern.shape, (5, 4))
+        self.assertEqual(self.pattern.format, 'csc')
+        self.assertEqual(self.pattern.nnz, 10)
+
+    def test_cannot_set_attribute_indices(self):
+        with self.assertRaises(AttributeError):
+            self.pattern.indices = np.array([1, 2])
+
+    def test_degrees_of_columns(self):
+        should_be = self.binary.sum(axis=0).tolist()
+        actually_is = self.pattern.degrees.tolist()
+        self.assertListEqual(should_be, actually_is)
+
+    def test_degrees_of_rows(self):
+        should_be = self.binary.sum(axis=1).tolist()
+        actually_is = PatternFrom.from_matrix(self.by_row).degrees.tolist()
+        self.assertListEqual(should_be, actually_is)
+
+    def test_recompressed_equals_other_format(self):
+        recompressed = self.pattern.recompressed
+        self.assertEqual(recompressed.format, 'csr')
+        self.assertTupleEqual(recompressed.shape, (5, 4))
+        self.assertListEqual(recompressed.indptr.tolist(),
+                             self.by_row.indptr.tolist())
+        self.assertListEqual(recompressed.indices.tolist(),
+                             self.by_row.indices.tolist())
+
+    def test_recompressed_twice_is_original(self):
+        twice = self.pattern.recompressed.recompressed
+        self.assertEqual(twice.format, 'csc')
+        self.assertListEqual(twice.indptr.tolist(),
+                             self.by_col.indptr.tolist())
+        self.assertListEqual(twice.indices.tolist(),
+                             self.by_col.indices.tolist())
+
+    def test_cooccurrence_of_columns(self):
+        should_be = self.binary.T.dot(self.binary).tolist()
+        actually_is = self.pattern.cooccurrence().toarray().tolist()
+        self.assertListEqual(should_be, actually_is)
+
+    def test_cooccurrence_of_rows(self):
+        should_be = self.binary.dot(self.binary.T).tolist()
+        pattern = PatternFrom.from_matrix(self.by_row)
+        actually_is = pattern.cooccurrence().toarray().tolist()
+        self.assertListEqual(should_be, actually_is)
+
+    def test_cooccurrence_with_recompressed_given(self):
+        should_be = self.binary.T.dot(self.binary).tolist()
+        recompressed = PatternFrom.from_matrix(self.by_row)
+        cooccurrence = self.pattern.cooccurrence(recompressed)
+        self.assertListEqual(should_be, cooccurrence.toarray().tolist())
+
+    def test_cooccurrence_counts_are_integers(self):
+        cooccurrence = self.pattern.cooccurrence()
+        self.assertIsInstance(cooccurrence, scpsp.csr_matrix)
+        self.assertTrue(np.issubdtype(cooccurrence.dtype, np.integer))
+
+    def test_error_on_recompressed_in_same_format(self):
+        log_msg = ['ERROR:root:Attempt to compute co-occurrence with pattern'
+                   ' that is not the same pattern compressed along the'
+                   ' other axis.']
+        err_msg = ('Recompressed pattern must have the same shape'
+                   ' and number of non-zeros, but other format!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = self.pattern.cooccurrence(self.pattern)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_row_times_csr_matrix(self):
+        pattern = PatternFrom.from_matrix(self.by_row)
+        other = np.arange(12.0).reshape(4, 3)
+        for row in range(5):
+            should_be = self.binary[row].dot(other).tolist()
+            actually_is = pattern.row_times(row, scpsp.csr_matrix(other))
+            self.assertListEqual(should_be, actually_is.tolist())
+
+    def test_row_times_csc_matrix(self):
+        pattern = PatternFrom.from_matrix(self.by_row)
+        other = np.arange(12.0).reshape(4, 3)
+        for row in range(5):
+            should_be = self.binary[row].dot(other).tolist()
+            actually_is = pattern.row_times(row, scpsp.csc_matrix(other))
+            self.assertListEqual(should_be, actually_is.tolist())
+
+    def test_row_times_with_empty_row(self):
+        pattern = PatternFrom.from_matrix(scpsp.csr_matrix(np.zeros((2, 4))))
+        other = scpsp.csr_matrix(np.ones((4, 3)))
+        self.assertListEqual(pattern.row_times(1, other).tolist(),
+                             [0.0, 0.0, 0.0])
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -3,6 +3,7 @@
 
 import unittest as ut
 import logging
+import datetime as dt
 from psycopg2.extensions import AsIs
 from ....datastructures import PostgreSQLparams
 
@@ -234,6 +235,152 @@ class TestPostGreSqlParams(ut.TestCase):
         with self.assertRaises(AttributeError):
             self.database._requested = 'foo'
 
+    def test_batch_size_default(self):
+        self.assertEqual(self.database.batch_size, 10000)
+
+    def test_batch_size_int(self):
+        self.database.batch_size = 500
+        self.assertEqual(self.database.batch_size, 500)
+
+    def test_batch_size_not_in_params(self):
+        self.assertNotIn('batch_size', self.database._params)
+
+    def test_batch_size_not_in_login(self):
+        self.database.batch_size = 500
+        self.assertNotIn('500', self.database.login)
+
+    def test_batch_size_float(self):
+        log_msg = ['ERROR:root:Attempt to set batch size to'
+                   ' non-integer type.']
+        err_msg = 'Batch size must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.database.batch_size = 12.3
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_batch_size_zero(self):
+        log_msg = ['ERROR:root:Attempt to set batch size to less than one.']
+        err_msg = 'Batch size must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.database.batch_size = 0
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_bulk_default(self):
+        self.assertFalse(self.database.bulk)
+
+    def test_bulk_true(self):
+        self.database.bulk = True
+        self.assertTrue(self.database.bulk)
+
+    def test_bulk_not_boolean(self):
+        log_msg = ['ERROR:root:Attempt to set bulk mode to non-boolean type.']
+        err_msg = 'Bulk mode can only be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.database.bulk = 'yes'
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_connections_default(self):
+        self.assertEqual(self.database.connections, 1)
+
+    def test_connections_int(self):
+        self.database.connections = 4
+        self.assertEqual(self.database.connections, 4)
+
+    def test_connections_float(self):
+        log_msg = ['ERROR:root:Attempt to set number of connections to'
+                   ' non-integer type.']
+        err_msg = 'Number of connections must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.database.connections = 2.0
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_connections_zero(self):
+        log_msg = ['ERROR:root:Attempt to set number of connections to'
+                   ' less than one.']
+        err_msg = 'Number of connections must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.database.connections = 0
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_incremental_default(self):
+        self.assertFalse(self.database.incremental)
+
+    def test_incremental_not_boolean(self):
+        log_msg = ['ERROR:root:Attempt to set incremental mode to'
+                   ' non-boolean type.']
+        err_msg = 'Incremental mode can only be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.database.incremental = 1
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_watermark_default(self):
+        self.assertIsNone(self.database.watermark)
+
+    def test_watermark_int_and_timestamp(self):
+        self.database.watermark = 1331306414
+        self.assertEqual(self.database.watermark, 1331306414)
+        self.database.watermark = dt.datetime(2012, 3, 9, 16, 20, 14)
+        self.assertEqual(self.database.watermark,
+                         dt.datetime(2012, 3, 9, 16, 20, 14))
+
+    def test_watermark_not_in_params(self):
+        self.database.watermark = 1331306414
+        self.assertNotIn('watermark', self.database._params)
+
+    def test_watermark_wrong_type(self):
+        log_msg = ['ERROR:root:Attempt to set watermark to neither integer,'
+                   ' nor timestamp, nor None.']
+        err_msg = 'Watermark must be an integer, a timestamp, or None!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.database.watermark = '2012-03-09'
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_pool_size_default(self):
+        self.assertEqual(self.database.pool_size, 0)
+
+    def test_pool_size_int(self):
+        self.database.pool_size = 3
+        self.assertEqual(self.database.pool_size, 3)
+
+    def test_pool_size_not_in_login(self):
+        self.database.pool_size = 3
+        self.assertNotIn('3', self.database.login)
+
+    def test_pool_size_float(self):
+        log_msg = ['ERROR:root:Attempt to set pool size to non-integer type.']
+        err_msg = 'Pool size must be a non-negative integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                self.database.pool_size = 2.0
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_pool_size_negative(self):
+        log_msg = ['ERROR:root:Attempt to set pool size to less than zero.']
+        err_msg = 'Pool size must be a non-negative integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.database.pool_size = -1
+        self.assertListEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_disconnect_without_pool(self):
+        self.database.disconnect()
+        self.assertEqual(self.database.pool_size, 0)
+
 
 if __name__ == '__main__':
     ut.main()
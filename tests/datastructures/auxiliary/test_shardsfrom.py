@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+from ....datastructures.auxiliary import ShardsFrom
+
+
+class TestInstantiateShards(ut.TestCase):
+
+    def test_error_on_wrong_file_type(self):
+        log_msg = ['ERROR:root:Attempt to split file given by'
+                   ' non-string type.']
+        err_msg = 'Only files given by name can be split!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = ShardsFrom(1.0, 2)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_wrong_type_of_number(self):
+        log_msg = ['ERROR:root:Attempt to split file into non-integer'
+                   ' number of shards.']
+        err_msg = 'Number of shards must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = ShardsFrom('file', 'foo')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_non_positive_number(self):
+        log_msg = ['ERROR:root:Attempt to split file into less than'
+                   ' one shard.']
+        err_msg = 'Number of shards must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = ShardsFrom('file', 0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestShardsFrom(ut.TestCase):
+
+    def setUp(self):
+        self.file = './bestPy/tests/data/data50.csv'
+        with open(self.file) as stream:
+            self.lines = stream.readlines()
+        self.shards = ShardsFrom(self.file, 4)
+
+    def test_has_attribute_file(self):
+        self.assertTrue(hasattr(self.shards, 'file'))
+
+    def test_cannot_set_attribute_file(self):
+        with self.assertRaises(AttributeError):
+            self.shards.file = 'foo'
+
+    def test_has_attribute_ranges(self):
+        self.assertTrue(hasattr(self.shards, 'ranges'))
+
+    def test_cannot_set_attribute_ranges(self):
+        with self.assertRaises(AttributeError):
+            self.shards.ranges = [(0, 1)]
+
+    def test_number_of_ranges(self):
+        self.assertEqual(len(self.shards.ranges), 4)
+
+    def test_ranges_are_contiguous(self):
+        bounds = [bound for shard in self.shards.ranges for bound in shard]
+        self.assertEqual(bounds[0], 0)
+        self.assertListEqual(bounds[1:-1:2], bounds[2:-1:2])
+
+    def test_shards_split_at_line_breaks(self):
+        lines = [line
+                 for start, stop in self.shards.ranges
+                 for line in self.shards.lines_between(start, stop)]
+        self.assertListEqual(lines, self.lines)
+
+    def test_no_empty_ranges_for_more_shards_than_lines(self):
+        shards = ShardsFrom(self.file, 500)
+        self.assertTrue(all(stop > start for start, stop in shards.ranges))
+        lines = [line
+                 for start, stop in shards.ranges
+                 for line in shards.lines_between(start, stop)]
+        self.assertListEqual(lines, self.lines)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+import gzip
+from os import path
+from tempfile import TemporaryDirectory
+from ....datastructures.auxiliary import StreamFrom
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class TestInstantiateStream(ut.TestCase):
+
+    def test_error_on_file_not_string(self):
+        log_msg = ['ERROR:root:Attempt to stream file given by'
+                   ' non-string type.']
+        err_msg = 'Only files given by name can be streamed!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = StreamFrom(1)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_block_size_not_integer(self):
+        log_msg = ['ERROR:root:Attempt to set block size of stream to'
+                   ' non-integer type.']
+        err_msg = 'Block size must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = StreamFrom('file.gz', 1.0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_depth_less_than_one(self):
+        log_msg = ['ERROR:root:Attempt to set depth of stream to less'
+                   ' than one.']
+        err_msg = 'Depth must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = StreamFrom('file.gz', depth=0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_compression_from_extension(self):
+        self.assertEqual(StreamFrom('file.csv.gz').compression, 'gzip')
+        self.assertEqual(StreamFrom('file.CSV.GZ').compression, 'gzip')
+        self.assertIsNone(StreamFrom('file.csv').compression)
+
+    @ut.skipIf(zstandard is None, 'zstandard package not installed')
+    def test_zstandard_compression_from_extension(self):
+        self.assertEqual(StreamFrom('file.zst').compression, 'zstandard')
+        self.assertEqual(StreamFrom('file.zstd').compression, 'zstandard')
+
+    @ut.skipIf(zstandard is not None, 'zstandard package installed')
+    def test_error_on_zstandard_without_package(self):
+        log_msg = ['ERROR:root:Attempt to read zstandard-compressed file'
+                   ' without the zstandard package installed.']
+        err_msg = 'Reading .zst files requires the zstandard package!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ImportError, msg=err_msg) as err:
+                _ = StreamFrom('file.csv.zst')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestStreamFrom(ut.TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.lines = ['{0};user{1};item{2}\n'.format(i, i % 7, i % 5)
+                      for i in range(500)]
+        self.content = ''.join(self.lines).encode()
+        self.file = path.join(self.directory.name, 'data.csv.gz')
+        with gzip.open(self.file, 'wb') as stream:
+            stream.write(self.content)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_blocks_hold_complete_lines(self):
+        blocks = list(StreamFrom(self.file, 100, 2).blocks())
+        self.assertGreater(len(blocks), 1)
+        for block in blocks:
+            self.assertTrue(block.endswith(b'\n'))
+        self.assertEqual(b''.join(blocks), self.content)
+
+    def test_block_larger_than_file(self):
+        blocks = list(StreamFrom(self.file).blocks())
+        self.assertListEqual(blocks, [self.content])
+
+    def test_lines(self):
+        lines = list(StreamFrom(self.file, 64).lines())
+        self.assertListEqual(lines, self.lines)
+
+    def test_newline_appended_to_last_line(self):
+        with gzip.open(self.file, 'wb') as stream:
+            stream.write(b'a;b;c\nd;e;f')
+        blocks = list(StreamFrom(self.file, 4).blocks())
+        self.assertEqual(b''.join(blocks), b'a;b;c\nd;e;f\n')
+
+    def test_uncompressed_file(self):
+        file = path.join(self.directory.name, 'data.csv')
+        with open(file, 'wb') as stream:
+            stream.write(self.content)
+        self.assertEqual(b''.join(StreamFrom(file, 100).blocks()),
+                         self.content)
+
+    def test_stop_consuming_early(self):
+        blocks = StreamFrom(self.file, 10, 1).blocks()
+        first = next(blocks)
+        blocks.close()
+        self.assertTrue(first.endswith(b'\n'))
+
+    def test_error_in_background_raised_in_consumer(self):
+        file = path.join(self.directory.name, 'missing.csv.gz')
+        with self.assertRaises(FileNotFoundError):
+            _ = list(StreamFrom(file).blocks())
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+import numpy as np
+from ....datastructures.auxiliary import TableFrom
+
+
+class TestInstantiateTable(ut.TestCase):
+
+    def test_error_on_buffer_not_array(self):
+        log_msg = ['ERROR:root:Attempt to instantiate table object with'
+                   ' buffer not of type <numpy.ndarray>.']
+        err_msg = 'Arrays of table object must be of type <numpy.ndarray>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = TableFrom(b'foo', np.array([0, 3]))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_offsets_not_array(self):
+        log_msg = ['ERROR:root:Attempt to instantiate table object with'
+                   ' offsets not of type <numpy.ndarray>.']
+        err_msg = 'Arrays of table object must be of type <numpy.ndarray>!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = TableFrom(np.frombuffer(b'foo', dtype=np.uint8), [0, 3])
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_ids_not_strings(self):
+        log_msg = ['ERROR:root:Attempt to instantiate table object with'
+                   ' non-string ID.']
+        err_msg = 'IDs in table object must be strings!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = TableFrom.from_ids(['foo', 1])
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestTableFrom(ut.TestCase):
+
+    def setUp(self):
+        self.ids = ['foo', '', 'Jürgen', 'bar', '日本', 'a' * 30]
+        self.table = TableFrom.from_ids(self.ids)
+
+    def test_buffer_holds_concatenated_ids(self):
+        self.assertEqual(self.table.buffer.tobytes(),
+                         ''.join(self.ids).encode())
+
+    def test_offsets_delimit_ids(self):
+        should_be = [0, 3, 3, 10, 13, 19, 49]
+        self.assertListEqual(self.table.offsets.tolist(), should_be)
+
+    def test_length(self):
+        self.assertEqual(len(self.table), 6)
+
+    def test_ids_by_index(self):
+        actually_is = [self.table[index] for index in range(6)]
+        self.assertListEqual(actually_is, self.ids)
+
+    def test_ids_by_numpy_integer_index(self):
+        self.assertEqual(self.table[np.int32(2)], 'Jürgen')
+
+    def test_key_error_on_index_out_of_range(self):
+        with self.assertRaises(KeyError):
+            _ = self.table[6]
+        with self.assertRaises(KeyError):
+            _ = self.table[-1]
+
+    def test_hashes_are_sorted(self):
+        hashes = self.table.hashes
+        self.assertTrue((hashes[1:] >= hashes[:-1]).all())
+
+    def test_order_is_permutation(self):
+        self.assertListEqual(sorted(self.table.order.tolist()),
+                             list(range(6)))
+
+    def test_index_of_ids(self):
+        actually_is = [self.table.index_of[id] for id in self.ids]
+        self.assertListEqual(actually_is, list(range(6)))
+
+    def test_key_error_on_unknown_id(self):
+        with self.assertRaises(KeyError):
+            _ = self.table.index_of['baz']
+        with self.assertRaises(KeyError):
+            _ = self.table.index_of[3]
+
+    def test_contains(self):
+        self.assertIn('bar', self.table.index_of)
+        self.assertNotIn('baz', self.table.index_of)
+
+    def test_index_of_iterates_in_index_order(self):
+        self.assertListEqual(list(self.table.index_of), self.ids)
+
+    def test_ids_of_indices(self):
+        indices = np.array([4, 1, 2, 5, 4])
+        should_be = [self.ids[index] for index in indices]
+        self.assertListEqual(self.table.ids_of(indices), should_be)
+
+    def test_ids_of_indices_with_newline_in_ids(self):
+        table = TableFrom.from_ids(['a\nb', 'c', '\n'])
+        indices = np.array([2, 0, 1])
+        self.assertListEqual(table.ids_of(indices), ['\n', 'a\nb', 'c'])
+
+    def test_indices_of_ids(self):
+        identifiers = ['', 'bar', 'baz', 'a' * 30, 'a' * 29, None, '日本']
+        actually_is = self.table.index_of.indices_of(identifiers)
+        self.assertListEqual(actually_is.tolist(), [1, 3, -1, 5, -1, -1, 4])
+
+    def test_indices_of_with_colliding_hashes(self):
+        position = self.table.order.tolist().index(5)
+        hashes = np.full(6, self.table.hashes[position])
+        table = TableFrom(self.table.buffer, self.table.offsets,
+                          hashes, np.arange(6, dtype=np.int32))
+        identifiers = ['a' * 30, 'bar', 'foo']
+        actually_is = table.index_of.indices_of(identifiers)
+        self.assertListEqual(actually_is.tolist(), [5, -1, -1])
+
+    def test_lookup_with_colliding_hashes(self):
+        table = TableFrom(self.table.buffer, self.table.offsets,
+                          np.zeros(6, dtype=np.uint64),
+                          np.arange(6, dtype=np.int32))
+        with self.assertRaises(KeyError):
+            _ = table.index_of['bar']
+        position = self.table.order.tolist().index(5)
+        hashes = np.full(6, self.table.hashes[position])
+        table = TableFrom(self.table.buffer, self.table.offsets,
+                          hashes, np.arange(6, dtype=np.int32))
+        self.assertEqual(table.index_of['a' * 30], 5)
+
+
+if __name__ == '__main__':
+    ut.main()
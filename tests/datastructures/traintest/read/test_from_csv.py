@@ -3,7 +3,21 @@
 
 import unittest as ut
 import logging
+import gzip
+import numpy as np
+from os import path
+from tempfile import TemporaryDirectory
 from .....datastructures.traintest.read import from_csv
+from .....datastructures.traintest.read import from_csv_partitions
+
+
+def same(result, other):
+    """Whether two results of reading from CSV are equal, arrays included."""
+    *counters, history = result
+    *other_counters, other_history = other
+    return counters == other_counters and all(
+        np.array_equal(column, other_column)
+        for column, other_column in zip(history, other_history))
 
 
 class BaseTests():
@@ -25,91 +39,72 @@ class BaseTests():
 
     def test_integer_type_number_of_records(self):
         with self.assertLogs(level=logging.WARNING):
-            n_rec, _, _, _ = from_csv(self.file, self.separator, self.fmt)
+            n_rec, *_ = from_csv(self.file, self.separator, self.fmt)
         self.assertIsInstance(n_rec, int)
 
     def test_correct_value_of_number_of_records(self):
         with self.assertLogs(level=logging.WARNING):
-            n_rec, _, _, _ = from_csv(self.file, self.separator, self.fmt)
+            n_rec, *_ = from_csv(self.file, self.separator, self.fmt)
         self.assertEqual(n_rec, 21)
 
     def test_integer_type_of_number_of_corrupted_records(self):
         with self.assertLogs(level=logging.WARNING):
-            _, n_err, _, _ = from_csv(self.file, self.separator, self.fmt)
+            _, n_err, *_ = from_csv(self.file, self.separator, self.fmt)
         self.assertIsInstance(n_err, int)
 
     def test_correct_value_of_number_of_corrupted_records(self):
         with self.assertLogs(level=logging.WARNING):
-            _, n_err, _, _ = from_csv(self.file, self.separator, self.fmt)
+            _, n_err, *_ = from_csv(self.file, self.separator, self.fmt)
         self.assertEqual(n_err, 5)
 
-    def test_dict_type_last_unique_items(self):
-        with self.assertLogs(level=logging.WARNING):
-            _, _, unique, _ = from_csv(self.file, self.separator, self.fmt)
-        self.assertIsInstance(unique, dict)
-
-    def test_last_unique_user_list(self):
-        should_be = ['4', '11', '10', '7']
-        with self.assertLogs(level=logging.WARNING):
-            _, _, unique, _ = from_csv(self.file, self.separator, self.fmt)
-        self.assertListEqual(list(unique.keys()), should_be)
-
-    def test_last_unique_item_list(self):
-        should_be = [['AC016EL50CPHALID-1749'],
-                     ['CA189EL29AGOALID-170', 'LE629EL54ANHALID-345'],
-                     ['OL756EL65HDYALID-4834'],
-                     ['OL756EL55HAMALID-4744', 'AC016EL56BKHALID-943']]
-        with self.assertLogs(level=logging.WARNING):
-            _, _, unique, _ = from_csv(self.file, self.separator, self.fmt)
-        actually_is = [list(unique[user].keys()) for user in unique]
-        self.assertListEqual(actually_is, should_be)
-
-    def test_last_unique_times(self):
-        should_be = {'4' : ['2012-03-06T23:26:35'],
-                     '11': ['2012-03-09T16:18:33', '2012-03-09T16:18:52'],
-                     '10': ['2012-03-09T16:19:01'],
-                     '7' : ['2012-03-09T16:20:14', '2012-03-09T16:20:14']}
-        with self.assertLogs(level=logging.WARNING):
-            _, _, unique, _ = from_csv(self.file, self.separator, self.fmt)
-        actually_is = {user: list(item.values())
-                       for user, item in unique.items()}
-        self.assertDictEqual(actually_is, should_be)
-
-    def test_list_type_transactions(self):
-        with self.assertLogs(level=logging.WARNING):
-            _, _, _, transacts = from_csv(self.file, self.separator, self.fmt)
-        self.assertIsInstance(transacts, list)
-
-    def test_transaction_list(self):
-        should_be = [('2012-03-06T23:26:35', '4', 'AC016EL50CPHALID-1749'),
-                     ('2012-03-09T16:18:33', '11', 'CA189EL29AGOALID-170'),
-                     ('2012-03-09T16:18:52', '11', 'LE629EL54ANHALID-345'),
-                     ('2012-03-09T16:19:01', '10', 'OL756EL65HDYALID-4834'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943')]
-        with self.assertLogs(level=logging.WARNING):
-            _, _, _, transacts = from_csv(self.file, self.separator, self.fmt)
-        self.assertListEqual(should_be, transacts)
-
-    def test_number_of_transactions_equals_length_transaction_list(self):
-        with self.assertLogs(level=logging.WARNING):
-            n_rec, _, _, transacts = from_csv(self.file, self.separator, self.fmt)
-        self.assertEqual(n_rec, len(transacts))
+    def test_user_index_in_order_of_first_appearance(self):
+        should_be = {'4': 0, '11': 1, '10': 2, '7': 3}
+        with self.assertLogs(level=logging.WARNING):
+            _, _, user_i, _, _ = from_csv(self.file, self.separator, self.fmt)
+        self.assertDictEqual(user_i, should_be)
+
+    def test_item_index_in_order_of_first_appearance(self):
+        should_be = {'AC016EL50CPHALID-1749': 0,
+                     'CA189EL29AGOALID-170': 1,
+                     'LE629EL54ANHALID-345': 2,
+                     'OL756EL65HDYALID-4834': 3,
+                     'OL756EL55HAMALID-4744': 4,
+                     'AC016EL56BKHALID-943': 5}
+        with self.assertLogs(level=logging.WARNING):
+            _, _, _, item_j, _ = from_csv(self.file, self.separator, self.fmt)
+        self.assertDictEqual(item_j, should_be)
+
+    def test_history_columns_are_integer_arrays(self):
+        with self.assertLogs(level=logging.WARNING):
+            *_, history = from_csv(self.file, self.separator, self.fmt)
+        self.assertEqual(len(history), 3)
+        for column in history:
+            self.assertIsInstance(column, np.ndarray)
+            self.assertEqual(column.dtype, np.int64)
+
+    def test_history_times(self):
+        should_be = [1331072795, 1331306313, 1331306332, 1331306341]
+        should_be = np.array(should_be + [1331306414] * 17) * 1000000
+        with self.assertLogs(level=logging.WARNING):
+            *_, (times, _, _) = from_csv(self.file, self.separator, self.fmt)
+        np.testing.assert_array_equal(times, should_be)
+
+    def test_history_users(self):
+        should_be = [0, 1, 1, 2] + [3] * 17
+        with self.assertLogs(level=logging.WARNING):
+            *_, (_, users, _) = from_csv(self.file, self.separator, self.fmt)
+        np.testing.assert_array_equal(users, should_be)
+
+    def test_history_items(self):
+        should_be = [0, 1, 2, 3] + [4] * 9 + [5] * 8
+        with self.assertLogs(level=logging.WARNING):
+            *_, (_, _, items) = from_csv(self.file, self.separator, self.fmt)
+        np.testing.assert_array_equal(items, should_be)
+
+    def test_number_of_transactions_equals_length_of_history(self):
+        with self.assertLogs(level=logging.WARNING):
+            n_rec, *_, history = from_csv(self.file, self.separator, self.fmt)
+        self.assertTrue(all(column.size == n_rec for column in history))
 
 
 class TestTrainTestFromCsvSemicolonFile(ut.TestCase, BaseTests):
@@ -126,6 +121,131 @@ class TestTrainTestFromCsvCommaFile(ut.TestCase, BaseTests):
         self.fmt = None
 
 
+class TestTrainTestFromCsvGzipFile(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'data25comma.csv.gz')
+        with open('./bestPy/tests/data/data25comma.csv', 'rb') as file:
+            with gzip.open(self.file, 'wb') as compressed:
+                compressed.write(file.read())
+        self.separator = ','
+        self.fmt = None
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_warns_and_reads_with_single_process(self):
+        with self.assertLogs(level=logging.WARNING):
+            should_be = from_csv(self.file, self.separator)
+        log_msg = ['WARNING:root:Compressed files cannot be split into'
+                   ' shards. Reading with a single process.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            actually_is = from_csv(self.file, self.separator, workers=2)
+        self.assertEqual(log.output[0], log_msg[0])
+        self.assertTrue(same(actually_is, should_be))
+
+
+class TestTrainTestFromCsvInShards(ut.TestCase):
+
+    def setUp(self):
+        self.file = './bestPy/tests/data/data25timestamp_fmt.csv'
+        self.fmt = '%Y-%m-%d %H:%M:%S'
+        with self.assertLogs(level=logging.WARNING) as log:
+            self.should_be = from_csv(self.file, fmt=self.fmt)
+        self.log_msg = log.output
+
+    def test_same_result_as_single_process(self):
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_csv(self.file, fmt=self.fmt, workers=3)
+        self.assertTrue(same(actually_is, self.should_be))
+
+    def test_same_order_of_users_and_items(self):
+        with self.assertLogs(level=logging.WARNING):
+            _, _, user_i, item_j, _ = from_csv(self.file, fmt=self.fmt,
+                                               workers=4)
+        self.assertListEqual(list(user_i.items()),
+                             list(self.should_be[2].items()))
+        self.assertListEqual(list(item_j.items()),
+                             list(self.should_be[3].items()))
+
+    def test_same_warnings_as_single_process(self):
+        with self.assertLogs(level=logging.WARNING) as log:
+            _ = from_csv(self.file, fmt=self.fmt, workers=3)
+        self.assertListEqual(log.output, self.log_msg)
+
+    def test_error_on_wrong_type_of_workers(self):
+        log_msg = ['ERROR:root:Attempt to set number of workers to'
+                   ' non-integer type.']
+        err_msg = 'Number of workers must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = from_csv(self.file, workers='2')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_non_positive_workers(self):
+        log_msg = ['ERROR:root:Attempt to set number of workers to'
+                   ' less than one.']
+        err_msg = 'Number of workers must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = from_csv(self.file, workers=-1)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestTrainTestFromCsvPartitions(ut.TestCase):
+
+    def setUp(self):
+        self.file = './bestPy/tests/data/data25timestamp_fmt.csv'
+        self.fmt = '%Y-%m-%d %H:%M:%S'
+        with self.assertLogs(level=logging.WARNING):
+            self.should_be = from_csv(self.file, fmt=self.fmt)
+        self.directory = TemporaryDirectory()
+        self.files = [path.join(self.directory.name, name)
+                      for name in ('part1.csv', 'part2.csv.gz')]
+        with open(self.file, 'rb') as file:
+            lines = file.readlines()
+        with open(self.files[0], 'wb') as part:
+            part.writelines(lines[:12])
+        with gzip.open(self.files[1], 'wb') as part:
+            part.writelines(lines[12:])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_same_result_as_single_file(self):
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_csv_partitions(self.files, fmt=self.fmt)
+        self.assertTrue(same(actually_is[:5], self.should_be))
+
+    def test_same_result_with_several_processes(self):
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_csv_partitions(self.files, fmt=self.fmt,
+                                              workers=2)
+        self.assertTrue(same(actually_is[:5], self.should_be))
+
+    def test_counters_of_partitions(self):
+        should_be = {self.files[0]: {'number_of_transactions': 9,
+                                     'number_of_corrupted_records': 3},
+                     self.files[1]: {'number_of_transactions': 12,
+                                     'number_of_corrupted_records': 1}}
+        with self.assertLogs(level=logging.WARNING):
+            *_, partitions = from_csv_partitions(self.files, fmt=self.fmt)
+        self.assertDictEqual(partitions, should_be)
+
+    def test_warnings_refer_to_lines_in_files(self):
+        with self.assertLogs(level=logging.WARNING) as log:
+            _ = from_csv_partitions(self.files, fmt=self.fmt)
+        messages = [message for message in log.output if ' line ' in message]
+        lines = [message.split(' line ')[1].split('.')[0]
+                 for message in messages]
+        prefixes = [message.split(': ')[0] for message in messages]
+        self.assertListEqual(lines, ['2', '5', '11', '5'])
+        self.assertListEqual(prefixes, ['WARNING:root:' + self.files[0]] * 3 +
+                                       ['WARNING:root:' + self.files[1]])
+
+
 class TestTrainTestFromCsvFileSeparator(ut.TestCase):
 
     def test_wrong_type_of_separator(self):
@@ -3,6 +3,7 @@
 
 import unittest as ut
 import logging
+import numpy as np
 from psycopg2 import connect, OperationalError, ProgrammingError
 from .....datastructures import PostgreSQLparams
 from .....datastructures.traintest.read import from_postgreSQL
@@ -27,6 +28,13 @@ def no_connection_to(database):
         return True
     return False
 
+def same(result, other):
+    *counters, history = result
+    *other_counters, other_history = other
+    return counters == other_counters and all(
+        np.array_equal(column, other_column)
+        for column, other_column in zip(history, other_history))
+
 
 class TestSplitFromPostgreSQL(ut.TestCase):
 
@@ -206,43 +214,23 @@ class TestSplitFromPostgreSQL(ut.TestCase):
     def test_timestamp_field_is_read_and_converted_correctly(self):
         db = database()
         db.table = 'data25timestamp'
-        should_be = ('2012-03-06T23:26:35', '2012-03-09T16:18:02',
-                     '2012-03-09T16:18:02', '2012-03-09T16:18:52',
-                     '2012-03-09T16:19:01', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14')
+        should_be = [1331076395, 1331309882, 1331309882, 1331309932,
+                     1331309941] + [1331310014] * 16
         with self.assertLogs(level=logging.WARNING):
-            _, _, _, transactions = from_postgreSQL(db)
-        actually_is = list(zip(*transactions))[0]
-        self.assertTupleEqual(actually_is, should_be)
+            *_, (times, _, _) = from_postgreSQL(db)
+        self.assertListEqual(times.tolist(),
+                             [time * 1000000 for time in should_be])
 
     @ut.skipIf(no_connection_to(database()),
               'Could not establish connection to test database.')
     def test_unix_epoch_field_is_read_and_converted_correctly(self):
         db = database()
         db.table = 'head25'
-        should_be = ('2012-03-06T23:26:35', '2012-03-06T23:53:45',
-                     '2012-03-09T16:18:02', '2012-03-09T16:18:02',
-                     '2012-03-09T16:18:33', '2012-03-09T16:18:52',
-                     '2012-03-09T16:19:01', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14')
-        _, _, _, transactions = from_postgreSQL(db)
-        actually_is = list(zip(*transactions))[0]
-        self.assertTupleEqual(actually_is, should_be)
+        should_be = [1331072795, 1331074425, 1331306282, 1331306282,
+                     1331306313, 1331306332, 1331306341] + [1331306414] * 18
+        *_, (times, _, _) = from_postgreSQL(db)
+        self.assertListEqual(times.tolist(),
+                             [time * 1000000 for time in should_be])
 
     @ut.skipIf(no_connection_to(database()),
               'Could not establish connection to test database.')
@@ -250,7 +238,7 @@ class TestSplitFromPostgreSQL(ut.TestCase):
         db = database()
         db.table = 'data25timestamp'
         with self.assertLogs(level=logging.WARNING):
-            n_rec, _, _, _ = from_postgreSQL(db)
+            n_rec, *_ = from_postgreSQL(db)
         self.assertIsInstance(n_rec, int)
 
     @ut.skipIf(no_connection_to(database()),
@@ -259,7 +247,7 @@ class TestSplitFromPostgreSQL(ut.TestCase):
         db = database()
         db.table = 'data25timestamp'
         with self.assertLogs(level=logging.WARNING):
-            n_rec, _, _, _ = from_postgreSQL(db)
+            n_rec, *_ = from_postgreSQL(db)
         self.assertEqual(n_rec, 21)
 
     @ut.skipIf(no_connection_to(database()),
@@ -268,7 +256,7 @@ class TestSplitFromPostgreSQL(ut.TestCase):
         db = database()
         db.table = 'data25timestamp'
         with self.assertLogs(level=logging.WARNING):
-            _, n_err, _, _ = from_postgreSQL(db)
+            _, n_err, *_ = from_postgreSQL(db)
         self.assertIsInstance(n_err, int)
 
     @ut.skipIf(no_connection_to(database()),
@@ -277,75 +265,70 @@ class TestSplitFromPostgreSQL(ut.TestCase):
         db = database()
         db.table = 'data25timestamp'
         with self.assertLogs(level=logging.WARNING):
-            _, n_err, _, _ = from_postgreSQL(db)
+            _, n_err, *_ = from_postgreSQL(db)
         self.assertEqual(n_err, 1)
 
     @ut.skipIf(no_connection_to(database()),
               'Could not establish connection to test database.')
-    def test_dict_type_of_last_unique_items(self):
-        pass
+    def test_users_and_items_indexed_consecutively(self):
+        db = database()
+        db.table = 'data25timestamp'
+        with self.assertLogs(level=logging.WARNING):
+            _, _, user_i, item_j, _ = from_postgreSQL(db)
+        self.assertListEqual(sorted(user_i.values()), list(range(5)))
+        self.assertListEqual(sorted(item_j.values()), list(range(6)))
 
     @ut.skipIf(no_connection_to(database()),
               'Could not establish connection to test database.')
-    def test_correct_values_in_last_unique_items(self):
+    def test_correct_values_transactions(self):
         db = database()
         db.table = 'data25timestamp'
+        should_be = [(1331076395, '4', 'AC016EL50CPHALID-1749'),
+                     (1331309882, '12', 'SA848EL83DOYALID-2416'),
+                     (1331309882, '12', 'BL152EL82CRXALID-1817'),
+                     (1331309932, '11', 'LE629EL54ANHALID-345'),
+                     (1331309941, '10', 'OL756EL65HDYALID-4834')]
+        should_be += [(1331310014, '7', 'OL756EL55HAMALID-4744')] * 8
+        should_be += [(1331310014, '7', 'AC016EL56BKHALID-943')] * 8
         with self.assertLogs(level=logging.WARNING):
-            _, _, last_unique, _ = from_postgreSQL(db)
-        self.assertIsInstance(last_unique, dict)
+            _, _, user_i, item_j, history = from_postgreSQL(db)
+        user_of = {index: user for user, index in user_i.items()}
+        item_of = {index: item for item, index in item_j.items()}
+        actually_is = [(time // 1000000, user_of[user], item_of[item])
+                       for time, user, item in zip(*(column.tolist()
+                                                     for column in history))]
+        self.assertListEqual(actually_is, should_be)
 
     @ut.skipIf(no_connection_to(database()),
               'Could not establish connection to test database.')
-    def test_list_type_of_transactions(self):
-        db = database()
-        db.table = 'data25timestamp'
-        should_be = {'4' : {'AC016EL50CPHALID-1749': '2012-03-06T23:26:35'},
-                     '12': {'SA848EL83DOYALID-2416': '2012-03-09T16:18:02',
-                            'BL152EL82CRXALID-1817': '2012-03-09T16:18:02'},
-                     '11': {'LE629EL54ANHALID-345': '2012-03-09T16:18:52'},
-                     '10': {'OL756EL65HDYALID-4834': '2012-03-09T16:19:01'},
-                     '7' : {'OL756EL55HAMALID-4744': '2012-03-09T16:20:14',
-                            'AC016EL56BKHALID-943': '2012-03-09T16:20:14'}}
+    def test_number_of_transactions_equals_length_of_history(self):
         with self.assertLogs(level=logging.WARNING):
-            _, _, last_unique, _ = from_postgreSQL(db)
-        self.assertDictEqual(last_unique, should_be)
+            n_rec, *_, history = from_postgreSQL(database())
+        self.assertTrue(all(column.size == n_rec for column in history))
 
     @ut.skipIf(no_connection_to(database()),
               'Could not establish connection to test database.')
-    def test_correct_values_transactions(self):
+    def test_same_result_for_small_batches(self):
         db = database()
-        db.table = 'data25timestamp'
-        should_be = [('2012-03-06T23:26:35', '4', 'AC016EL50CPHALID-1749'),
-                     ('2012-03-09T16:18:02', '12', 'SA848EL83DOYALID-2416'),
-                     ('2012-03-09T16:18:02', '12', 'BL152EL82CRXALID-1817'),
-                     ('2012-03-09T16:18:52', '11', 'LE629EL54ANHALID-345'),
-                     ('2012-03-09T16:19:01', '10', 'OL756EL65HDYALID-4834'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'OL756EL55HAMALID-4744'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943'),
-                     ('2012-03-09T16:20:14', '7', 'AC016EL56BKHALID-943')]
+        db.batch_size = 7
         with self.assertLogs(level=logging.WARNING):
-            _, _, _, transactions = from_postgreSQL(db)
-        self.assertListEqual(transactions, should_be)
+            should_be = from_postgreSQL(database())
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_postgreSQL(db)
+        self.assertTrue(same(actually_is, should_be))
 
     @ut.skipIf(no_connection_to(database()),
               'Could not establish connection to test database.')
-    def test_number_of_transactions_equals_length_transaction_list(self):
+    def test_same_result_for_repeated_reads_from_pool(self):
+        db = database()
+        db.pool_size = 1
         with self.assertLogs(level=logging.WARNING):
-            n_rec, _, _, transactions = from_postgreSQL(database())
-        self.assertEqual(n_rec, len(transactions))
+            should_be = from_postgreSQL(database())
+        for _ in range(3):
+            with self.assertLogs(level=logging.WARNING):
+                actually_is = from_postgreSQL(db)
+            self.assertTrue(same(actually_is, should_be))
+        db.disconnect()
 
 
 if __name__ == '__main__':
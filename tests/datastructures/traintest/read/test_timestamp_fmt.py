@@ -5,6 +5,7 @@ import unittest as ut
 import datetime as dt
 import logging
 from .....datastructures.traintest.read import from_csv
+from .....datastructures.traintest.read.from_csv import microseconds_of
 
 
 class TestTrainTestFromCsvFileTimestampFmt(ut.TestCase):
@@ -32,35 +33,68 @@ class TestTrainTestFromCsvFileTimestampFmt(ut.TestCase):
                    'WARNING:root:Could not interpret timestamp on'
                    ' line 17. Skipping.']
         with self.assertLogs(level=logging.WARNING) as log:
-            _, _, _, _ = from_csv(self.file, self.separator, self.fmt)
+            _ = from_csv(self.file, self.separator, self.fmt)
         self.assertListEqual(log.output, log_msg)
 
     def test_total_number_of_records(self):
         with self.assertLogs(level=logging.WARNING):
-            n_rec, _, _, _ = from_csv(self.file, self.separator, self.fmt)
+            n_rec, *_ = from_csv(self.file, self.separator, self.fmt)
         self.assertEqual(n_rec, 21)
 
     def test_number_of_corrupted_records(self):
         with self.assertLogs(level=logging.WARNING):
-            _, n_err, _, _ = from_csv(self.file, self.separator, self.fmt)
+            _, n_err, *_ = from_csv(self.file, self.separator, self.fmt)
         self.assertEqual(n_err, 4)
 
-    def test_datetimes(self):
-        should_be = ['2012-03-06T23:26:35', '2012-03-09T16:18:02',
-                     '2012-03-09T16:18:02', '2012-03-09T16:18:52',
-                     '2012-03-09T16:19:01', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14']
+    def test_times_in_microseconds_since_1970(self):
+        should_be = ['2012-03-06 23:26:35', '2012-03-09 16:18:02',
+                     '2012-03-09 16:18:02', '2012-03-09 16:18:52',
+                     '2012-03-09 16:19:01'] + ['2012-03-09 16:20:14'] * 16
+        should_be = [(dt.datetime.strptime(time, self.fmt) -
+                      dt.datetime(1970, 1, 1)) // dt.timedelta(microseconds=1)
+                     for time in should_be]
         with self.assertLogs(level=logging.WARNING):
-            _, _, _, transacts = from_csv(self.file, self.separator, self.fmt)
-        datetimes = [transact[0] for transact in transacts]
-        self.assertListEqual(datetimes, should_be)
+            *_, (times, _, _) = from_csv(self.file, self.separator, self.fmt)
+        self.assertListEqual(times.tolist(), should_be)
+
+
+
+class TestMicrosecondsOfFormattedTimestamps(ut.TestCase):
+
+    def setUp(self):
+        self.fmt = '%Y-%m-%d %H:%M:%S'
+
+    def test_same_as_strptime_for_unpadded_fields(self):
+        times, valid, _ = microseconds_of(['2012-3-6 23:26:35'], self.fmt)
+        self.assertListEqual(valid.tolist(), [True])
+        self.assertListEqual(times.tolist(), [1331076395000000])
+
+    def test_failure_on_separator_other_than_in_format(self):
+        times, valid, failures = microseconds_of(['2012-03-06 23:26:35',
+                                                  '2012-03-06T23:26:35'],
+                                                 self.fmt)
+        message = ('Failed to read timestamp. Check that it adheres to'
+                   ' the given format "%Y-%m-%d %H:%M:%S".')
+        self.assertListEqual(valid.tolist(), [True, False])
+        self.assertListEqual(failures, [(1, message)])
+
+    def test_failure_on_time_zone_not_in_format(self):
+        _, valid, _ = microseconds_of(['2012-03-06 23:26:35Z'], self.fmt)
+        self.assertListEqual(valid.tolist(), [False])
+
+    def test_fractions_of_seconds(self):
+        fmt = '%Y-%m-%dT%H:%M:%S.%f'
+        times, valid, _ = microseconds_of(['2012-03-06T23:26:35.000012',
+                                           '2012-03-06T23:26:35.5'], fmt)
+        self.assertListEqual(valid.tolist(), [True, True])
+        self.assertListEqual(times.tolist(), [1331076395000012,
+                                              1331076395500000])
+
+    def test_format_other_than_iso(self):
+        times, valid, _ = microseconds_of(['06.03.2012 23:26'],
+                                          '%d.%m.%Y %H:%M')
+        self.assertListEqual(valid.tolist(), [True])
+        self.assertListEqual(times.tolist(), [1331076360000000])
 
 
 if __name__ == '__main__':
@@ -4,6 +4,7 @@
 import unittest as ut
 import logging
 from .....datastructures.traintest.read import from_csv
+from .....datastructures.traintest.read.from_csv import microseconds_of
 
 
 class TestTrainTestFromCsvFileTimestampInt(ut.TestCase):
@@ -31,35 +32,51 @@ class TestTrainTestFromCsvFileTimestampInt(ut.TestCase):
                    'WARNING:root:Could not interpret timestamp on'
                    ' line 17. Skipping.']
         with self.assertLogs(level=logging.WARNING) as log:
-            _, _, _, _ = from_csv(self.file, self.separator, self.fmt)
+            _ = from_csv(self.file, self.separator, self.fmt)
         self.assertListEqual(log.output, log_msg)
 
     def test_total_number_of_records(self):
         with self.assertLogs(level=logging.WARNING):
-            n_rec, _, _, _ = from_csv(self.file, self.separator, self.fmt)
+            n_rec, *_ = from_csv(self.file, self.separator, self.fmt)
         self.assertEqual(n_rec, 21)
 
     def test_number_of_corrupted_records(self):
         with self.assertLogs(level=logging.WARNING):
-            _, n_err, _, _ = from_csv(self.file, self.separator, self.fmt)
+            _, n_err, *_ = from_csv(self.file, self.separator, self.fmt)
         self.assertEqual(n_err, 4)
 
-    def test_datetimes(self):
-        should_be = ['2012-03-06T23:26:35', '2012-03-09T16:18:02',
-                     '2012-03-09T16:18:02', '2012-03-09T16:18:52',
-                     '2012-03-09T16:19:01', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14', '2012-03-09T16:20:14',
-                     '2012-03-09T16:20:14']
+    def test_times_in_microseconds_since_1970(self):
+        should_be = [1331072795, 1331306282, 1331306282, 1331306332,
+                     1331306341] + [1331306414] * 16
+        should_be = [time * 1000000 for time in should_be]
         with self.assertLogs(level=logging.WARNING):
-            _, _, _, transacts = from_csv(self.file, self.separator, self.fmt)
-        datetimes = [transact[0] for transact in transacts]
-        self.assertListEqual(datetimes, should_be)
+            *_, (times, _, _) = from_csv(self.file, self.separator, self.fmt)
+        self.assertListEqual(times.tolist(), should_be)
+
+
+
+class TestMicrosecondsOfEpochs(ut.TestCase):
+
+    def test_same_as_int_for_signs_and_spaces(self):
+        times, valid, _ = microseconds_of(['+12', ' 3 ', '-4'])
+        self.assertListEqual(valid.tolist(), [True, True, True])
+        self.assertListEqual(times.tolist(), [12000000, 3000000, -4000000])
+
+    def test_failures_keep_their_position(self):
+        stamps = ['1', '2a', '3', '1111111111111331306414', '5']
+        times, valid, failures = microseconds_of(stamps)
+        self.assertListEqual(valid.tolist(), [True, False, True, False, True])
+        self.assertListEqual(times[valid].tolist(), [1000000, 3000000,
+                                                     5000000])
+        self.assertListEqual(failures,
+                             [(1, 'Failed to convert UNIX epoch timestamp'
+                                  ' to integer.'),
+                              (3, 'Integer is not a valid UNIX epoch'
+                                  ' timestamp.')])
+
+    def test_failure_beyond_year_9999(self):
+        _, valid, _ = microseconds_of(['253402300799', '253402300800'])
+        self.assertListEqual(valid.tolist(), [True, False])
 
 
 if __name__ == '__main__':
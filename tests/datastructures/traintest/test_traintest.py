@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import datetime as dt
 import unittest as ut
+import numpy as np
 from ....datastructures.auxiliary import TestDataFrom
 from ....datastructures import TrainTest, Transactions
 
@@ -233,6 +235,222 @@ class TestTrainTest(ut.TestCase):
         self.data.split(1, only_new=False)
         self.assertEqual(self.data.train.item.count, 4)
 
+    def test_train_counts_of_repeated_purchases_also_old(self):
+        self.data.split(1, only_new=False)
+        user = self.data.train.user.index_of['7']
+        item = self.data.train.item.index_of['AC016EL56BKHALID-943']
+        self.assertEqual(self.data.train.matrix.by_col[user, item], 7)
+
+    def test_same_train_after_splitting_differently_before(self):
+        self.data.split(1)
+        should_be = self.data.train.matrix.by_col.toarray().tolist()
+        self.data.split(2, only_new=False)
+        self.data.split(1)
+        actually_is = self.data.train.matrix.by_col.toarray().tolist()
+        self.assertListEqual(actually_is, should_be)
+
+    def test_splits_yield_all_settings_in_order(self):
+        data = TrainTest.from_csv('./bestPy/tests/data/data50.csv')
+        should_be = [(1, True), (1, False), (2, True), (2, False)]
+        self.assertListEqual(list(data.splits([1, 2])), should_be)
+
+    def test_splits_same_as_split(self):
+        data = TrainTest.from_csv('./bestPy/tests/data/data50.csv')
+        other = TrainTest.from_csv('./bestPy/tests/data/data50.csv')
+        for hold_out, only_new in data.splits([4, 1, 6]):
+            other.split(hold_out, only_new)
+            self.assertDictEqual(data.test.data, other.test.data)
+            self.assertDictEqual(data.train.user.index_of,
+                                 other.train.user.index_of)
+            self.assertDictEqual(data.train.item.index_of,
+                                 other.train.item.index_of)
+            self.assertEqual(data.train.number_of_transactions,
+                             other.train.number_of_transactions)
+            self.assertEqual((data.train.matrix.by_col !=
+                              other.train.matrix.by_col).nnz, 0)
+
+    def test_splits_with_single_only_new(self):
+        settings = list(self.data.splits([1], only_new=False))
+        self.assertListEqual(settings, [(1, False)])
+        self.assertFalse(self.data.test.only_new)
+
+    def test_splits_reset_hold_out(self):
+        log_msg = ['WARNING:root:Attempt to set hold_out < 1. Resetting to 1.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            settings = list(self.data.splits([0], only_new=(True,)))
+        self.assertListEqual(settings, [(1, True)])
+        self.assertEqual(log.output, log_msg)
+
+    def test_splits_hold_outs_not_list(self):
+        log_msg = ['ERROR:root:Attempt to set "hold_outs" to neither list'
+                   ' nor tuple.']
+        err_msg = 'Parameter "hold_outs" must be a list or tuple of integers!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = next(self.data.splits(1))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_splits_only_new_not_booleans(self):
+        log_msg = ['ERROR:root:Attempt to set "only_new" to non-boolean type.']
+        err_msg = 'Flag "only_new" can only be True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = next(self.data.splits([1], only_new=(True, 'foo')))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_splits_only_new_empty(self):
+        log_msg = ['ERROR:root:Attempt to set "only_new" to neither boolean'
+                   ' nor non-empty list or tuple.']
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError):
+                _ = next(self.data.splits([1], only_new=()))
+        self.assertEqual(log.output, log_msg)
+
+    def test_rolling_yields_cutoffs_with_test_data(self):
+        data = TrainTest.from_csv('./bestPy/tests/data/data50.csv')
+        cutoffs = [dt.datetime(2012, 3, day) for day in range(7, 13)]
+        log_msg = ['WARNING:root:No test data between 2012-03-07 00:00:00'
+                   ' and 2012-03-08 00:00:00. Skipping.',
+                   'WARNING:root:No test data between 2012-03-08 00:00:00'
+                   ' and 2012-03-09 00:00:00. Skipping.',
+                   'WARNING:root:No test data between 2012-03-10 00:00:00'
+                   ' and 2012-03-11 00:00:00. Skipping.',
+                   'WARNING:root:No test data between 2012-03-11 00:00:00'
+                   ' and 2012-03-12 00:00:00. Skipping.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            yielded = list(data.rolling(cutoffs, dt.timedelta(days=1)))
+        should_be = [dt.datetime(2012, 3, 9), dt.datetime(2012, 3, 12)]
+        self.assertListEqual(yielded, should_be)
+        self.assertEqual(log.output, log_msg)
+
+    def test_rolling_skips_cutoffs_without_training_data(self):
+        data = TrainTest.from_csv('./bestPy/tests/data/data50.csv')
+        cutoffs = [dt.datetime(2012, 1, 1), dt.datetime(2012, 3, 9)]
+        log_msg = ['WARNING:root:No training data before 2012-01-01'
+                   ' 00:00:00. Skipping.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            yielded = list(data.rolling(cutoffs, dt.timedelta(days=1)))
+        self.assertListEqual(yielded, [dt.datetime(2012, 3, 9)])
+        self.assertEqual(log.output, log_msg)
+
+    def test_rolling_test_and_growing_train(self):
+        data = TrainTest.from_csv('./bestPy/tests/data/data50.csv')
+        cutoffs = [dt.datetime(2012, 3, 9), dt.datetime(2012, 3, 12)]
+        rolling = data.rolling(cutoffs, dt.timedelta(days=1))
+        _ = next(rolling)
+        first_train = data.train
+        self.assertEqual(data.train.number_of_transactions, 2)
+        self.assertEqual(data.train.user.count, 2)
+        should_be = {'7': {'OL756EL55HAMALID-4744'},
+                     '10': {'OL756EL65HDYALID-4834'},
+                     '11': {'CA189EL29AGOALID-170'},
+                     '12': {'SA848EL83DOYALID-2416'},
+                     '13': {'PI794EL32ENZALID-3067'},
+                     '16': {'VI962EL59EFGALID-2840'},
+                     '17': {'SA848EL83DOYALID-2416'},
+                     '19': {'AP082EL01CFQALID-1498'}}
+        self.assertDictEqual(data.test.data, should_be)
+        _ = next(rolling)
+        self.assertIs(data.train, first_train)
+        self.assertEqual(data.train.number_of_transactions, 37)
+        self.assertEqual(data.train.user.count, 10)
+        should_be = {'1': {'SA848EL83DOYALID-2416'},
+                     '7': {'OL756EL65HDYALID-4834'},
+                     '19': {'AD029EL42BKVALID-957'},
+                     '23': {'SA848EL83DOYALID-2416'},
+                     '25': {'LE627EL19DFWALID-2180'}}
+        self.assertDictEqual(data.test.data, should_be)
+
+    def test_rolling_train_same_as_transactions_before_cutoff(self):
+        data = TrainTest.from_csv('./bestPy/tests/data/data50.csv')
+        cutoffs = [dt.datetime(2012, 3, 9), dt.datetime(2012, 3, 12)]
+        for cutoff in data.rolling(cutoffs, dt.timedelta(days=1)):
+            pass
+        moment = (cutoff - dt.datetime(1970, 1, 1)) // dt.timedelta(
+            microseconds=1)
+        before = data.history.times < moment
+        users = data.user.ids_of(data.history.users[before])
+        items = data.item.ids_of(data.history.items[before])
+        for user, item in zip(users, items):
+            user_index = data.train.user.index_of[user]
+            item_index = data.train.item.index_of[item]
+            self.assertGreater(
+                data.train.matrix.by_row[user_index, item_index], 0)
+        self.assertEqual(data.train.matrix.by_row.sum(), before.sum())
+
+    def test_rolling_only_new_ignores_articles_bought_before(self):
+        data = TrainTest.from_csv('./bestPy/tests/data/data50.csv')
+        cutoffs = [dt.datetime(2012, 3, 12, 9, 33, 2)]
+        horizon = dt.timedelta(days=1)
+        _ = next(data.rolling(cutoffs, horizon, only_new=True))
+        self.assertNotIn('23', data.test.data)
+        self.assertTrue(data.test.only_new)
+        _ = next(data.rolling(cutoffs, horizon, only_new=False))
+        self.assertSetEqual(data.test.data['23'], {'SA848EL83DOYALID-2416'})
+        self.assertFalse(data.test.only_new)
+
+    def test_rolling_horizon_not_timedelta(self):
+        log_msg = ['ERROR:root:Attempt to set "horizon" to non-timedelta'
+                   ' type.']
+        err_msg = ('Parameter "horizon" must be a positive'
+                   ' <datetime.timedelta>!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = next(self.data.rolling([dt.datetime(2012, 3, 9)], 1))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_rolling_horizon_not_positive(self):
+        log_msg = ['ERROR:root:Attempt to set "horizon" to zero or less.']
+        err_msg = ('Parameter "horizon" must be a positive'
+                   ' <datetime.timedelta>!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = next(self.data.rolling([dt.datetime(2012, 3, 9)],
+                                           dt.timedelta(0)))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_rolling_cutoffs_not_datetimes(self):
+        log_msg = ['ERROR:root:Attempt to set "cutoffs" to other than a'
+                   ' non-empty list or tuple of datetimes.']
+        err_msg = ('Parameter "cutoffs" must be a non-empty list or tuple'
+                   ' of increasing <datetime.datetime>!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = next(self.data.rolling([dt.date(2012, 3, 9)],
+                                           dt.timedelta(days=1)))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_rolling_cutoffs_empty(self):
+        with self.assertLogs(level=logging.ERROR):
+            with self.assertRaises(TypeError):
+                _ = next(self.data.rolling([], dt.timedelta(days=1)))
+
+    def test_rolling_cutoffs_not_increasing(self):
+        log_msg = ['ERROR:root:Attempt to set "cutoffs" to datetimes not in'
+                   ' increasing order.']
+        err_msg = ('Parameter "cutoffs" must be a non-empty list or tuple'
+                   ' of increasing <datetime.datetime>!')
+        cutoffs = (dt.datetime(2012, 3, 9), dt.datetime(2012, 3, 8))
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = next(self.data.rolling(cutoffs, dt.timedelta(days=1)))
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_train_with_separator_in_ids(self):
+        history = (np.array([1331076395000000, 1331076600000000]),
+                   np.array([0, 0]),
+                   np.array([0, 1]))
+        data = TrainTest(2, 0, {'u;1': 0}, {'i;1': 0, 'i;2': 1}, history)
+        data.split(1)
+        self.assertDictEqual(data.train.user.index_of, {'u;1': 0})
+        self.assertDictEqual(data.train.item.index_of, {'i;1': 0})
+
 
 if __name__ == '__main__':
     ut.main()
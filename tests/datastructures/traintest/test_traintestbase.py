@@ -3,6 +3,9 @@
 
 import unittest as ut
 import logging
+import numpy as np
+from os import path
+from tempfile import TemporaryDirectory
 from ....datastructures.traintest.traintestbase import TrainTestBase
 
 
@@ -14,7 +17,7 @@ class TestInstantiateTrainTestBase(ut.TestCase):
         err_msg = 'Number of transactions not a positive integer!'
         with self.assertLogs(level=logging.ERROR) as log:
             with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase('foo', 2, {}, [])
+                _ = TrainTestBase('foo', 2, {}, {}, ())
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
@@ -24,7 +27,7 @@ class TestInstantiateTrainTestBase(ut.TestCase):
         err_msg = 'Number of transactions not a positive integer!'
         with self.assertLogs(level=logging.ERROR) as log:
             with self.assertRaises(ValueError, msg=err_msg) as err:
-                _ = TrainTestBase(0, 2, {}, [])
+                _ = TrainTestBase(0, 2, {}, {}, ())
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
@@ -34,7 +37,7 @@ class TestInstantiateTrainTestBase(ut.TestCase):
         err_msg = 'Number of corrupted records not an integer >= 0!'
         with self.assertLogs(level=logging.ERROR) as log:
             with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 'bar', {}, [])
+                _ = TrainTestBase(2, 'bar', {}, {}, ())
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
@@ -44,107 +47,72 @@ class TestInstantiateTrainTestBase(ut.TestCase):
         err_msg = 'Number of corrupted records not an integer >= 0!'
         with self.assertLogs(level=logging.ERROR) as log:
             with self.assertRaises(ValueError, msg=err_msg) as err:
-                _ = TrainTestBase(2, -1, {}, [])
+                _ = TrainTestBase(2, -1, {}, {}, ())
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
-    def test_error_on_last_unique_items_not_dictionary(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with last'
-                   ' unique buys not of required type <dict>.']
-        err_msg = 'Last unique items bought must be of type <dict>!'
-        with self.assertLogs(level=logging.ERROR) as log:
-            with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, 'baz', [])
-        self.assertEqual(log.output, log_msg)
-        self.assertEqual(err.msg, err_msg)
-
-    def test_error_on_last_unique_items_empty_dictionary(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with empty'
-                   ' <dict> of last unique items bought.']
-        err_msg = 'Last unique items dictionary must not be empty!'
-        with self.assertLogs(level=logging.ERROR) as log:
-            with self.assertRaises(ValueError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {}, [])
-        self.assertEqual(log.output, log_msg)
-        self.assertEqual(err.msg, err_msg)
-
-    def test_error_on_last_unique_items_entry_not_dictionary(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with values'
-                   ' in last unique item dictionary not of type <dict>.']
-        err_msg = 'Last unique item values must be of type <dict>!'
+    def test_error_on_history_not_a_tuple(self):
+        log_msg = ['ERROR:root:Attempt to instantiate data object with'
+                   ' history not a 3-tuple of arrays.']
+        err_msg = 'History must be a 3-tuple of arrays!'
         with self.assertLogs(level=logging.ERROR) as log:
             with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {1: 12.3}, [])
-        self.assertEqual(log.output, log_msg)
-        self.assertEqual(err.msg, err_msg)
-
-    def test_error_on_last_unique_items_entry_empty_dictionary(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with empty'
-                   ' <dict> as entry of last unique items dictionary.']
-        err_msg = 'Entries of last unique items must not be empty!'
-        with self.assertLogs(level=logging.ERROR) as log:
-            with self.assertRaises(ValueError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {1: {}}, [])
+                _ = TrainTestBase(2, 1, {'u': 0}, {'i': 0}, 'baz')
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
-    def test_error_on_transactions_not_a_list(self):
+    def test_error_on_history_tuple_too_short(self):
         log_msg = ['ERROR:root:Attempt to instantiate data object with'
-                  ' transactions not of required type <list>.']
-        err_msg = 'Transactions must be of type <list>!'
+                   ' history not a 3-tuple of arrays.']
+        err_msg = 'History must be a 3-tuple of arrays!'
         with self.assertLogs(level=logging.ERROR) as log:
             with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {1: {1: 23}}, 12)
-        self.assertEqual(log.output, log_msg)
-        self.assertEqual(err.msg, err_msg)
-
-    def test_error_on_transactions_empty_list(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with empty'
-                  ' transaction list.']
-        err_msg = 'Transaction list must not be empty!'
-        with self.assertLogs(level=logging.ERROR) as log:
-            with self.assertRaises(ValueError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {1: {1: 23}}, [])
+                _ = TrainTestBase(2, 1, {'u': 0}, {'i': 0},
+                                  (np.array([1, 2]), np.array([0, 0])))
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
-    def test_error_on_transaction_not_a_tuple(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with'
-                   ' transactions not 3-tuples of strings.']
-        err_msg = 'Transactions must be 3-tuples of strings!'
+    def test_error_on_history_columns_not_arrays(self):
+        log_msg = ['ERROR:root:Attempt to instantiate history object with'
+                   ' times not a 1-D array of integers.']
+        err_msg = 'Columns of history object must be 1-D arrays of integers!'
         with self.assertLogs(level=logging.ERROR) as log:
             with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {1: {1: 23}}, [2, 3])
+                _ = TrainTestBase(2, 1, {'u': 0}, {'i': 0},
+                                  ([1, 2], np.array([0, 0]), np.array([0, 0])))
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
-    def test_error_on_transaction_tuple_too_long(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with'
-                   ' transactions not 3-tuples of strings.']
-        err_msg = 'Transactions must be 3-tuples of strings!'
+    def test_error_on_number_of_transactions_incompatible_with_history(self):
+        log_msg = ['ERROR:root:Attempt to instantiate data object with number'
+                   ' of transactions incompatible with history.']
+        err_msg = 'Number of transactions incompatible with history!'
+        history = (np.array([1, 2]), np.array([0, 0]), np.array([0, 0]))
         with self.assertLogs(level=logging.ERROR) as log:
-            with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {1: {1: 23}}, [(1, 2, 2, 4)])
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = TrainTestBase(3, 1, {'u': 0}, {'i': 0}, history)
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
-    def test_error_on_transaction_tuple_too_short(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with'
-                   ' transactions not 3-tuples of strings.']
-        err_msg = 'Transactions must be 3-tuples of strings!'
+    def test_error_on_user_index_out_of_range_of_history(self):
+        log_msg = ['ERROR:root:Attempt to instantiate data object with number'
+                   ' of customers/articles incompatible with history.']
+        err_msg = 'Number of users/items incompatible with history!'
+        history = (np.array([1, 2]), np.array([0, 1]), np.array([0, 0]))
         with self.assertLogs(level=logging.ERROR) as log:
-            with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {1: {1: 23}}, [(1, 2)])
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = TrainTestBase(2, 1, {'u': 0}, {'i': 0}, history)
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
-    def test_error_on_transaction_tuple_not_strings(self):
-        log_msg = ['ERROR:root:Attempt to instantiate data object with'
-                   ' transactions not 3-tuples of strings.']
-        err_msg = 'Transactions must be 3-tuples of strings!'
+    def test_error_on_item_index_out_of_range_of_history(self):
+        log_msg = ['ERROR:root:Attempt to instantiate data object with number'
+                   ' of customers/articles incompatible with history.']
+        err_msg = 'Number of users/items incompatible with history!'
+        history = (np.array([1, 2]), np.array([0, 0]), np.array([0, 1]))
         with self.assertLogs(level=logging.ERROR) as log:
-            with self.assertRaises(TypeError, msg=err_msg) as err:
-                _ = TrainTestBase(2, 1, {1: {1: 23}}, [(1, 2, 3)])
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = TrainTestBase(2, 1, {'u': 0}, {'i': 0}, history)
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
@@ -184,6 +152,50 @@ class TestTrainTestBase(ut.TestCase):
             self.data.max_hold_out = 789
         self.assertEqual(self.data.max_hold_out, 2)
 
+    def test_history_columns_are_integer_arrays(self):
+        for column in (self.data.history.times,
+                       self.data.history.users,
+                       self.data.history.items):
+            self.assertEqual(column.dtype, np.int64)
+            self.assertEqual(column.size, 21)
+
+    def test_history_indices_within_user_and_item_count(self):
+        self.assertEqual(self.data.history.users.max() + 1,
+                         self.data.user.count)
+        self.assertEqual(self.data.history.items.max() + 1,
+                         self.data.item.count)
+
+
+class TestTrainTestBaseFromPartitions(TestTrainTestBase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data25timestamp_fmt.csv'
+        fmt = '%Y-%m-%d %H:%M:%S'
+        self.directory = TemporaryDirectory()
+        with open(file) as stream:
+            lines = stream.readlines()
+        self.files = [path.join(self.directory.name, name)
+                      for name in ('2012-03-06.csv', '2012-03-09.csv')]
+        for name, bounds in zip(self.files, ((0, 12), (12, None))):
+            with open(name, 'w') as partition:
+                partition.writelines(lines[slice(*bounds)])
+        with self.assertLogs(level=logging.WARNING):
+            self.data = TrainTestBase.from_csv(self.files, ';', fmt)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_counters_of_partitions(self):
+        should_be = {self.files[0]: {'number_of_transactions': 9,
+                                     'number_of_corrupted_records': 3},
+                     self.files[1]: {'number_of_transactions': 12,
+                                     'number_of_corrupted_records': 1}}
+        self.assertDictEqual(self.data.partitions, should_be)
+
+    def test_cannot_set_partitions(self):
+        with self.assertRaises(AttributeError):
+            self.data.partitions = {}
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+import gzip
+from io import StringIO
+from os import path
+from tempfile import TemporaryDirectory
+from .....datastructures import Transactions
+from .....datastructures.transactions.read import from_counts, from_csv
+
+
+def as_dict(counts):
+    rows, cols, values = counts
+    return dict(zip(zip(rows.tolist(), cols.tolist()), values.tolist()))
+
+
+class BaseTests():
+
+    def test_logs_warnings_on_corrupted_records(self):
+        log_msg = ['WARNING:root:Could not interpret transaction on'
+                   ' line 2. Skipping.',
+                   'WARNING:root:Transaction on line 3 contains'
+                   ' empty fields. Skipping.',
+                   'WARNING:root:Could not interpret transaction on'
+                   ' line 8. Skipping.',
+                   'WARNING:root:Could not interpret transaction on'
+                   ' line 11. Skipping.',
+                   'WARNING:root:Could not interpret transaction on'
+                   ' line 12. Skipping.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            _ = from_counts(self.file, self.separator, self.workers)
+        self.assertListEqual(log.output, log_msg)
+
+    def test_number_of_transactions_is_sum_of_counts(self):
+        with self.assertLogs(level=logging.WARNING):
+            n_rec, _, _, _, _ = from_counts(self.file, self.separator,
+                                            self.workers)
+        self.assertIsInstance(n_rec, int)
+        self.assertEqual(n_rec, 21)
+
+    def test_correct_value_of_number_of_corrupted_records(self):
+        with self.assertLogs(level=logging.WARNING):
+            _, n_err, _, _, _ = from_counts(self.file, self.separator,
+                                            self.workers)
+        self.assertIsInstance(n_err, int)
+        self.assertEqual(n_err, 5)
+
+    def test_same_indices_and_counts_as_raw_transactions(self):
+        with self.assertLogs(level=logging.WARNING):
+            should_be = from_csv('./bestPy/tests/data/data25semicolon.csv')
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_counts(self.file, self.separator, self.workers)
+        self.assertDictEqual(actually_is[2], should_be[2])
+        self.assertDictEqual(actually_is[3], should_be[3])
+        self.assertDictEqual(as_dict(actually_is[4]), as_dict(should_be[4]))
+
+
+class TestTransactionsFromCountsFile(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.file = './bestPy/tests/data/data25counts.csv'
+        self.separator = ';'
+        self.workers = 1
+
+
+class TestTransactionsFromCountsInShards(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.file = './bestPy/tests/data/data25counts.csv'
+        self.separator = ';'
+        self.workers = 3
+
+
+class TestTransactionsFromCountsStream(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.file = open('./bestPy/tests/data/data25counts.csv')
+        self.separator = ';'
+        self.workers = 1
+
+
+class TestTransactionsFromCountsGzipFile(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'data25counts.csv.gz')
+        with open('./bestPy/tests/data/data25counts.csv', 'rb') as file:
+            with gzip.open(self.file, 'wb') as compressed:
+                compressed.write(file.read().replace(b';', b','))
+        self.separator = ','
+        self.workers = 1
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class TestTransactionsFromLargeCounts(ut.TestCase):
+
+    def setUp(self):
+        self.file = StringIO('1;a;2147483647\n2;b;1\n1;a;2147483647\n')
+
+    def test_summed_counts_beyond_32_bits(self):
+        n_rec, _, _, _, counts = from_counts(self.file)
+        self.assertEqual(n_rec, 2**32 - 1)
+        self.assertDictEqual(as_dict(counts), {(0, 0): 2**32 - 2,
+                                               (1, 1): 1})
+
+    def test_transactions_from_summed_counts_beyond_32_bits(self):
+        data = Transactions.from_counts(self.file)
+        self.assertEqual(data.number_of_transactions, 2**32 - 1)
+        self.assertEqual(data.matrix.by_col[0, 0], 2**32 - 2)
+
+
+class TestTransactionsFromCountsBeyond32Bits(ut.TestCase):
+
+    def test_largest_64_bit_count(self):
+        file = StringIO('1;a;9223372036854775807\n')
+        n_rec, n_err, _, _, counts = from_counts(file)
+        self.assertEqual(n_rec, 2**63 - 1)
+        self.assertEqual(n_err, 0)
+        self.assertDictEqual(as_dict(counts), {(0, 0): 2**63 - 1})
+
+    def test_counts_beyond_64_bits_are_corrupted(self):
+        file = StringIO('1;a;9223372036854775808\n2;b;99999999999999999999\n'
+                        '3;c;18446744073709551617\n4;d;1\n')
+        with self.assertLogs(level=logging.WARNING) as log:
+            n_rec, n_err, _, _, counts = from_counts(file)
+        self.assertEqual(len(log.output), 3)
+        self.assertEqual(n_rec, 1)
+        self.assertEqual(n_err, 3)
+        self.assertDictEqual(as_dict(counts), {(0, 0): 1})
+
+
+class TestTransactionsFromCountsArguments(ut.TestCase):
+
+    def test_error_on_wrong_type_of_separator(self):
+        log_msg = ['ERROR:root:Attempt to set separator argument to'
+                   ' non-string type.']
+        err_msg = 'Separator argument must be a string!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = from_counts('file', 1)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_non_positive_workers(self):
+        log_msg = ['ERROR:root:Attempt to set number of workers to'
+                   ' less than one.']
+        err_msg = 'Number of workers must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = from_counts('file', workers=0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+if __name__ == '__main__':
+    ut.main()
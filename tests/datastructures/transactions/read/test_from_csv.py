@@ -3,7 +3,26 @@
 
 import unittest as ut
 import logging
+import sys
+import gzip
+import numpy as np
+from io import StringIO
+from os import path
+from tempfile import TemporaryDirectory
+from .....datastructures import TrainTest
 from .....datastructures.transactions.read import from_csv
+from .....datastructures.transactions.read import from_csv_partitions
+
+reader = sys.modules[from_csv.__module__]
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def as_dict(counts):
+    rows, cols, values = counts
+    return dict(zip(zip(rows.tolist(), cols.tolist()), values.tolist()))
 
 
 class BaseTests():
@@ -70,10 +89,22 @@ class BaseTests():
             _, _, _, item_j, _ = from_csv(self.file, self.separator)
         self.assertDictEqual(should_be, item_j)
 
-    def test_dict_type_of_user_item_counts(self):
+    def test_integer_arrays_of_user_item_counts(self):
         with self.assertLogs(level=logging.WARNING):
             _, _, _, _, counts = from_csv(self.file, self.separator)
-        self.assertIsInstance(counts, dict)
+        self.assertIsInstance(counts, tuple)
+        self.assertEqual(len(counts), 3)
+        for array in counts:
+            self.assertIsInstance(array, np.ndarray)
+        self.assertEqual(counts[0].dtype, np.int32)
+        self.assertEqual(counts[1].dtype, np.int32)
+        self.assertEqual(counts[2].dtype, np.int64)
+
+    def test_user_item_counts_ordered_by_column_first(self):
+        with self.assertLogs(level=logging.WARNING):
+            _, _, _, _, (rows, cols, _) = from_csv(self.file, self.separator)
+        pairs = list(zip(cols.tolist(), rows.tolist()))
+        self.assertListEqual(pairs, sorted(pairs))
 
     def test_correct_value_of_user_item_counts(self):
         should_be = {(0, 0): 1,
@@ -84,7 +115,7 @@ class BaseTests():
                      (3, 5): 8}
         with self.assertLogs(level=logging.WARNING):
             _, _, _, _, counts = from_csv(self.file, self.separator)
-        self.assertDictEqual(should_be, counts)
+        self.assertDictEqual(should_be, as_dict(counts))
 
 
 class TestTransactionsFromCsvSemicolonFile(ut.TestCase, BaseTests):
@@ -111,6 +142,258 @@ class TestTransactionsFromCsvCommaStream(ut.TestCase, BaseTests):
         self.separator = ','
 
 
+class TestTransactionsFromCsvSmallBlocksFile(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.file = './bestPy/tests/data/data25semicolon.csv'
+        self.separator = ';'
+        self.block_size = reader.BLOCK_SIZE
+        reader.BLOCK_SIZE = 50
+
+    def tearDown(self):
+        reader.BLOCK_SIZE = self.block_size
+
+
+class TestTransactionsFromCsvSmallBlocksStream(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.file = open('./bestPy/tests/data/data25comma.csv')
+        self.separator = ','
+        self.lines_per_block = reader.LINES_PER_BLOCK
+        reader.LINES_PER_BLOCK = 3
+
+    def tearDown(self):
+        reader.LINES_PER_BLOCK = self.lines_per_block
+
+
+class TestTransactionsFromCsvMultiCharacterSeparator(ut.TestCase, BaseTests):
+    def setUp(self):
+        with open('./bestPy/tests/data/data25semicolon.csv') as file:
+            self.file = StringIO(file.read().replace(';', '<>'))
+        self.separator = '<>'
+
+
+class TestTransactionsFromCsvGzipFile(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'data25semicolon.csv.gz')
+        with open('./bestPy/tests/data/data25semicolon.csv', 'rb') as file:
+            with gzip.open(self.file, 'wb') as compressed:
+                compressed.write(file.read())
+        self.separator = ';'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class TestTransactionsFromCsvGzipSmallBlocks(TestTransactionsFromCsvGzipFile):
+    def setUp(self):
+        super().setUp()
+        self.block_size = reader.BLOCK_SIZE
+        reader.BLOCK_SIZE = 50
+
+    def tearDown(self):
+        reader.BLOCK_SIZE = self.block_size
+        super().tearDown()
+
+    def test_warns_and_reads_with_single_process(self):
+        log_msg = ['WARNING:root:Compressed files cannot be split into'
+                   ' shards. Reading with a single process.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            _, n_err, _, _, _ = from_csv(self.file, workers=3)
+        self.assertEqual(log.output[0], log_msg[0])
+        self.assertEqual(n_err, 5)
+
+
+@ut.skipIf(zstandard is None, 'zstandard package not installed')
+class TestTransactionsFromCsvZstandardFile(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'data25comma.csv.zst')
+        with open('./bestPy/tests/data/data25comma.csv', 'rb') as file:
+            with zstandard.open(self.file, 'wb') as compressed:
+                compressed.write(file.read())
+        self.separator = ','
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class TestTransactionsFromCsvCarriageReturnFile(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'data25return.csv')
+        with open('./bestPy/tests/data/data25semicolon.csv', 'rb') as file:
+            content = file.read()
+        with open(self.file, 'wb') as file:
+            file.write(content.replace(b'\n', b'\r'))
+        self.separator = ';'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_same_ids_as_traintest_reader(self):
+        with self.assertLogs(level=logging.WARNING):
+            _, _, user_i, item_j, _ = from_csv(self.file, self.separator)
+        with self.assertLogs(level=logging.WARNING):
+            data = TrainTest.from_csv(self.file, self.separator)
+        self.assertSetEqual(set(user_i), set(data.user.index_of))
+        self.assertSetEqual(set(item_j), set(data.item.index_of))
+
+
+class TestTransactionsFromCsvWindowsLineEndings(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'data25windows.csv.gz')
+        with open('./bestPy/tests/data/data25semicolon.csv', 'rb') as file:
+            content = file.read()
+        with gzip.open(self.file, 'wb') as file:
+            file.write(content.replace(b'\n', b'\r\n'))
+        self.separator = ';'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class TestTransactionsFromCsvUnicodeWhitespace(ut.TestCase, BaseTests):
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'data25blanks.csv')
+        with open('./bestPy/tests/data/data25semicolon.csv') as file:
+            lines = file.read().splitlines()
+        blanks = ['\xa0', '\u3000', ' \u2009\t', '\x85', '\x1c']
+        with open(self.file, 'w', encoding='utf-8') as file:
+            file.writelines(line + blanks[number % len(blanks)] + '\n'
+                            for number, line in enumerate(lines))
+        self.separator = ';'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class TestTransactionsFromCsvInShards(ut.TestCase):
+
+    def setUp(self):
+        self.file = './bestPy/tests/data/data25semicolon.csv'
+        with self.assertLogs(level=logging.WARNING) as log:
+            self.should_be = from_csv(self.file)
+        self.log_msg = log.output
+
+    def assertReadEqual(self, actually_is, should_be):
+        self.assertTupleEqual(actually_is[:4], should_be[:4])
+        for actual, expected in zip(actually_is[4], should_be[4]):
+            self.assertListEqual(actual.tolist(), expected.tolist())
+
+    def test_same_result_as_single_process(self):
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_csv(self.file, workers=3)
+        self.assertReadEqual(actually_is, self.should_be)
+
+    def test_same_index_order_as_single_process(self):
+        with self.assertLogs(level=logging.WARNING):
+            _, _, user_i, item_j, _ = from_csv(self.file, workers=4)
+        self.assertListEqual(list(user_i), list(self.should_be[2]))
+        self.assertListEqual(list(item_j), list(self.should_be[3]))
+
+    def test_same_warnings_as_single_process(self):
+        with self.assertLogs(level=logging.WARNING) as log:
+            _ = from_csv(self.file, workers=3)
+        self.assertListEqual(log.output, self.log_msg)
+
+    def test_more_workers_than_lines(self):
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_csv(self.file, workers=40)
+        self.assertReadEqual(actually_is, self.should_be)
+
+    def test_warns_and_reads_stream_with_single_process(self):
+        log_msg = ['WARNING:root:Only files given by name can be split into'
+                   ' shards. Reading with a single process.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            actually_is = from_csv(open(self.file), workers=3)
+        self.assertListEqual(log.output, log_msg + self.log_msg)
+        self.assertReadEqual(actually_is, self.should_be)
+
+
+class TestTransactionsFromCsvPartitions(ut.TestCase):
+
+    def setUp(self):
+        self.file = './bestPy/tests/data/data25semicolon.csv'
+        with self.assertLogs(level=logging.WARNING):
+            self.should_be = from_csv(self.file)
+        self.directory = TemporaryDirectory()
+        self.files = [path.join(self.directory.name, name)
+                      for name in ('part1.csv', 'part2.csv.gz')]
+        with open(self.file, 'rb') as file:
+            lines = file.readlines()
+        with open(self.files[0], 'wb') as part:
+            part.writelines(lines[:10])
+        with gzip.open(self.files[1], 'wb') as part:
+            part.writelines(lines[10:])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertReadEqual(self, actually_is, should_be):
+        self.assertTupleEqual(actually_is[:4], should_be[:4])
+        for actual, expected in zip(actually_is[4], should_be[4]):
+            self.assertListEqual(actual.tolist(), expected.tolist())
+
+    def test_same_result_as_single_file(self):
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_csv_partitions(self.files)[:5]
+        self.assertReadEqual(actually_is, self.should_be)
+
+    def test_same_result_with_several_processes(self):
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_csv_partitions(self.files, workers=2)[:5]
+        self.assertReadEqual(actually_is, self.should_be)
+
+    def test_counters_of_partitions(self):
+        should_be = {self.files[0]: {'number_of_transactions': 6,
+                                     'number_of_corrupted_records': 4},
+                     self.files[1]: {'number_of_transactions': 15,
+                                     'number_of_corrupted_records': 1}}
+        with self.assertLogs(level=logging.WARNING):
+            *_, partitions = from_csv_partitions(self.files)
+        self.assertDictEqual(partitions, should_be)
+
+    def test_warnings_refer_to_lines_in_files(self):
+        log_msg = ['WARNING:root:' + self.files[0] + ': Could not interpret'
+                   ' transaction on line 2. Skipping.',
+                   'WARNING:root:' + self.files[0] + ': Transaction on'
+                   ' line 3 contains empty fields. Skipping.',
+                   'WARNING:root:' + self.files[0] + ': Transaction on'
+                   ' line 4 contains empty fields. Skipping.',
+                   'WARNING:root:' + self.files[0] + ': Could not interpret'
+                   ' transaction on line 8. Skipping.',
+                   'WARNING:root:' + self.files[1] + ': Could not interpret'
+                   ' transaction on line 16. Skipping.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            _ = from_csv_partitions(self.files, workers=2)
+        self.assertListEqual(log.output, log_msg)
+
+
+class TestTransactionsFromCsvWorkers(ut.TestCase):
+
+    def test_error_on_wrong_type_of_workers(self):
+        log_msg = ['ERROR:root:Attempt to set number of workers to'
+                   ' non-integer type.']
+        err_msg = 'Number of workers must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = from_csv('file', workers=2.0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_non_positive_workers(self):
+        log_msg = ['ERROR:root:Attempt to set number of workers to'
+                   ' less than one.']
+        err_msg = 'Number of workers must be a positive integer!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = from_csv('file', workers=0)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
 class TestTrainTestFromCsvFileSeparator(ut.TestCase):
 
     def test_wrong_type_of_separator(self):
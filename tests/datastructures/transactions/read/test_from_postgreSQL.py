@@ -3,9 +3,16 @@
 
 import unittest as ut
 import logging
+import re
+import numpy as np
+from collections import namedtuple
 from psycopg2 import connect, OperationalError, ProgrammingError
+from psycopg2.extensions import string_types
 from .....datastructures import PostgreSQLparams
 from .....datastructures.transactions.read import from_postgreSQL
+from .....datastructures.transactions.read.from_csv import merged
+from .....datastructures.transactions.read.from_postgreSQL import copied
+from .....datastructures.transactions.read.from_postgreSQL import fetched
 
 def database():
     database = PostgreSQLparams()
@@ -20,6 +27,13 @@ def database():
     database.limit = 'all'
     return database
 
+def by_id(user_i, item_j, counts):
+    user_of = {index: user for user, index in user_i.items()}
+    item_of = {index: item for item, index in item_j.items()}
+    rows, cols, values = counts
+    return {(user_of[row], item_of[col]): value for row, col, value
+            in zip(rows.tolist(), cols.tolist(), values.tolist())}
+
 def no_connection_to(database):
     try:
         connection = connect(database.login)
@@ -27,6 +41,103 @@ def no_connection_to(database):
         return True
     return False
 
+Column = namedtuple('Column', ['name', 'type_code'])
+
+def quoted(value):
+    text = str(value)
+    return text == '' or any(char in text for char in '\x1e\x1f\n\r')
+
+
+def special(record):
+    *identifiers, count = record
+    return (any(value is not None and
+                (quoted(value) or
+                 re.fullmatch('[-+]?[0.]+|false', str(value)) is not None)
+                for value in identifiers) or
+            (count is not None and
+             re.fullmatch('[1-9][0-9]*', str(count)) is None))
+
+
+class StandInCursor():
+    """Serves aggregated records the way PostgreSQL would, without a server.
+
+    Records are numbered by their position in the temporary export table.
+    They are exported as CSV, with PostgreSQL's quoting rules, and the
+    special ones that COPY would not give back as a cursor does can be
+    fetched separately, with their position.
+
+    """
+
+    description = (Column('userid', 23), Column('articleid', 25),
+                   Column('count', 20))
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def mogrify(self, statement, params=None):
+        return statement.encode()
+
+    def execute(self, statement):
+        self.connection.statements.append(statement)
+        records = self.connection.records
+        if statement.startswith('CREATE TEMPORARY TABLE'):
+            self.rows = []
+        elif statement.startswith('SELECT position'):
+            self.description = ((Column('position', 20),) +
+                                StandInCursor.description)
+            self.rows = [(position, *record) for position, record
+                         in enumerate(records, 1) if special(record)]
+        else:
+            self.rows = list(records)
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def copy_expert(self, statement, file):
+        self.connection.statements.append(statement)
+        lower, upper = map(int, re.search(r'position > (\d+) AND'
+                                          r' position < (\d+)',
+                                          statement).groups())
+        for position, record in enumerate(self.connection.records, 1):
+            if not lower < position < upper:
+                continue
+            fields = ['' if value is None else
+                      '\x1e' + str(value).replace('\x1e', '\x1e\x1e') +
+                      '\x1e' if quoted(value) else str(value)
+                      for value in record]
+            file.write(('\x1f'.join(fields) + '\n').encode())
+
+    def cast(self, type_code, text):
+        return string_types[type_code](text, self)
+
+    def close(self):
+        pass
+
+
+class StandInConnection():
+
+    def __init__(self, records):
+        self.records = records
+        self.statements = []
+
+    def cursor(self, name=None):
+        return StandInCursor(self)
+
+    def close(self):
+        pass
+
 
 class TestReadFromPostgreSQL(ut.TestCase):
 
@@ -249,7 +360,13 @@ class TestReadFromPostgreSQL(ut.TestCase):
     def test_type_of_user_item_counts(self):
         with self.assertLogs(level=logging.WARNING):
             _, _, _, _, counts = from_postgreSQL(database())
-        self.assertIsInstance(counts, dict)
+        self.assertIsInstance(counts, tuple)
+        self.assertEqual(len(counts), 3)
+        for array in counts:
+            self.assertIsInstance(array, np.ndarray)
+        self.assertEqual(counts[0].dtype, np.int32)
+        self.assertEqual(counts[1].dtype, np.int32)
+        self.assertEqual(counts[2].dtype, np.int64)
 
     @ut.skipIf(no_connection_to(database()),
               'Could not establish connection to test database.')
@@ -271,9 +388,234 @@ class TestReadFromPostgreSQL(ut.TestCase):
                      (11, 26): 1, (9, 33): 10, (4, 3): 1, (14, 8): 1,
                      (1, 20): 1, (4, 13): 1, (12, 2): 1, (23, 34): 1}
         with self.assertLogs(level=logging.WARNING):
-            _, _, _, _, counts = from_postgreSQL(database())
+            _, _, _, _, (rows, cols, values) = from_postgreSQL(database())
+        counts = dict(zip(zip(rows.tolist(), cols.tolist()), values.tolist()))
         self.assertDictEqual(counts, should_be)
 
+    @ut.skipIf(no_connection_to(database()),
+              'Could not establish connection to test database.')
+    def test_same_result_for_small_batches(self):
+        db = database()
+        db.batch_size = 7
+        with self.assertLogs(level=logging.WARNING):
+            should_be = from_postgreSQL(database())
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_postgreSQL(db)
+        self.assertTupleEqual(actually_is[:4], should_be[:4])
+        for actual, expected in zip(actually_is[4], should_be[4]):
+            self.assertListEqual(actual.tolist(), expected.tolist())
+
+    @ut.skipIf(no_connection_to(database()),
+              'Could not establish connection to test database.')
+    def test_same_result_for_repeated_reads_from_pool(self):
+        db = database()
+        db.pool_size = 1
+        with self.assertLogs(level=logging.WARNING):
+            should_be = from_postgreSQL(database())
+        for _ in range(3):
+            with self.assertLogs(level=logging.WARNING):
+                actually_is = from_postgreSQL(db)
+            self.assertTupleEqual(actually_is[:4], should_be[:4])
+            for actual, expected in zip(actually_is[4], should_be[4]):
+                self.assertListEqual(actual.tolist(), expected.tolist())
+        db.disconnect()
+
+    @ut.skipIf(no_connection_to(database()),
+              'Could not establish connection to test database.')
+    def test_same_result_in_bulk_mode(self):
+        db = database()
+        db.bulk = True
+        with self.assertLogs(level=logging.WARNING):
+            should_be = from_postgreSQL(database())
+        with self.assertLogs(level=logging.WARNING) as log:
+            actually_is = from_postgreSQL(db)
+        self.assertEqual(len(log.output), 4)
+        self.assertTupleEqual(actually_is[:2], should_be[:2])
+        self.assertDictEqual(by_id(*actually_is[2:]), by_id(*should_be[2:]))
+
+    @ut.skipIf(no_connection_to(database()),
+              'Could not establish connection to test database.')
+    def test_error_on_wrong_table_name_in_bulk_mode(self):
+        db = database()
+        db.table = 'wrong'
+        db.bulk = True
+        log_msg = ['ERROR:root:Failed to execute SQL query.'
+                   ' Check your parameters!']
+        err_msg = 'SQL query failed. Check your parameters!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ProgrammingError, msg=err_msg) as err:
+                _ = from_postgreSQL(db)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_warns_and_reads_with_single_connection_given_limit(self):
+        db = database()
+        db.login_host = 'wrong'
+        db.limit = 50
+        db.connections = 3
+        log_msg = ['WARNING:root:Only tables read without limit can be split'
+                   ' into partitions. Reading with a single connection.',
+                   "ERROR:root:Failed connecting to dbname='pythontest'"
+                   " @host='wrong'."]
+        with self.assertLogs(level=logging.WARNING) as log:
+            with self.assertRaises(OperationalError):
+                _ = from_postgreSQL(db)
+        self.assertListEqual(log.output, log_msg)
+
+    @ut.skipIf(no_connection_to(database()),
+              'Could not establish connection to test database.')
+    def test_same_result_over_several_connections(self):
+        with self.assertLogs(level=logging.WARNING):
+            should_be = from_postgreSQL(database())
+        for bulk in (False, True):
+            db = database()
+            db.bulk = bulk
+            db.connections = 3
+            with self.assertLogs(level=logging.WARNING) as log:
+                actually_is = from_postgreSQL(db)
+            self.assertEqual(len(log.output), 4)
+            self.assertTupleEqual(actually_is[:2], should_be[:2])
+            self.assertDictEqual(by_id(*actually_is[2:]),
+                                 by_id(*should_be[2:]))
+
+    def test_error_on_delta_without_watermark(self):
+        log_msg = ['ERROR:root:Attempt to read new transactions from database'
+                   ' without watermark from a previous read.']
+        err_msg = ('No watermark set. Read all transactions in'
+                   ' incremental mode first!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = from_postgreSQL(database(), delta=True)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    @ut.skipIf(no_connection_to(database()),
+              'Could not establish connection to test database.')
+    def test_incremental_read_sets_watermark(self):
+        db = database()
+        db.incremental = True
+        with self.assertLogs(level=logging.WARNING):
+            actually_is = from_postgreSQL(db)
+        with self.assertLogs(level=logging.WARNING):
+            should_be = from_postgreSQL(database())
+        self.assertIsNotNone(db.watermark)
+        self.assertTupleEqual(actually_is[:2], should_be[:2])
+
+    @ut.skipIf(no_connection_to(database()),
+              'Could not establish connection to test database.')
+    def test_delta_after_incremental_read_is_empty(self):
+        db = database()
+        db.incremental = True
+        with self.assertLogs(level=logging.WARNING):
+            _ = from_postgreSQL(db)
+        watermark = db.watermark
+        n_rec, n_err, user_i, item_j, _ = from_postgreSQL(db, delta=True)
+        self.assertTupleEqual((n_rec, n_err, user_i, item_j), (0, 0, {}, {}))
+        self.assertEqual(db.watermark, watermark)
+
+
+class TestReadFromStandInConnectionInBulkMode(ut.TestCase):
+
+    def setUp(self):
+        self.records = [(42, 'a', 3), (7, 'b', 1), (42, 'b', 2),
+                        (None, 'a', 1), (7, None, 2), (0, 'a', 1),
+                        (9, '', 1), (9, 'x\x1fy', 2), (9, 'new\nline', 1),
+                        (13, 'q\x1eq', 1), (13, 'a', 4), (8, 'c\rd', 5)]
+        self.connection = StandInConnection(self.records)
+
+    def test_same_result_as_fetched(self):
+        should_be = merged([fetched(self.connection, 'SELECT', 2)])
+        actually_is = merged(copied(self.connection, 'SELECT', 2))
+        self.assertTupleEqual(actually_is[:2], should_be[:2])
+        self.assertSetEqual(set(actually_is[2]), set(should_be[2]))
+        self.assertSetEqual(set(actually_is[3]), set(should_be[3]))
+        self.assertDictEqual(by_id(*actually_is[2:]), by_id(*should_be[2:]))
+
+    def test_same_index_order_as_fetched(self):
+        records = [(9, 'x\x1fy', 2), (5, 'b', 1), (0, 'c', 1), (6, 'c', 1),
+                   (5, '', 1), (8, 'd', 1), (8, 'new\nline', 1), (3, 'd', 1)]
+        connection = StandInConnection(records)
+        should_be = merged([fetched(connection, 'SELECT', 2)])
+        actually_is = merged(copied(connection, 'SELECT', 2))
+        self.assertListEqual(list(actually_is[2]), [9, 5, 6, 8, 3])
+        self.assertListEqual(list(actually_is[3]),
+                             ['x\x1fy', 'b', 'c', 'd', 'new\nline'])
+        self.assertListEqual(list(actually_is[2]), list(should_be[2]))
+        self.assertListEqual(list(actually_is[3]), list(should_be[3]))
+        for actual, should in zip(actually_is[4], should_be[4]):
+            self.assertListEqual(actual.tolist(), should.tolist())
+
+    def test_same_result_with_zero_ids_and_odd_counts(self):
+        records = [(0, 'a', 1), (7, 'b', -2), (7, 'a', 3), (4, 'false', 1),
+                   (4, '0.0', 2), (0, 'c', 0)]
+        connection = StandInConnection(records)
+        should_be = merged([fetched(connection, 'SELECT', 2)])
+        actually_is = merged(copied(connection, 'SELECT', 2))
+        self.assertTupleEqual(actually_is[:2], should_be[:2])
+        self.assertListEqual(list(actually_is[2]), list(should_be[2]))
+        self.assertListEqual(list(actually_is[3]), list(should_be[3]))
+        self.assertDictEqual(by_id(*actually_is[2:]), by_id(*should_be[2:]))
+
+    def test_segments_of_bulk_records_between_special_ones(self):
+        _ = copied(self.connection, 'SELECT', 2)
+        copies = [statement for statement in self.connection.statements
+                  if statement.startswith('COPY')]
+        self.assertEqual(len(copies), 3)
+
+    def test_many_special_records_fetched_through_cursor(self):
+        records = [(user, 'a' if user % 2 else '', 1)
+                   for user in range(1, 40)]
+        connection = StandInConnection(records)
+        should_be = merged([fetched(connection, 'SELECT', 2)])
+        actually_is = merged(copied(connection, 'SELECT', 2))
+        copies = [statement for statement in connection.statements
+                  if statement.startswith('COPY')]
+        self.assertListEqual(copies, [])
+        self.assertTupleEqual(actually_is[:2], should_be[:2])
+        self.assertListEqual(list(actually_is[2]), list(should_be[2]))
+
+    def test_same_64_bit_counts_as_fetched(self):
+        connection = StandInConnection([(1, 'a', 2**63 - 1), (2, 'b', 2**40)])
+        should_be = merged([fetched(connection, 'SELECT', 2)])
+        actually_is = merged(copied(connection, 'SELECT', 2))
+        self.assertEqual(actually_is[0], should_be[0])
+        self.assertDictEqual(by_id(*actually_is[2:]), by_id(*should_be[2:]))
+        self.assertEqual(by_id(*actually_is[2:])[(1, 'a')], 2**63 - 1)
+
+    def test_ids_keep_type_of_column(self):
+        _, _, user_i, item_j, _ = merged(copied(self.connection,
+                                                'SELECT', 2))
+        self.assertSetEqual(set(user_i), {42, 7, 9, 13, 8})
+        self.assertSetEqual(set(item_j), {'a', 'b', 'x\x1fy', 'new\nline',
+                                          'q\x1eq', 'c\rd'})
+
+    def test_numbers_of_transactions_and_corrupted_records(self):
+        n_trans, n_corr, _, _, _ = merged(copied(self.connection,
+                                                 'SELECT', 2))
+        self.assertEqual(n_trans, 19)
+        self.assertEqual(n_corr, 4)
+
+    def test_ids_with_delimiter_and_line_breaks(self):
+        _, _, user_i, item_j, counts = merged(copied(self.connection,
+                                                     'SELECT', 2))
+        counts = by_id(user_i, item_j, counts)
+        self.assertEqual(counts[(9, 'x\x1fy')], 2)
+        self.assertEqual(counts[(9, 'new\nline')], 1)
+        self.assertEqual(counts[(13, 'q\x1eq')], 1)
+        self.assertEqual(counts[(8, 'c\rd')], 5)
+
+    def test_same_result_in_bulk_mode(self):
+        db = database()
+        db._connect = lambda: self.connection
+        with self.assertLogs(level=logging.WARNING) as log:
+            should_be = from_postgreSQL(db)
+        db.bulk = True
+        with self.assertLogs(level=logging.WARNING) as bulk_log:
+            actually_is = from_postgreSQL(db)
+        self.assertEqual(len(bulk_log.output), len(log.output))
+        self.assertTupleEqual(actually_is[:2], should_be[:2])
+        self.assertDictEqual(by_id(*actually_is[2:]), by_id(*should_be[2:]))
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+import numpy as np
+from os import path
+from struct import pack
+from tempfile import TemporaryDirectory
+from scipy.sparse import csc_matrix, csr_matrix
+from .....datastructures.auxiliary import TableFrom
+from .....datastructures.transactions.read import from_snapshot
+from .....datastructures.transactions.write import to_snapshot
+from .....precision import set_precision_to
+
+
+class TestFromSnapshotErrors(ut.TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'test.snapshot')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_error_on_file_name_not_string(self):
+        log_msg = ['ERROR:root:Attempt to set snapshot file name to'
+                   ' non-string type.']
+        err_msg = 'Snapshot file must be given by name as a string!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = from_snapshot(1)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_mmap_not_boolean(self):
+        log_msg = ['ERROR:root:Attempt to set memory-mapping flag to'
+                   ' non-boolean type.']
+        err_msg = 'Memory-mapping flag must be either True or False!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                _ = from_snapshot(self.file, 'yes')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_file_too_short(self):
+        with open(self.file, 'wb') as stream:
+            stream.write(b'bestPy')
+        log_msg = ['ERROR:root:Attempt to load snapshot from file too short'
+                   ' to be one.']
+        err_msg = 'File is not a bestPy transactions snapshot!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = from_snapshot(self.file)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_csv_file(self):
+        file = './bestPy/tests/data/data25comma.csv'
+        log_msg = ['ERROR:root:Attempt to load snapshot from file with'
+                   ' unknown format.']
+        err_msg = 'File is not a bestPy transactions snapshot!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = from_snapshot(file)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_unsupported_version(self):
+        with open(self.file, 'wb') as stream:
+            stream.write(pack('<8sII', b'bestPyTx', 99, 0))
+        log_msg = ['ERROR:root:Attempt to load snapshot of unsupported'
+                   ' version 99.']
+        err_msg = 'Snapshot version must be 1!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                _ = from_snapshot(self.file)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+
+class TestFromSnapshot(ut.TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'test.snapshot')
+        self.matrix = csc_matrix(np.array([[1.0, 0.0, 2.0],
+                                           [0.0, 3.0, 0.0]]))
+        self.by_row = self.matrix.tocsr()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_counters(self):
+        to_snapshot(self.file, 6, 2, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        n_trans, n_corr, _, _, _, _ = from_snapshot(self.file)
+        self.assertEqual(n_trans, 6)
+        self.assertEqual(n_corr, 2)
+
+    def test_non_ascii_ids(self):
+        users = ['Jürgen', 'Zoë']
+        items = ['naïve', 'x', '日本']
+        to_snapshot(self.file, 6, 0, users, items, self.matrix, self.by_row)
+        _, _, user_i, item_j, _, _ = from_snapshot(self.file)
+        self.assertIsInstance(user_i, TableFrom)
+        self.assertDictEqual(dict(user_i.index_of), {'Jürgen': 0, 'Zoë': 1})
+        self.assertDictEqual(dict(item_j.index_of),
+                             {'naïve': 0, 'x': 1, '日本': 2})
+
+    def test_integer_ids(self):
+        to_snapshot(self.file, 6, 0, [7, 3], [11, 12, 10],
+                    self.matrix, self.by_row)
+        _, _, user_i, item_j, _, _ = from_snapshot(self.file)
+        self.assertDictEqual(user_i, {7: 0, 3: 1})
+        self.assertDictEqual(item_j, {11: 0, 12: 1, 10: 2})
+
+    def test_matrix(self):
+        to_snapshot(self.file, 6, 0, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        _, _, _, _, matrix, _ = from_snapshot(self.file)
+        self.assertIsInstance(matrix, csc_matrix)
+        self.assertListEqual(matrix.toarray().tolist(),
+                             self.matrix.toarray().tolist())
+
+    def test_matrix_in_row_format(self):
+        to_snapshot(self.file, 6, 0, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        *_, by_row = from_snapshot(self.file)
+        self.assertIsInstance(by_row, csr_matrix)
+        self.assertListEqual(by_row.toarray().tolist(),
+                             self.matrix.toarray().tolist())
+
+    def test_memory_mapped_arrays_are_read_only(self):
+        to_snapshot(self.file, 6, 0, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        *_, by_col, by_row = from_snapshot(self.file, mmap=True)
+        for matrix in (by_col, by_row):
+            for array in (matrix.data, matrix.indices, matrix.indptr):
+                self.assertFalse(array.flags.writeable)
+
+    def test_memory_mapped_matrix(self):
+        to_snapshot(self.file, 6, 0, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        *_, by_col, by_row = from_snapshot(self.file, mmap=True)
+        for matrix in (by_col, by_row):
+            self.assertListEqual(matrix.toarray().tolist(),
+                                 self.matrix.toarray().tolist())
+
+    def test_memory_mapped_counts_are_not_copied(self):
+        to_snapshot(self.file, 6, 0, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        *_, by_col, by_row = from_snapshot(self.file, mmap=True)
+        for matrix in (by_col, by_row):
+            self.assertFalse(matrix.data.flags.owndata)
+            self.assertFalse(matrix.data.flags.writeable)
+
+    def test_warning_on_memory_mapped_counts_of_other_precision(self):
+        to_snapshot(self.file, 6, 0, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        log_msg = ['WARNING:root:Counts in snapshot are of type float64'
+                   ' but precision is set to float32. They are therefore'
+                   ' copied into memory rather than memory-mapped.']
+        set_precision_to('single')
+        try:
+            with self.assertLogs(level=logging.WARNING) as log:
+                *_, by_col, by_row = from_snapshot(self.file, mmap=True)
+        finally:
+            set_precision_to('double')
+        self.assertEqual(log.output, log_msg)
+        for matrix in (by_col, by_row):
+            self.assertEqual(matrix.dtype, np.float32)
+            self.assertListEqual(matrix.toarray().tolist(),
+                                 self.matrix.toarray().tolist())
+
+    def test_memory_mapped_id_tables_are_read_only(self):
+        to_snapshot(self.file, 6, 0, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        _, _, user_i, item_j, _, _ = from_snapshot(self.file, mmap=True)
+        for table in (user_i, item_j):
+            for array in (table.buffer, table.offsets,
+                          table.hashes, table.order):
+                self.assertFalse(array.flags.writeable)
+
+    def test_arrays_aligned_to_64_bytes(self):
+        to_snapshot(self.file, 6, 0, ['a', 'b'], ['x', 'y', 'z'],
+                    self.matrix, self.by_row)
+        _, _, _, _, matrix, _ = from_snapshot(self.file)
+        with open(self.file, 'rb') as stream:
+            content = stream.read()
+        for array in (matrix.indptr, matrix.indices):
+            offset = content.find(array.tobytes())
+            self.assertEqual(offset % 64, 0)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -3,9 +3,13 @@
 
 import unittest as ut
 import logging
-from ....datastructures import Transactions
+import numpy as np
+from os import path
+from tempfile import TemporaryDirectory
+from ....datastructures import Transactions, PostgreSQLparams
 from ....datastructures.auxiliary import IndexFrom, MatrixFrom
 from ....datastructures.transactions.read import from_csv
+from ....precision import set_precision_to
 
 
 class TestInstantiateTransactions(ut.TestCase):
@@ -79,6 +83,17 @@ class TestInconsitentiesInTransactions(ut.TestCase):
         self.assertEqual(log.output, log_msg)
         self.assertEqual(err.msg, err_msg)
 
+    def test_repeated_pairs_consistent_with_number_of_pairs(self):
+        rows, cols, counts = self.count
+        repeated = (np.concatenate((rows, rows[:1])),
+                    np.concatenate((cols, cols[:1])),
+                    np.concatenate((counts, counts[:1])))
+        data = Transactions(self.nrec + int(counts[0]), self.nerr,
+                            self.user, self.item, repeated)
+        self.assertEqual(data.number_of_userItem_pairs, rows.size)
+        self.assertEqual(data.matrix.by_col[rows[0], cols[0]],
+                         2 * counts[0])
+
     def test_error_on_inconsistent_transaction_number_and_matrix_values(self):
         log_msg = ['ERROR:root:Attempt to instantiate data object with number'
                   ' of transactions incompatible with matrix values.']
@@ -94,6 +109,32 @@ class TestInconsitentiesInTransactions(ut.TestCase):
         self.assertEqual(err.msg, err_msg)
 
 
+class TestTransactionsInSinglePrecision(ut.TestCase):
+
+    def setUp(self):
+        set_precision_to('single')
+        self.rows = np.array([0, 0, 0], dtype=np.int32)
+        self.cols = np.array([0, 1, 2], dtype=np.int32)
+        self.counts = np.array([10000001] * 3, dtype=np.int64)
+        self.user = {'a': 0}
+        self.item = {'x': 0, 'y': 1, 'z': 2}
+
+    def tearDown(self):
+        set_precision_to('double')
+
+    def test_exact_total_beyond_single_precision(self):
+        data = Transactions(30000003, 0, self.user, self.item,
+                            (self.rows, self.cols, self.counts))
+        self.assertEqual(data.matrix.by_col.dtype, np.float32)
+        self.assertEqual(data.number_of_transactions, 30000003)
+
+    def test_error_on_total_off_by_one_beyond_single_precision(self):
+        with self.assertLogs(level=logging.ERROR):
+            with self.assertRaises(ValueError):
+                _ = Transactions(30000004, 0, self.user, self.item,
+                                 (self.rows, self.cols, self.counts))
+
+
 class TestTransactions(ut.TestCase):
 
     def setUp(self):
@@ -200,5 +241,231 @@ class TestTransactions(ut.TestCase):
         self.assertListEqual(should_be, actual)
 
 
+class TestTransactionsFromSnapshot(TestTransactions):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data25comma.csv'
+        with self.assertLogs(level=logging.WARNING):
+            original = Transactions.from_csv(file, ',')
+        self.directory = TemporaryDirectory()
+        snapshot = path.join(self.directory.name, 'data25comma.snapshot')
+        original.save(snapshot)
+        self.data = Transactions.load(snapshot)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_correct_value_of_user(self):
+        should_be = {'4': 0, '11': 1, '10': 2, '7': 3}
+        self.assertDictEqual(dict(self.data.user.index_of), should_be)
+
+    def test_correct_value_of_item(self):
+        should_be = {'AC016EL50CPHALID-1749': 0,
+                     'CA189EL29AGOALID-170' : 1,
+                     'LE629EL54ANHALID-345' : 2,
+                     'OL756EL65HDYALID-4834': 3,
+                     'OL756EL55HAMALID-4744': 4,
+                     'AC016EL56BKHALID-943' : 5}
+        self.assertDictEqual(dict(self.data.item.index_of), should_be)
+
+
+class TestTransactionsFromMemoryMappedSnapshot(TestTransactionsFromSnapshot):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data25comma.csv'
+        with self.assertLogs(level=logging.WARNING):
+            original = Transactions.from_csv(file, ',')
+        self.directory = TemporaryDirectory()
+        snapshot = path.join(self.directory.name, 'data25comma.snapshot')
+        original.save(snapshot)
+        self.data = Transactions.load(snapshot, mmap=True)
+
+    def test_matrix_arrays_are_read_only(self):
+        for matrix in (self.data.matrix.by_col, self.data.matrix.by_row):
+            self.assertFalse(matrix.data.flags.writeable)
+            self.assertFalse(matrix.indices.flags.writeable)
+
+
+class TestTransactionsFromCounts(TestTransactions):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data25counts.csv'
+        with self.assertLogs(level=logging.WARNING):
+             self.data = Transactions.from_counts(file)
+
+
+class TestTransactionsFromPartitions(TestTransactions):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data25comma.csv'
+        self.directory = TemporaryDirectory()
+        with open(file) as stream:
+            lines = stream.readlines()
+        for part, bounds in enumerate(((0, 10), (10, 18), (18, None))):
+            name = path.join(self.directory.name, 'part{0}.csv'.format(part))
+            with open(name, 'w') as partition:
+                partition.writelines(lines[slice(*bounds)])
+        with self.assertLogs(level=logging.WARNING):
+            self.data = Transactions.from_csv(self.directory.name, ',')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_counters_of_partitions(self):
+        should_be = {path.join(self.directory.name, 'part0.csv'):
+                         {'number_of_transactions': 6,
+                          'number_of_corrupted_records': 4},
+                     path.join(self.directory.name, 'part1.csv'):
+                         {'number_of_transactions': 8,
+                          'number_of_corrupted_records': 0},
+                     path.join(self.directory.name, 'part2.csv'):
+                         {'number_of_transactions': 7,
+                          'number_of_corrupted_records': 1}}
+        self.assertDictEqual(self.data.partitions, should_be)
+
+    def test_glob_pattern_and_list_give_same_partitions(self):
+        pattern = path.join(self.directory.name, 'part*.csv')
+        files = sorted(self.data.partitions)
+        with self.assertLogs(level=logging.WARNING):
+            from_glob = Transactions.from_csv(pattern, ',')
+        with self.assertLogs(level=logging.WARNING):
+            from_list = Transactions.from_csv(files, ',', workers=2)
+        self.assertDictEqual(from_glob.partitions, self.data.partitions)
+        self.assertDictEqual(from_list.partitions, self.data.partitions)
+
+    def test_single_file_has_no_partitions(self):
+        file = './bestPy/tests/data/data25comma.csv'
+        with self.assertLogs(level=logging.WARNING):
+            data = Transactions.from_csv(file, ',')
+        self.assertDictEqual(data.partitions, {})
+
+
+class TestAppendTransactions(ut.TestCase):
+
+    def setUp(self):
+        file = './bestPy/tests/data/data25comma.csv'
+        with self.assertLogs(level=logging.WARNING):
+            self.full = Transactions.from_csv(file, ',')
+        with open(file) as stream:
+            lines = stream.readlines()
+        self.directory = TemporaryDirectory()
+        self.head = path.join(self.directory.name, 'head.csv')
+        with open(self.head, 'w') as stream:
+            stream.writelines(lines[:6])
+        self.records = [tuple(line.rstrip().split(','))
+                        for line in lines[6:] if line.strip()]
+        with self.assertLogs(level=logging.WARNING):
+            self.data = Transactions.from_csv(self.head, ',')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def appended(self):
+        log_msg = ['WARNING:root:Could not interpret record 2 of batch.'
+                   ' Skipping.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            self.data.append(self.records)
+        self.assertEqual(log.output, log_msg)
+        return self.data
+
+    def test_error_on_append_from_database_without_watermark(self):
+        log_msg = ['ERROR:root:Attempt to read new transactions from database'
+                   ' without watermark from a previous read.']
+        err_msg = ('No watermark set. Read all transactions in'
+                   ' incremental mode first!')
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                self.data.append_from_postgreSQL(PostgreSQLparams())
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+        self.assertEqual(self.data.number_of_transactions, 3)
+
+    def test_counters_before_append(self):
+        self.assertEqual(self.data.number_of_transactions, 3)
+        self.assertEqual(self.data.number_of_corrupted_records, 3)
+        self.assertEqual(self.data.number_of_userItem_pairs, 3)
+
+    def test_counters_after_append(self):
+        data = self.appended()
+        self.assertEqual(data.number_of_transactions, 21)
+        self.assertEqual(data.number_of_corrupted_records, 4)
+        self.assertEqual(data.number_of_userItem_pairs,
+                         self.full.number_of_userItem_pairs)
+
+    def test_indices_after_append(self):
+        data = self.appended()
+        self.assertDictEqual(dict(data.user.index_of),
+                             dict(self.full.user.index_of))
+        self.assertDictEqual(dict(data.item.index_of),
+                             dict(self.full.item.index_of))
+        self.assertEqual(data.user.count, 4)
+        self.assertEqual(data.item.count, 6)
+
+    def test_matrix_after_append(self):
+        data = self.appended()
+        should_be = self.full.matrix.by_col.toarray().tolist()
+        self.assertListEqual(data.matrix.by_col.toarray().tolist(),
+                             should_be)
+        self.assertListEqual(data.matrix.by_row.toarray().tolist(),
+                             should_be)
+        self.assertListEqual(data.matrix.bool_by_row.toarray().tolist(),
+                             self.full.matrix.bool_by_row.toarray().tolist())
+
+    def test_derived_formats_in_memory_are_updated(self):
+        _ = self.data.matrix.by_row
+        _ = self.data.matrix.bool_by_col
+        _ = self.data.matrix.min_shape
+        data = self.appended()
+        self.assertListEqual(data.matrix.by_row.toarray().tolist(),
+                             self.full.matrix.by_row.toarray().tolist())
+        self.assertListEqual(data.matrix.bool_by_col.toarray().tolist(),
+                             self.full.matrix.bool_by_col.toarray().tolist())
+        self.assertEqual(data.matrix.min_shape, 4)
+
+    def test_boolean_formats_read_first_after_append(self):
+        _ = self.data.matrix.bool_by_col
+        _ = self.data.matrix.bool_by_row
+        data = self.appended()
+        self.assertListEqual(data.matrix.bool_by_col.toarray().tolist(),
+                             self.full.matrix.bool_by_col.toarray().tolist())
+        self.assertListEqual(data.matrix.bool_by_row.toarray().tolist(),
+                             self.full.matrix.bool_by_row.toarray().tolist())
+
+    def test_append_in_several_batches(self):
+        log_msg = ['WARNING:root:Could not interpret record 2 of batch.'
+                   ' Skipping.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            for start in range(0, len(self.records), 4):
+                self.data.append(self.records[start:start + 4])
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(self.data.number_of_transactions, 21)
+        self.assertListEqual(self.data.matrix.by_col.toarray().tolist(),
+                             self.full.matrix.by_col.toarray().tolist())
+
+    def test_warning_on_record_with_empty_fields(self):
+        log_msg = ['WARNING:root:Record 1 of batch contains empty fields.'
+                   ' Skipping.']
+        with self.assertLogs(level=logging.WARNING) as log:
+            self.data.append([('1331306414', '', 'foo')])
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(self.data.number_of_transactions, 3)
+        self.assertEqual(self.data.number_of_corrupted_records, 4)
+        self.assertEqual(self.data.item.count, 3)
+
+    def test_append_empty_batch(self):
+        self.data.append([])
+        self.assertEqual(self.data.number_of_transactions, 3)
+        self.assertTupleEqual(self.data.matrix.by_col.shape, (2, 3))
+
+
+class TestAppendTransactionsToSnapshot(TestAppendTransactions):
+
+    def setUp(self):
+        super().setUp()
+        snapshot = path.join(self.directory.name, 'head.snapshot')
+        self.data.save(snapshot)
+        self.data = Transactions.load(snapshot, mmap=True)
+
+
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest as ut
+import logging
+import numpy as np
+from os import path
+from tempfile import TemporaryDirectory
+from scipy.sparse import csc_matrix
+from .....datastructures.transactions.write import to_snapshot
+
+
+class TestToSnapshot(ut.TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.file = path.join(self.directory.name, 'test.snapshot')
+        self.matrix = csc_matrix(np.array([[1.0, 0.0], [0.0, 3.0]]))
+        self.by_row = self.matrix.tocsr()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_error_on_file_name_not_string(self):
+        log_msg = ['ERROR:root:Attempt to set snapshot file name to'
+                   ' non-string type.']
+        err_msg = 'Snapshot file must be given by name as a string!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                to_snapshot(1, 4, 0, ['a', 'b'], ['x', 'y'],
+                            self.matrix, self.by_row)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_mixed_ids(self):
+        log_msg = ['ERROR:root:Attempt to save snapshot with IDs neither all'
+                   ' strings nor all integers.']
+        err_msg = 'IDs must be either all strings or all integers!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                to_snapshot(self.file, 4, 0, ['a', 2], ['x', 'y'],
+                            self.matrix, self.by_row)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_file_starts_with_magic_bytes(self):
+        to_snapshot(self.file, 4, 0, ['a', 'b'], ['x', 'y'],
+                    self.matrix, self.by_row)
+        with open(self.file, 'rb') as stream:
+            self.assertEqual(stream.read(8), b'bestPyTx')
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+import unittest as ut
+from numpy import float32, float64, allclose
+from ...precision import set_precision_to, float_type
+from ...datastructures import Transactions
+from ...algorithms import Baseline, MostPopular, TruncatedSVD
+from ...algorithms import CollaborativeFiltering
+from ...algorithms.similarities import all_similarities
+
+
+class TestSetPrecision(ut.TestCase):
+
+    def tearDown(self):
+        set_precision_to('double')
+
+    def test_default_is_double(self):
+        self.assertIs(float_type(), float64)
+
+    def test_set_to_single(self):
+        set_precision_to('single')
+        self.assertIs(float_type(), float32)
+
+    def test_set_back_to_double(self):
+        set_precision_to('single')
+        set_precision_to()
+        self.assertIs(float_type(), float64)
+
+    def test_error_on_precision_not_string(self):
+        log_msg = ['ERROR:root:Attempt to set precision to non-string type.']
+        err_msg = 'Precision must be either "single" or "double"!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(TypeError, msg=err_msg) as err:
+                set_precision_to(32)
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+
+    def test_error_on_unknown_precision(self):
+        log_msg = ['ERROR:root:Attempt to set precision to unknown value.']
+        err_msg = 'Precision must be either "single" or "double"!'
+        with self.assertLogs(level=logging.ERROR) as log:
+            with self.assertRaises(ValueError, msg=err_msg) as err:
+                set_precision_to('half')
+        self.assertEqual(log.output, log_msg)
+        self.assertEqual(err.msg, err_msg)
+        self.assertIs(float_type(), float64)
+
+
+class TestSinglePrecision(ut.TestCase):
+
+    def setUp(self):
+        self.file = './bestPy/tests/data/data50.csv'
+        self.double = Transactions.from_csv(self.file)
+        set_precision_to('single')
+        self.data = Transactions.from_csv(self.file)
+        self.target = 5
+
+    def tearDown(self):
+        set_precision_to('double')
+
+    def test_matrices(self):
+        self.assertIs(self.data.matrix.by_col.dtype.type, float32)
+        self.assertIs(self.data.matrix.by_row.dtype.type, float32)
+        self.assertIs(self.data.matrix.bool_by_col.dtype.type, float32)
+        self.assertIs(self.data.matrix.bool_by_row.dtype.type, float32)
+
+    def test_indices(self):
+        self.assertEqual(self.data.matrix.by_col.indices.itemsize, 4)
+        self.assertEqual(self.data.matrix.by_col.indptr.itemsize, 4)
+
+    def test_similarities(self):
+        for similarity in all_similarities:
+            single = similarity(self.data)
+            double = similarity(self.double)
+            self.assertIs(single.dtype.type, float32)
+            self.assertTrue(allclose(single.toarray(), double.toarray(),
+                                     atol=1e-6))
+
+    def test_algorithms(self):
+        for algorithm in (Baseline, MostPopular, CollaborativeFiltering):
+            for binarize in (True, False):
+                single = algorithm()
+                single.binarize = binarize
+                double = algorithm()
+                double.binarize = binarize
+                should_be = double.operating_on(self.double).for_one(
+                            self.target)
+                actually_is = single.operating_on(self.data).for_one(
+                              self.target)
+                self.assertIs(actually_is.dtype.type, float32)
+                self.assertTrue(allclose(should_be, actually_is, atol=1e-6))
+
+    def test_truncated_svd(self):
+        for binarize in (True, False):
+            algorithm = TruncatedSVD()
+            algorithm.binarize = binarize
+            algorithm.number_of_factors = 5
+            ratings = algorithm.operating_on(self.data).for_one(self.target)
+            self.assertIs(ratings.dtype.type, float32)
+
+
+if __name__ == '__main__':
+    ut.main()